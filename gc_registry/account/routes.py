@@ -1,4 +1,3 @@
-from esdbclient import EventStoreDBClient
 from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel import Session
 
@@ -9,6 +8,11 @@ from gc_registry.account.validation import (
     validate_account_whitelist_update,
 )
 from gc_registry.core.database import db, events
+from gc_registry.core.database.consistency import (
+    ConsistentReadSession,
+    get_consistent_read_session,
+)
+from gc_registry.core.database.event_store import EventStore
 
 # Router initialisation
 router = APIRouter(tags=["Accounts"])
@@ -19,9 +23,9 @@ def create_account(
     account_base: AccountBase,
     write_session: Session = Depends(db.get_write_session),
     read_session: Session = Depends(db.get_read_session),
-    esdb_client: EventStoreDBClient = Depends(events.get_esdb_client),
+    esdb_client: EventStore = Depends(events.get_esdb_client),
 ):
-    validate_account(account_base, read_session)
+    validate_account(account_base, write_session)
     accounts = Account.create(account_base, write_session, read_session, esdb_client)
     if not accounts:
         raise HTTPException(status_code=500, detail="Could not create Account")
@@ -32,11 +36,11 @@ def create_account(
 
 
 @router.get("/{account_id}", response_model=AccountRead)
-def read_account(
+async def read_account(
     account_id: int,
-    read_session: Session = Depends(db.get_read_session),
+    consistent_read: ConsistentReadSession = Depends(get_consistent_read_session),
 ):
-    account = Account.by_id(account_id, read_session)
+    account = await Account.by_id_async(account_id, consistent_read.session)
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
     return account
@@ -48,7 +52,7 @@ def update_account(
     account_update: AccountUpdate,
     write_session: Session = Depends(db.get_write_session),
     read_session: Session = Depends(db.get_read_session),
-    esdb_client: EventStoreDBClient = Depends(events.get_esdb_client),
+    esdb_client: EventStore = Depends(events.get_esdb_client),
 ):
     account = Account.by_id(account_id, write_session)
     if not account:
@@ -72,7 +76,7 @@ def update_whitelist(
     account_whitelist_update: AccountWhitelist,
     write_session: Session = Depends(db.get_write_session),
     read_session: Session = Depends(db.get_read_session),
-    esdb_client: EventStoreDBClient = Depends(events.get_esdb_client),
+    esdb_client: EventStore = Depends(events.get_esdb_client),
 ):
     account = Account.by_id(account_id, write_session)
     if not account:
@@ -81,7 +85,7 @@ def update_whitelist(
         )
 
     modified_whitelist = validate_account_whitelist_update(
-        account, account_whitelist_update, read_session
+        account, account_whitelist_update, write_session
     )
 
     account_update = AccountUpdate(account_whitelist=modified_whitelist)
@@ -101,7 +105,7 @@ def delete_account(
     account_id: int,
     write_session: Session = Depends(db.get_write_session),
     read_session: Session = Depends(db.get_read_session),
-    esdb_client: EventStoreDBClient = Depends(events.get_esdb_client),
+    esdb_client: EventStore = Depends(events.get_esdb_client),
 ):
     try:
         account = Account.by_id(account_id, write_session)
@@ -6,7 +6,7 @@ from gc_registry.account.schemas import AccountWhitelist
 from gc_registry.user.models import User
 
 
-def validate_account(account, read_session):
+def validate_account(account, write_session):
     # Make sure operations cannot be performed on deleted accounts
     if account.is_deleted:
         raise HTTPException(status_code=400, detail="Cannot update deleted accounts.")
@@ -15,7 +15,7 @@ def validate_account(account, read_session):
     account_exists_query = (
         select(Account).filter(Account.account_name == account.account_name).exists()
     )
-    account_exists = read_session.execute(select(account_exists_query)).scalar()
+    account_exists = write_session.execute(select(account_exists_query)).scalar()
 
     if account_exists:
         raise HTTPException(
@@ -24,7 +24,7 @@ def validate_account(account, read_session):
 
     # All user_ids linked to the account must exist in the database
     user_ids_in_db = (
-        read_session.query(User.id).filter(User.id.in_(account.user_ids)).all()
+        write_session.query(User.id).filter(User.id.in_(account.user_ids)).all()
     )
     user_ids_in_db_set = {user_id for (user_id,) in user_ids_in_db}
     if user_ids_in_db_set != set(account.user_ids):
@@ -35,14 +35,15 @@ def validate_account(account, read_session):
 
 
 def validate_account_whitelist_update(
-    account: Account, account_whitelist_update: AccountWhitelist, read_session: Session
+    account: Account, account_whitelist_update: AccountWhitelist, write_session: Session
 ):
     """Ensure that the account whitelist update is valid by checking that the accounts in question exist.
 
     Args:
         account (Account): The account to be updated.
         account_whitelist_update (AccountWhitelist): The whitelist update to be applied.
-        read_session (Session): The database session to read from.
+        write_session (Session): The write database session, so that accounts
+            created by recent writes are found.
 
     Returns:
         modified_whitelist: The modified whitelist to be applied to the account.
@@ -56,7 +57,7 @@ def validate_account_whitelist_update(
                     status_code=400,
                     detail="Cannot add an account to its own whitelist.",
                 )
-            if not Account.exists(account_id_to_add, read_session):
+            if not Account.exists(account_id_to_add, write_session):
                 raise HTTPException(
                     status_code=404,
                     detail=f"Account ID to add not found: {account_id_to_add}",
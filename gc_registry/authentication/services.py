@@ -93,7 +93,7 @@ def create_access_token(data: dict, expires_delta: datetime.timedelta | None = N
 
 
 def is_token_blacklisted(oauth_token):
-    with next(db.db_name_to_client["db_read"].yield_session()) as session:
+    with db.session_scope("db_read") as session:
         statement = select(TokenBlacklist).where(TokenBlacklist.token == oauth_token)
         results = session.exec(statement).all()
 
@@ -119,7 +119,7 @@ def validate_user_and_get_headers(oauth_token: str = Depends(oauth2_scheme)):
         current_ts = datetime.datetime.now(tz=datetime.timezone.utc).timestamp()
 
         if (float(expire) - current_ts) < 0:
-            with next(db.db_name_to_client["db_read"].yield_session()) as session:
+            with db.session_scope("db_read") as session:
                 session.add(TokenBlacklist(token=oauth_token))
                 session.commit()
 
@@ -2,7 +2,9 @@ import datetime
 from functools import partial
 
 from pydantic import BaseModel
-from sqlmodel import Field
+from sqlalchemy import DDL, BigInteger, Column, Index, event
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Field, Session, SQLModel, select, update
 
 from gc_registry import utils
 from gc_registry.certificate.schemas import (
@@ -10,7 +12,9 @@ from gc_registry.certificate.schemas import (
     GranularCertificateBundleBase,
     IssuanceMetaDataBase,
 )
+from gc_registry.core.database import cqrs
 from gc_registry.core.models.base import CertificateActionType, CertificateStatus
+from gc_registry.device.models import Device
 
 # issuance_id a unique non-sequential ID related to the issuance of the entire bundle,
 # specified as a concatenation of deviceID-EnergyCarrier-ProductionStartDatetime.
@@ -22,11 +26,90 @@ from gc_registry.core.models.base import CertificateActionType, CertificateStatu
 class GranularCertificateBundle(
     GranularCertificateBundleBase, utils.ActiveRecord, table=True
 ):
+    # Bundle queries always filter on the account and exclude deleted bundles, and
+    # issuance looks up the latest non-withdrawn bundle of each device
+    __table_args__ = (
+        Index(
+            "ix_gcbundle_account_status_interval",
+            "account_id",
+            "certificate_bundle_status",
+            "production_starting_interval",
+            postgresql_where="is_deleted = false",
+        ),
+        Index(
+            "ix_gcbundle_account_interval",
+            "account_id",
+            "production_starting_interval",
+            postgresql_where="is_deleted = false",
+        ),
+        Index(
+            "ix_gcbundle_device_id_range_end",
+            "device_id",
+            "certificate_bundle_id_range_end",
+            postgresql_where="certificate_bundle_status <> 'WITHDRAWN'",
+        ),
+        Index(
+            "ix_gcbundle_device_production_end",
+            "device_id",
+            "production_ending_interval",
+            postgresql_where="certificate_bundle_status <> 'WITHDRAWN'",
+        ),
+        # Bundles are range partitioned by month of production, see
+        # gc_registry.core.database.partitions
+        {"postgresql_partition_by": "RANGE (production_starting_interval)"},
+    )
+    # The primary key of a partitioned table must include the partition key, but
+    # bundles are still identified by their ID alone
+    __mapper_args__ = {"primary_key": ["id"]}
+
     id: int | None = Field(
         default=None,
         primary_key=True,
+        sa_column_kwargs={"autoincrement": True},
         description="A unique, incremental integer ID assigned to this bundle.",
     )
+    production_starting_interval: datetime.datetime = Field(
+        primary_key=True,
+        description="The datetime in UTC format indicating the start of the relevant production period.",
+    )
+
+
+# Rows outside of the monthly partitions land in the default partition until the
+# partition for their month is created
+event.listen(
+    GranularCertificateBundle.__table__,
+    "after_create",
+    DDL(
+        "CREATE TABLE IF NOT EXISTS %(table)s_default PARTITION OF %(table)s DEFAULT"
+    ).execute_if(dialect="postgresql"),
+)
+
+
+class GranularCertificateBundleArchive(
+    GranularCertificateBundleBase, SQLModel, table=True
+):
+    """Cold storage for GC Bundles that were deleted, for example when split, before
+    the archive retention window, so that the bundle table and its indexes stay
+    proportional to the active inventory.
+
+    Rows are moved here unchanged by gc_registry.core.database.archive, keeping the
+    ID and hash of the original GC Bundle so that the lineage of their children can
+    still be verified.
+    """
+
+    __table_args__ = (Index("ix_gcbundle_archive_issuance_id", "issuance_id"),)
+
+    id: int = Field(
+        primary_key=True,
+        sa_column_kwargs={"autoincrement": False},
+        description="The ID of the archived GC Bundle.",
+    )
+    created_at: datetime.datetime = Field(
+        nullable=False,
+        description="The UTC datetime at which the archived GC Bundle was created.",
+    )
+    certificate_bundle_id_range_start: int = Field(sa_column=Column(BigInteger()))
+    certificate_bundle_id_range_end: int = Field(sa_column=Column(BigInteger()))
 
 
 class GranularCertificateBundleUpdate(BaseModel):
@@ -74,3 +157,203 @@ class IssuanceMetaData(IssuanceMetaDataBase, utils.ActiveRecord, table=True):
         default=None,
         description="A unique ID assigned to this registry.",
     )
+
+
+class DeviceIssuanceLedger(SQLModel, table=True):
+    """The certificate ID high-water mark of a Device, maintained by issuance in the
+    same transaction as the GC Bundles it issues so that issuance does not have to
+    scan the bundles of the Device.
+
+    The row of a Device is also locked for the duration of its issuance, so that
+    concurrent issuance to the same Device cannot allocate the same certificate IDs.
+    """
+
+    device_id: int = Field(
+        primary_key=True,
+        foreign_key="device.id",
+        sa_column_kwargs={"autoincrement": False},
+        description="The ID of the Device.",
+    )
+    max_certificate_id: int = Field(
+        default=0,
+        sa_column=Column(BigInteger(), nullable=False),
+        description="The highest certificate ID issued to the Device.",
+    )
+
+
+class DeviceIssuedInterval(SQLModel, table=True):
+    """A period of production of a Device for which certificates have been issued.
+
+    Overlapping and adjacent periods are merged, so the gaps between the periods of
+    a Device are the production that has not yet been issued.
+    """
+
+    __table_args__ = (
+        Index("ix_device_issued_interval_device_start", "device_id", "interval_start"),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    device_id: int = Field(foreign_key="device.id")
+    interval_start: datetime.datetime = Field(
+        description="The UTC start of the issued period.",
+    )
+    interval_end: datetime.datetime = Field(
+        description="The UTC end of the issued period.",
+    )
+
+
+class GranularCertificateBundleReadModel(
+    GranularCertificateBundleBase, IssuanceMetaDataBase, SQLModel, table=True
+):
+    """Denormalised read DB representation of a GC Bundle, carrying the attributes of
+    its production Device and issuance metadata so that bundle queries can be served
+    from a single table without joins.
+
+    Rows are maintained by the read projections below whenever GC Bundles, Devices or
+    issuance metadata are written through the CQRS helpers, and share the ID of the
+    GC Bundle they represent.
+    """
+
+    __table_args__ = (
+        Index(
+            "ix_gcbundle_read_account_interval",
+            "account_id",
+            "production_starting_interval",
+            postgresql_where="is_deleted = false",
+        ),
+        Index(
+            "ix_gcbundle_read_account_status",
+            "account_id",
+            "certificate_bundle_status",
+            postgresql_where="is_deleted = false",
+        ),
+        Index(
+            "ix_gcbundle_read_device_interval",
+            "device_id",
+            "production_starting_interval",
+        ),
+    )
+
+    id: int = Field(
+        primary_key=True,
+        sa_column_kwargs={"autoincrement": False},
+        description="The ID of the GC Bundle in the write DB.",
+    )
+
+    # Read tables do not enforce referential integrity, which is checked on write
+    account_id: int
+    metadata_id: int
+    device_id: int
+    sdr_allocation_id: int | None = None
+    certificate_bundle_id_range_start: int = Field(sa_column=Column(BigInteger()))
+    certificate_bundle_id_range_end: int = Field(sa_column=Column(BigInteger()))
+
+    ### Production Device Characteristics ###
+    device_name: str | None = None
+    device_technology_type: str | None = None
+    device_production_start_date: datetime.datetime | None = None
+    device_capacity: float | None = None
+    device_location: str | None = None
+
+    ### Issuing Body Characteristics ###
+    country_of_issuance: str | None = None  # type: ignore
+    connected_grid_identification: str | None = None  # type: ignore
+    issuing_body: str | None = None  # type: ignore
+    issue_market_zone: str | None = None  # type: ignore
+
+
+def device_read_attributes(device: Device | None) -> dict:
+    if device is None:
+        return {}
+
+    return {
+        "device_name": device.device_name,
+        "device_technology_type": device.technology_type,
+        "device_production_start_date": device.operational_date,
+        "device_capacity": device.capacity,
+        "device_location": device.location,
+    }
+
+
+def issuance_metadata_read_attributes(metadata: IssuanceMetaData | None) -> dict:
+    if metadata is None:
+        return {}
+
+    return IssuanceMetaDataBase.model_validate(metadata.model_dump()).model_dump()
+
+
+@cqrs.register_read_projection("GranularCertificateBundle")
+def project_bundles_to_read_model(
+    granular_certificate_bundles: list[SQLModel], read_session: Session
+) -> None:
+    """Upsert the denormalised read rows for the given GC Bundles, looking up their
+    Devices and issuance metadata with one query each."""
+
+    # Keep the latest state of each bundle, as a single upsert cannot touch a row twice
+    bundles = {bundle.id: bundle for bundle in granular_certificate_bundles}.values()  # type: ignore
+
+    device_ids = {bundle.device_id for bundle in bundles}  # type: ignore
+    devices = {
+        device.id: device
+        for device in read_session.exec(
+            select(Device).where(Device.id.in_(device_ids))  # type: ignore
+        )
+    }
+    metadata_ids = {bundle.metadata_id for bundle in bundles}  # type: ignore
+    issuance_metadata = {
+        metadata.id: metadata
+        for metadata in read_session.exec(
+            select(IssuanceMetaData).where(IssuanceMetaData.id.in_(metadata_ids))  # type: ignore
+        )
+    }
+
+    rows = [
+        {
+            **issuance_metadata_read_attributes(
+                issuance_metadata.get(bundle.metadata_id)  # type: ignore
+            ),
+            **device_read_attributes(devices.get(bundle.device_id)),  # type: ignore
+            **bundle.model_dump(),
+        }
+        for bundle in bundles
+    ]
+
+    read_columns = GranularCertificateBundleReadModel.__table__.columns  # type: ignore
+    stmt = insert(GranularCertificateBundleReadModel)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[read_columns.id],
+        set_={
+            column.name: stmt.excluded[column.name]
+            for column in read_columns
+            if column.name != "id"
+        },
+    )
+    read_session.execute(stmt, rows)
+
+
+@cqrs.register_read_projection("Device")
+def project_devices_to_read_model(
+    devices: list[SQLModel], read_session: Session
+) -> None:
+    """Propagate changes to Device attributes onto the read rows of their GC Bundles."""
+
+    for device in devices:
+        read_session.execute(
+            update(GranularCertificateBundleReadModel)
+            .where(GranularCertificateBundleReadModel.device_id == device.id)  # type: ignore
+            .values(**device_read_attributes(device))  # type: ignore
+        )
+
+
+@cqrs.register_read_projection("IssuanceMetaData")
+def project_issuance_metadata_to_read_model(
+    issuance_metadata: list[SQLModel], read_session: Session
+) -> None:
+    """Propagate changes to issuance metadata onto the read rows of their GC Bundles."""
+
+    for metadata in issuance_metadata:
+        read_session.execute(
+            update(GranularCertificateBundleReadModel)
+            .where(GranularCertificateBundleReadModel.metadata_id == metadata.id)  # type: ignore
+            .values(**issuance_metadata_read_attributes(metadata))  # type: ignore
+        )
@@ -1,5 +1,8 @@
-from esdbclient import EventStoreDBClient
-from fastapi import APIRouter, Depends, HTTPException
+from contextlib import AbstractContextManager
+from typing import Callable, Iterator
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session
 
 from gc_registry.certificate.models import (
@@ -18,18 +21,34 @@ from gc_registry.certificate.schemas import (
     IssuanceMetaDataBase,
 )
 from gc_registry.certificate.services import (
+    allocate_certificate_ids,
+    assign_certificate_ids,
     create_issuance_id,
+    decode_certificate_query_cursor,
+    parse_certificate_bundle_fields,
     process_certificate_bundle_action,
-    query_certificate_bundles,
+    query_certificate_bundle_page,
+    record_device_issuance,
+    stream_certificate_bundles,
+    summarise_certificate_bundles,
+)
+from gc_registry.core.database import cqrs, db, events
+from gc_registry.core.database.consistency import (
+    ConsistentReadSession,
+    get_consistent_read_session,
 )
-from gc_registry.core.database import db, events
+from gc_registry.core.database.event_store import EventStore
 from gc_registry.core.models.base import CertificateActionType
 from gc_registry.core.services import create_bundle_hash
+from gc_registry.settings import settings
 from gc_registry.user.models import User
 
 # Router initialisation
 router = APIRouter(tags=["Certificates"])
 
+CERTIFICATE_BUNDLE_COUNT_HEADER = "X-Certificate-Bundle-Count"
+TOTAL_CERTIFICATE_VOLUME_HEADER = "X-Total-Certificate-Volume"
+
 
 @router.post(
     "/create",
@@ -40,23 +59,43 @@ def create_certificate_bundle(
     certificate_bundle: GranularCertificateBundleBase,
     write_session: Session = Depends(db.get_write_session),
     read_session: Session = Depends(db.get_read_session),
-    esdb_client: EventStoreDBClient = Depends(events.get_esdb_client),
+    esdb_client: EventStore = Depends(events.get_esdb_client),
     nonce: str | None = None,
 ):
-    """Create a GC Bundle with the specified properties."""
+    """Create a GC Bundle with the specified properties.
+
+    The certificate ID range of the GC Bundle is allocated by the registry from the
+    next IDs of its Device, according to the bundle quantity."""
 
     try:
         certificate_bundle.issuance_id = create_issuance_id(certificate_bundle)
         certificate_bundle.hash = create_bundle_hash(certificate_bundle, nonce)
 
-        db_certificate_bundles = GranularCertificateBundle.create(
-            certificate_bundle, write_session, read_session, esdb_client
-        )
+        # The certificate IDs of the bundle are allocated from the issuance ledger
+        # of its device, in the same transaction as the bundle is written
+        with cqrs.unit_of_work(write_session, read_session, esdb_client):
+            first_certificate_id = allocate_certificate_ids(
+                write_session,
+                certificate_bundle.device_id,
+                certificate_bundle.bundle_quantity,
+            )
+            assign_certificate_ids([certificate_bundle], first_certificate_id)
 
-        if not db_certificate_bundles:
-            raise HTTPException(status_code=400, detail="Could not create GC Bundle")
+            db_certificate_bundles = GranularCertificateBundle.create(
+                certificate_bundle, write_session, read_session, esdb_client
+            )
+            if not db_certificate_bundles:
+                raise HTTPException(
+                    status_code=400, detail="Could not create GC Bundle"
+                )
+            record_device_issuance(
+                write_session,
+                certificate_bundle.device_id,
+                db_certificate_bundles,  # type: ignore
+            )
 
-        db_certificate_bundle = db_certificate_bundles[0].model_dump()
+            # Dumped before the commit expires the bundle
+            db_certificate_bundle = db_certificate_bundles[0].model_dump()
 
         return db_certificate_bundle
     except Exception as e:
@@ -72,7 +111,7 @@ def create_issuance_metadata(
     issuance_metadata: IssuanceMetaDataBase,
     write_session: Session = Depends(db.get_write_session),
     read_session: Session = Depends(db.get_read_session),
-    esdb_client: EventStoreDBClient = Depends(events.get_esdb_client),
+    esdb_client: EventStore = Depends(events.get_esdb_client),
 ):
     """Create GC issuance metadata with the specified properties."""
 
@@ -102,7 +141,7 @@ def certificate_bundle_transfer(
     certificate_transfer: GranularCertificateTransfer,
     write_session: Session = Depends(db.get_write_session),
     read_session: Session = Depends(db.get_read_session),
-    esdb_client: EventStoreDBClient = Depends(events.get_esdb_client),
+    esdb_client: EventStore = Depends(events.get_esdb_client),
 ):
     """Transfer a fixed number of certificates matched to the given filter parameters to the specified target Account."""
 
@@ -116,33 +155,93 @@ def certificate_bundle_transfer(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+def query_sessions(session: Session, is_write_session: bool) -> dict[str, Session]:
+    # The denormalised read table is only maintained on the read DB, so reads
+    # routed to the write DB query the bundle table
+    if is_write_session:
+        return {"write_session": session}
+
+    return {"read_session": session}
+
+
 @router.post(
     "/query",
     response_model=GranularCertificateQueryRead,
     status_code=202,
 )
-def query_certificate_bundles_route(
+async def query_certificate_bundles_route(
     certificate_bundle_query: GranularCertificateQuery,
-    read_session: Session = Depends(db.get_read_session),
+    limit: int | None = Query(
+        default=None,
+        gt=0,
+        le=settings.CERTIFICATE_QUERY_MAX_PAGE_SIZE,
+        description="The maximum number of GC Bundles to return, paging through the results with the returned next_cursor.",
+    ),
+    cursor: str | None = Query(
+        default=None,
+        description="The next_cursor returned with the previous page of results.",
+    ),
+    fields: str | None = Query(
+        default=None,
+        description="A comma separated list of the GC Bundle fields to return, for example id,certificate_bundle_status,bundle_quantity,production_starting_interval. The ID is always returned.",
+    ),
+    consistent_read: ConsistentReadSession = Depends(get_consistent_read_session),
 ):
-    """Return all certificates from the specified Account that match the provided search criteria."""
+    """Return all certificates from the specified Account that match the provided search criteria.
 
-    try:
-        certificate_bundles_from_query = query_certificate_bundles(
-            certificate_bundle_query, read_session
-        )
+    Results are paged when a limit or cursor is given, and can be limited to a
+    selection of GC Bundle fields, in which case the total certificate volume is
+    calculated over every matching GC Bundle. As that scans every matching GC
+    Bundle, paged results only include the total with the first page."""
 
-        if not certificate_bundles_from_query:
+    try:
+        selected_fields = parse_certificate_bundle_fields(fields) if fields else None
+        after = decode_certificate_query_cursor(cursor) if cursor else None
+        page_size = limit
+        if cursor and page_size is None:
+            page_size = settings.CERTIFICATE_QUERY_MAX_PAGE_SIZE
+        is_partial_result = page_size is not None or selected_fields is not None
+
+        def query_page(session: Session):
+            sessions = query_sessions(session, consistent_read.is_write_session)
+            page = query_certificate_bundle_page(
+                certificate_bundle_query,
+                limit=page_size,
+                after=after,
+                fields=selected_fields,
+                **sessions,
+            )
+            # Partial results cannot be totalled from the returned GC Bundles, and
+            # the total of paged results is only returned with the first page
+            summary = None
+            if after is None and is_partial_result:
+                summary = summarise_certificate_bundles(
+                    certificate_bundle_query, **sessions
+                )
+            return page, summary
+
+        page, summary = await consistent_read.session.run_sync(query_page)
+
+        if not page or not page[0]:
             raise HTTPException(status_code=422, detail="No certificates found")
+        certificate_bundles_from_query, next_cursor = page
 
         query_dict = certificate_bundle_query.model_dump()
 
-        granular_certificate_bundles_read = [
-            GranularCertificateBundleRead.model_validate(certificate.model_dump())
-            for certificate in certificate_bundles_from_query
-        ]
+        if selected_fields is None:
+            granular_certificate_bundles_read = [
+                GranularCertificateBundleRead.model_validate(certificate.model_dump())
+                for certificate in certificate_bundles_from_query
+            ]
+        else:
+            granular_certificate_bundles_read = certificate_bundles_from_query
 
         query_dict["granular_certificate_bundles"] = granular_certificate_bundles_read
+        query_dict["next_cursor"] = next_cursor
+        if is_partial_result:
+            query_dict["total_certificate_volume"] = (
+                None if summary is None else summary[1]
+            )
 
         certificate_query = GranularCertificateQueryRead.model_validate(query_dict)
 
@@ -151,6 +250,62 @@ def query_certificate_bundles_route(
         raise HTTPException(status_code=422, detail=str(e))
 
 
+@router.post(
+    "/query/stream",
+    response_class=StreamingResponse,
+    status_code=202,
+)
+async def stream_certificate_bundles_route(
+    certificate_bundle_query: GranularCertificateQuery,
+    consistent_read: ConsistentReadSession = Depends(get_consistent_read_session),
+    session_scope: Callable[[str], AbstractContextManager[Session]] = Depends(
+        db.get_session_scope
+    ),
+):
+    """Stream the certificates from the specified Account that match the provided search
+    criteria as newline delimited JSON, one GC Bundle per line, without loading the
+    full result into memory.
+
+    The number of matching GC Bundles and their total volume are returned in the
+    X-Certificate-Bundle-Count and X-Total-Certificate-Volume headers."""
+
+    is_write_session = consistent_read.is_write_session
+    summary = await consistent_read.session.run_sync(
+        lambda session: summarise_certificate_bundles(
+            certificate_bundle_query, **query_sessions(session, is_write_session)
+        )
+    )
+    if not summary or summary[0] == 0:
+        raise HTTPException(status_code=422, detail="No certificates found")
+    n_bundles, total_volume = summary
+
+    # The response is streamed after the request's sessions have been closed, so
+    # the stream reads through its own session
+    target = "db_write" if is_write_session else "db_read"
+
+    def stream_certificate_bundle_rows() -> Iterator[str]:
+        with session_scope(target) as session:
+            for certificate in stream_certificate_bundles(
+                certificate_bundle_query, **query_sessions(session, is_write_session)
+            ):
+                granular_certificate_bundle_read = (
+                    GranularCertificateBundleRead.model_validate(
+                        certificate.model_dump()
+                    )
+                )
+                yield granular_certificate_bundle_read.model_dump_json() + "\n"
+
+    return StreamingResponse(
+        stream_certificate_bundle_rows(),
+        status_code=202,
+        media_type="application/x-ndjson",
+        headers={
+            CERTIFICATE_BUNDLE_COUNT_HEADER: str(n_bundles),
+            TOTAL_CERTIFICATE_VOLUME_HEADER: str(total_volume),
+        },
+    )
+
+
 @router.post(
     "/cancel",
     response_model=GranularCertificateActionRead,
@@ -160,14 +315,14 @@ def certificate_bundle_cancellation(
     certificate_cancel: GranularCertificateCancel,
     write_session: Session = Depends(db.get_write_session),
     read_session: Session = Depends(db.get_read_session),
-    esdb_client: EventStoreDBClient = Depends(events.get_esdb_client),
+    esdb_client: EventStore = Depends(events.get_esdb_client),
 ):
     """Cancel a fixed number of certificates matched to the given filter parameters within the specified Account."""
 
     try:
         # If no beneficiary is specified, default to the account holder
         if certificate_cancel.beneficiary is None:
-            user_name = User.by_id(certificate_cancel.user_id, read_session).name
+            user_name = User.by_id(certificate_cancel.user_id, write_session).name
             certificate_cancel.beneficiary = f"{user_name}"
 
         db_certificate_action = process_certificate_bundle_action(
@@ -188,7 +343,7 @@ def certificate_bundle_recurring_transfer(
     certificate_bundle_action: GranularCertificateAction,
     write_session: Session = Depends(db.get_write_session),
     read_session: Session = Depends(db.get_read_session),
-    esdb_client: EventStoreDBClient = Depends(events.get_esdb_client),
+    esdb_client: EventStore = Depends(events.get_esdb_client),
 ):
     """Set up a protocol that transfers a fixed number of certificates matching the provided search criteria to a given target Account once per time period."""
 
@@ -211,7 +366,7 @@ def certificate_bundle_recurring_cancellation(
     certificate_bundle_action: GranularCertificateAction,
     write_session: Session = Depends(db.get_write_session),
     read_session: Session = Depends(db.get_read_session),
-    esdb_client: EventStoreDBClient = Depends(events.get_esdb_client),
+    esdb_client: EventStore = Depends(events.get_esdb_client),
 ):
     """Set up a protocol that cancels a fixed number of certificates matching the provided search criteria within a given Account once per time period."""
     try:
@@ -233,7 +388,7 @@ def certificate_bundle_claim(
     certificate_bundle_action: GranularCertificateAction,
     write_session: Session = Depends(db.get_write_session),
     read_session: Session = Depends(db.get_read_session),
-    esdb_client: EventStoreDBClient = Depends(events.get_esdb_client),
+    esdb_client: EventStore = Depends(events.get_esdb_client),
 ):
     """Claim a fixed number of cancelled certificates matching the provided search criteria within a given Account,
     if the User is specified as the Beneficiary of those cancelled GCs. For more information on the claim process,
@@ -259,7 +414,7 @@ def certificate_bundle_withdraw(
     certificate_bundle_action: GranularCertificateAction,
     write_session: Session = Depends(db.get_write_session),
     read_session: Session = Depends(db.get_read_session),
-    esdb_client: EventStoreDBClient = Depends(events.get_esdb_client),
+    esdb_client: EventStore = Depends(events.get_esdb_client),
 ):
     """(Issuing Body only) - Withdraw a fixed number of certificates from the specified Account matching the provided search criteria."""
     # TODO add validation that only the IB user can access this endpoint
@@ -280,7 +435,7 @@ def certificate_bundle_reserve(
     certificate_bundle_action: GranularCertificateAction,
     write_session: Session = Depends(db.get_write_session),
     read_session: Session = Depends(db.get_read_session),
-    esdb_client: EventStoreDBClient = Depends(events.get_esdb_client),
+    esdb_client: EventStore = Depends(events.get_esdb_client),
 ):
     """Label a fixed number of certificates as Reserved from the specified Account matching the provided search criteria."""
     certificate_bundle_action.action_type = CertificateActionType.RESERVE
@@ -1,5 +1,6 @@
 import datetime
 from functools import partial
+from typing import Any, Literal
 
 from fastapi import HTTPException
 from pydantic import BaseModel, model_validator
@@ -490,16 +491,27 @@ class GranularCertificateQuery(BaseModel):
 
 
 class GranularCertificateQueryRead(GranularCertificateQuery):
-    granular_certificate_bundles: list[GranularCertificateBundleRead] = Field(
-        description="The list of GC Bundles that match the query parameters."
+    granular_certificate_bundles: (
+        list[GranularCertificateBundleRead] | list[dict[str, Any]]
+    ) = Field(
+        description="The list of GC Bundles that match the query parameters, limited to the selected fields if any were given."
     )
     total_certificate_volume: int | None = Field(
         default=None,
-        description="The total volume of certificates that match the query parameters.",
+        description="The total volume of certificates that match the query parameters. Only returned with the first page of paged results.",
+    )
+    next_cursor: str | None = Field(
+        default=None,
+        description="The cursor to pass with the next request to return the following page of GC Bundles, if there is one.",
     )
 
     @model_validator(mode="after")
     def calculate_total_certificate_volume(cls, values):
+        # Paged and sparse results are totalled over every matching GC Bundle by
+        # the query itself, and only for the first page, so a given total is kept
+        # even when it is None
+        if "total_certificate_volume" in values.model_fields_set:
+            return values
         bundles = values.granular_certificate_bundles
         total_volume = sum(bundle.bundle_quantity for bundle in bundles)
         values.total_certificate_volume = total_volume
@@ -672,3 +684,26 @@ class GranularCertificateActionRead(GranularCertificateActionBase):
         primary_key=True,
         description="A unique ID assigned to this action.",
     )
+
+
+class DeviceIssuanceReport(BaseModel):
+    """The outcome of issuing certificates to a single Device over an issuance run."""
+
+    device_id: int | None = Field(
+        description="The ID of the Device that certificates were issued to.",
+    )
+    status: Literal["issued", "skipped", "failed"] = Field(
+        description="Whether GC Bundles were issued, none were due, or issuance failed and was rolled back.",
+    )
+    n_bundles: int = Field(
+        default=0,
+        description="The number of GC Bundles issued to the Device.",
+    )
+    error: str | None = Field(
+        default=None,
+        description="The reason the Device was skipped or its issuance failed.",
+    )
+    duration_seconds: float = Field(
+        default=0.0,
+        description="The time taken to issue certificates to the Device.",
+    )
@@ -1,19 +1,29 @@
+import base64
 import datetime
-from typing import Any, Callable
-
-from esdbclient import EventStoreDBClient
-from sqlalchemy import func
-from sqlmodel import Session, SQLModel, or_, select
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractContextManager
+from typing import Any, Callable, Iterator, Sequence
+
+from sqlalchemy import case, func, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, SQLModel, or_, select, update
 from sqlmodel.sql.expression import SelectOfScalar
 
 from gc_registry.account.models import Account
 from gc_registry.certificate.models import (
+    DeviceIssuanceLedger,
+    DeviceIssuedInterval,
     GranularCertificateAction,
     GranularCertificateBundle,
+    GranularCertificateBundleArchive,
+    GranularCertificateBundleReadModel,
     GranularCertificateBundleUpdate,
 )
 from gc_registry.certificate.schemas import (
     CertificateStatus,
+    DeviceIssuanceReport,
     GranularCertificateActionBase,
     GranularCertificateBundleBase,
     GranularCertificateBundleCreate,
@@ -26,14 +36,19 @@ from gc_registry.certificate.schemas import (
     GranularCertificateTransfer,
     GranularCertificateWithdraw,
 )
-from gc_registry.certificate.validation import validate_granular_certificate_bundle
-from gc_registry.core.database import cqrs
+from gc_registry.certificate.validation import (
+    validate_granular_certificate_bundles,
+    verifiy_bundle_lineage,
+)
+from gc_registry.core.database import cqrs, db
+from gc_registry.core.database.event_store import EventStore
 from gc_registry.core.models.base import CertificateActionType
 from gc_registry.core.services import create_bundle_hash
 from gc_registry.device.meter_data.abstract_meter_client import AbstractMeterDataClient
 from gc_registry.device.models import Device
 from gc_registry.device.services import get_all_devices
 from gc_registry.logging_config import logger
+from gc_registry.settings import settings
 
 
 def get_certificate_bundles_by_id(
@@ -63,7 +78,7 @@ def split_certificate_bundle(
     size_to_split: int,
     write_session: Session,
     read_session: Session,
-    esdb_client: EventStoreDBClient,
+    esdb_client: EventStore,
 ) -> tuple[GranularCertificateBundle, GranularCertificateBundle]:
     """Given a GC Bundle, split it into two child bundles and return them.
 
@@ -139,6 +154,60 @@ def split_certificate_bundle(
     ], db_granular_certificate_bundle_child_2[0]  # type: ignore
 
 
+def get_certificate_bundle_lineage(
+    granular_certificate_bundle: GranularCertificateBundle
+    | GranularCertificateBundleArchive,
+    db_session: Session,
+) -> list[GranularCertificateBundle | GranularCertificateBundleArchive]:
+    """Trace the ancestors of a GC Bundle back to the bundle originally issued,
+    searching the deleted bundles sharing its issuance ID in both the bundle table
+    and the archive.
+
+    Each parent is identified by verifying that the hash of the child can be
+    recreated from the hash of the parent.
+
+    Args:
+        granular_certificate_bundle (GranularCertificateBundle | GranularCertificateBundleArchive): The GC Bundle
+        db_session (Session): The database session
+
+    Returns:
+        list[GranularCertificateBundle | GranularCertificateBundleArchive]: The
+            ancestors of the GC Bundle, from its parent to the issued bundle
+    """
+
+    issuance_id = granular_certificate_bundle.issuance_id
+    candidates: list[GranularCertificateBundle | GranularCertificateBundleArchive] = [
+        *db_session.exec(
+            select(GranularCertificateBundle).where(
+                GranularCertificateBundle.issuance_id == issuance_id,
+                GranularCertificateBundle.is_deleted == True,  # noqa
+            )
+        ),
+        *db_session.exec(
+            select(GranularCertificateBundleArchive).where(
+                GranularCertificateBundleArchive.issuance_id == issuance_id
+            )
+        ),
+    ]
+
+    lineage: list[GranularCertificateBundle | GranularCertificateBundleArchive] = []
+    child = granular_certificate_bundle
+    while True:
+        parent = next(
+            (
+                candidate
+                for candidate in candidates
+                if candidate.id != child.id and verifiy_bundle_lineage(candidate, child)
+            ),
+            None,
+        )
+        if parent is None:
+            return lineage
+
+        lineage.append(parent)
+        child = parent
+
+
 def create_issuance_id(
     granular_certificate_bundle: GranularCertificateBundleBase,
 ) -> str:
@@ -161,65 +230,282 @@ def issuance_id_to_device_and_interval(
     return device_id, interval
 
 
-def get_max_certificate_id_by_device_id(
-    db_session: Session, device_id: int
-) -> int | None:
-    """Gets the maximum certificate ID from any bundle for a given device, excluding any withdrawn certificates
+def _to_naive_utc(timestamp: datetime.datetime) -> datetime.datetime:
+    # Production intervals are stored as naive UTC datetimes
+    if timestamp.tzinfo is not None:
+        return timestamp.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return timestamp
+
+
+def create_device_issuance_ledger(write_session: Session, device_id: int) -> None:
+    """Create the issuance ledger of a Device if it does not exist yet, from the
+    existing GC Bundles of the Device, with the production periods covered by its
+    non-withdrawn GC Bundles recorded as issued.
+
+    The issued periods are seeded by merging overlapping and adjacent GC Bundles,
+    so that any gaps between them are left to be issued.
 
     Args:
-        db_session (Session): The database session
+        write_session (Session): The database write session
+        device_id (int): The device ID
+    """
+
+    if write_session.get(DeviceIssuanceLedger, device_id) is not None:
+        return
+
+    issued_bundles = (
+        select(
+            GranularCertificateBundle.certificate_bundle_id_range_end,
+            GranularCertificateBundle.production_starting_interval,
+            GranularCertificateBundle.production_ending_interval,
+        )
+        .where(
+            GranularCertificateBundle.device_id == device_id,
+            GranularCertificateBundle.certificate_bundle_status
+            != CertificateStatus.WITHDRAWN,
+        )
+        .subquery()
+    )
+
+    # A bundle starts a new issued period when it starts after the end of every
+    # bundle before it, and the running count of those starts numbers the periods
+    previous_end = func.max(issued_bundles.c.production_ending_interval).over(
+        order_by=issued_bundles.c.production_starting_interval,
+        rows=(None, -1),
+    )
+    starts_period = case(
+        (
+            or_(
+                previous_end.is_(None),
+                issued_bundles.c.production_starting_interval > previous_end,
+            ),
+            1,
+        ),
+        else_=0,
+    )
+    flagged_bundles = select(
+        issued_bundles,
+        starts_period.label("starts_period"),
+    ).subquery()
+    numbered_bundles = select(
+        flagged_bundles,
+        func.sum(flagged_bundles.c.starts_period)
+        .over(order_by=flagged_bundles.c.production_starting_interval)
+        .label("period_number"),
+    ).subquery()
+    issued_periods = write_session.execute(
+        select(
+            func.min(numbered_bundles.c.production_starting_interval),
+            func.max(numbered_bundles.c.production_ending_interval),
+            func.max(numbered_bundles.c.certificate_bundle_id_range_end),
+        )
+        .group_by(numbered_bundles.c.period_number)
+        .order_by(numbered_bundles.c.period_number)
+    ).all()
+
+    max_certificate_id = max(
+        (period_max_id for _, _, period_max_id in issued_periods), default=0
+    )
+
+    # A concurrent issuance may have created the ledger since it was looked up
+    created = write_session.execute(
+        insert(DeviceIssuanceLedger)
+        .values(device_id=device_id, max_certificate_id=max_certificate_id)
+        .on_conflict_do_nothing(index_elements=["device_id"])
+    )
+    if created.rowcount and issued_periods:
+        write_session.add_all(
+            DeviceIssuedInterval(
+                device_id=device_id,
+                interval_start=period_start,
+                interval_end=period_end,
+            )
+            for period_start, period_end, _ in issued_periods
+        )
+        write_session.flush()
+
+
+def lock_device_issuance_ledger(
+    write_session: Session, device_id: int
+) -> DeviceIssuanceLedger:
+    """Return the issuance ledger of a Device, creating it if needed, locked until
+    the end of the current transaction so that the issued periods of the Device
+    can be checked and recorded without a concurrent issuance interleaving.
+
+    Args:
+        write_session (Session): The database write session
         device_id (int): The device ID
 
     Returns:
-        int: The maximum certificate ID
+        DeviceIssuanceLedger: The locked issuance ledger of the Device
+    """
+
+    create_device_issuance_ledger(write_session, device_id)
+
+    return write_session.exec(
+        select(DeviceIssuanceLedger)
+        .where(DeviceIssuanceLedger.device_id == device_id)
+        .with_for_update()
+    ).one()
+
 
+def allocate_certificate_ids(
+    write_session: Session, device_id: int, n_certificates: int
+) -> int:
+    """Reserve a block of consecutive certificate IDs for a Device with a single
+    atomic update of its issuance ledger.
+
+    The ledger row of the Device stays locked until the end of the transaction, so
+    IDs should be allocated just before the GC Bundles using them are written.
+    Allocations for other Devices are not blocked.
+
+    Args:
+        write_session (Session): The database write session
+        device_id (int): The device ID
+        n_certificates (int): The number of certificate IDs to reserve
 
+    Returns:
+        int: The first certificate ID of the reserved block
     """
 
-    stmt: SelectOfScalar = select(
-        func.max(GranularCertificateBundle.certificate_bundle_id_range_end)
-    ).where(
-        GranularCertificateBundle.device_id == device_id,
-        GranularCertificateBundle.certificate_bundle_status
-        != CertificateStatus.WITHDRAWN,
-    )
+    create_device_issuance_ledger(write_session, device_id)
+
+    max_certificate_id = write_session.execute(
+        update(DeviceIssuanceLedger)
+        .where(DeviceIssuanceLedger.device_id == device_id)  # type: ignore
+        .values(
+            max_certificate_id=DeviceIssuanceLedger.max_certificate_id + n_certificates
+        )
+        .returning(DeviceIssuanceLedger.max_certificate_id)
+    ).scalar_one()
 
-    max_certificate_id = db_session.exec(stmt).first()
+    return max_certificate_id - n_certificates + 1
 
-    if not max_certificate_id:
-        return None
-    else:
-        return int(max_certificate_id)
 
+def assign_certificate_ids(
+    granular_certificate_bundles: Sequence[GranularCertificateBundleBase],
+    first_certificate_id: int,
+) -> None:
+    """Number the certificates of the GC Bundles consecutively in order, starting
+    from the given certificate ID, according to their bundle quantities."""
+
+    certificate_bundle_id_range_start = first_certificate_id
+    for granular_certificate_bundle in granular_certificate_bundles:
+        granular_certificate_bundle.certificate_bundle_id_range_start = (
+            certificate_bundle_id_range_start
+        )
+        granular_certificate_bundle.certificate_bundle_id_range_end = (
+            certificate_bundle_id_range_start
+            + granular_certificate_bundle.bundle_quantity
+            - 1
+        )
+        certificate_bundle_id_range_start = (
+            granular_certificate_bundle.certificate_bundle_id_range_end + 1
+        )
 
-def get_max_certificate_timestamp_by_device_id(
-    db_session: Session, device_id: int
-) -> datetime.datetime | None:
-    """Gets the maximum certificate timestamp from any bundle for a given device, excluding any withdrawn certificates
+
+def get_unissued_periods(
+    write_session: Session,
+    device_id: int,
+    from_datetime: datetime.datetime,
+    to_datetime: datetime.datetime,
+) -> list[tuple[datetime.datetime, datetime.datetime]]:
+    """Return the periods between the given datetimes for which certificates have not
+    been issued to the Device, including gaps before its latest issued period.
 
     Args:
-        db_session (Session): The database session
+        write_session (Session): The database write session
         device_id (int): The device ID
+        from_datetime (datetime.datetime): The start of the period
+        to_datetime (datetime.datetime): The end of the period
 
     Returns:
-        datetime.datetime: The maximum certificate timestamp
+        list[tuple[datetime.datetime, datetime.datetime]]: The start and end of each
+            unissued period, in order
+    """
 
+    from_datetime = _to_naive_utc(from_datetime)
+    to_datetime = _to_naive_utc(to_datetime)
+
+    issued_intervals = write_session.exec(
+        select(DeviceIssuedInterval)
+        .where(
+            DeviceIssuedInterval.device_id == device_id,
+            DeviceIssuedInterval.interval_start < to_datetime,
+            DeviceIssuedInterval.interval_end > from_datetime,
+        )
+        .order_by(DeviceIssuedInterval.interval_start)  # type: ignore
+    ).all()
+
+    unissued_periods = []
+    period_start = from_datetime
+    for issued_interval in issued_intervals:
+        if issued_interval.interval_start > period_start:
+            unissued_periods.append((period_start, issued_interval.interval_start))
+        period_start = max(period_start, issued_interval.interval_end)
+
+    if period_start < to_datetime:
+        unissued_periods.append((period_start, to_datetime))
+
+    return unissued_periods
+
+
+def record_device_issuance(
+    write_session: Session,
+    device_id: int,
+    granular_certificate_bundles: Sequence[GranularCertificateBundleBase],
+) -> None:
+    """Record the production of the GC Bundles issued to a Device as issued in its
+    ledger, with one issued interval per contiguous run of GC Bundles, so that gaps
+    in the meter data between them are left to be issued. Only flushes, so that the
+    ledger is committed together with the GC Bundles.
+
+    Args:
+        write_session (Session): The database write session
+        device_id (int): The device ID
+        granular_certificate_bundles (Sequence[GranularCertificateBundleBase]): The
+            GC Bundles issued to the Device
     """
 
-    stmt: SelectOfScalar = select(
-        func.max(GranularCertificateBundle.production_ending_interval)
-    ).where(
-        GranularCertificateBundle.device_id == device_id,
-        GranularCertificateBundle.certificate_bundle_status
-        != CertificateStatus.WITHDRAWN,
+    bundle_periods = sorted(
+        (
+            _to_naive_utc(bundle.production_starting_interval),
+            _to_naive_utc(bundle.production_ending_interval),
+        )
+        for bundle in granular_certificate_bundles
     )
 
-    max_certificate_timestamp = db_session.exec(stmt).first()
-
-    if not max_certificate_timestamp:
-        return None
-    else:
-        return max_certificate_timestamp
+    # A GC Bundle continues the current run if it starts by the end of the run
+    issued_periods: list[tuple[datetime.datetime, datetime.datetime]] = []
+    for bundle_start, bundle_end in bundle_periods:
+        if issued_periods and bundle_start <= issued_periods[-1][1]:
+            run_start, run_end = issued_periods[-1]
+            issued_periods[-1] = (run_start, max(run_end, bundle_end))
+        else:
+            issued_periods.append((bundle_start, bundle_end))
+
+    for period_start, period_end in issued_periods:
+        # Merge the period with the issued intervals it overlaps or adjoins
+        adjoining_intervals = write_session.exec(
+            select(DeviceIssuedInterval).where(
+                DeviceIssuedInterval.device_id == device_id,
+                DeviceIssuedInterval.interval_start <= period_end,
+                DeviceIssuedInterval.interval_end >= period_start,
+            )
+        ).all()
+        for issued_interval in adjoining_intervals:
+            period_start = min(period_start, issued_interval.interval_start)
+            period_end = max(period_end, issued_interval.interval_end)
+            write_session.delete(issued_interval)
+
+        write_session.add(
+            DeviceIssuedInterval(
+                device_id=device_id,
+                interval_start=period_start,
+                interval_end=period_end,
+            )
+        )
+        write_session.flush()
 
 
 def issue_certificates_by_device_in_date_range(
@@ -228,25 +514,29 @@ def issue_certificates_by_device_in_date_range(
     to_datetime: datetime.datetime,
     write_session: Session,
     read_session: Session,
-    esdb_client: EventStoreDBClient,
+    esdb_client: EventStore,
     issuance_metadata_id: int,
     meter_data_client: AbstractMeterDataClient,
+    session_scope: Callable[[str], AbstractContextManager[Session]] = db.session_scope,
 ) -> list[SQLModel] | None:
     """Issue certificates for a device using the following process.
-    1. Get max timestamp already issued for the device
-    2. Get the meter data for the device for the given period
+    1. Find the periods not yet issued to the device from its issuance ledger
+    2. Get the meter data for the device for each unissued period
     3. Map the meter data to certificates
     4. Validate the certificates
-    5. Commit the certificates to the database
+    5. Allocate the certificate IDs and commit the certificates to the database,
+       together with the ledger
     Args:
         device (Device): The device
         from_datetime (datetime.datetime): The start of the period
         to_datetime (datetime.datetime): The end of the period
         write_session (Session): The database write session
         read_session (Session): The database read session
-        esdb_client (EventStoreDBClient): The EventStoreDB client
+        esdb_client (EventStore): The event store client
         issuance_metadata_id (int): The issuance metadata ID
         meter_data_client (MeterDataClient, optional): The meter data client.
+        session_scope (Callable[[str], AbstractContextManager[Session]]): Opens the
+            session on which the issuance ledger of the device is created
 
     Returns:
         list[GranularCertificateBundle]: The list of certificates issued
@@ -256,100 +546,119 @@ def issue_certificates_by_device_in_date_range(
         logger.error(f"No device ID or meter data ID for device: {device}")
         return None
 
-    # get max timestamp already issued for the device
-    max_issued_timestamp = get_max_certificate_timestamp_by_device_id(
-        read_session, device.id
-    )
+    # Created ahead of issuance in its own transaction, so that creating it does not
+    # hold a lock on the ledger whilst the meter data is fetched, nor commit any
+    # changes pending on the write session of the caller
+    with session_scope("db_write") as ledger_session:
+        create_device_issuance_ledger(ledger_session, device.id)
+        ledger_session.commit()
 
-    # check if the device has already been issued certificates for the given period
-    if max_issued_timestamp and max_issued_timestamp >= to_datetime:
+    # Periods before the latest issued one are backfilled if they were missed
+    unissued_periods = get_unissued_periods(
+        write_session, device.id, from_datetime, to_datetime
+    )
+    if not unissued_periods:
         logger.info(
             f"Device {device.id} has already been issued certificates for the period {from_datetime} to {to_datetime}"
         )
         return None
 
-    # If max timestamp ias after from them use the max timestamp as the from_datetime
-    if max_issued_timestamp and max_issued_timestamp > from_datetime:
-        from_datetime = max_issued_timestamp
-
-    # TODO CAG - this is messy by me, will refactor down the road
-    # Also, validation later on assumes the metering data is datetime sorted -
-    # can we guarantee this at the meter client level?
-    if meter_data_client.NAME == "ManualSubmissionMeterClient":
-        meter_data = meter_data_client.get_metering_by_device_in_datetime_range(
-            from_datetime, to_datetime, device.id, read_session
-        )
-    else:
-        meter_data = meter_data_client.get_metering_by_device_in_datetime_range(
-            from_datetime, to_datetime, device.meter_data_id
-        )
-
-    if not meter_data:
-        logger.info(f"No meter data retrieved for device: {device.meter_data_id}")
-        return None
+    # Map the meter data of each period to certificates. Certificate IDs are only
+    # allocated once the certificates are validated, so the mapped IDs start from 1
+    certificates: list[dict[str, Any]] = []
+    for period_start, period_end in unissued_periods:
+        # TODO CAG - this is messy by me, will refactor down the road
+        # Also, validation later on assumes the metering data is datetime sorted -
+        # can we guarantee this at the meter client level?
+        if meter_data_client.NAME == "ManualSubmissionMeterClient":
+            meter_data = meter_data_client.get_metering_by_device_in_datetime_range(
+                period_start, period_end, device.id, read_session
+            )
+        else:
+            meter_data = meter_data_client.get_metering_by_device_in_datetime_range(
+                period_start, period_end, device.meter_data_id
+            )
 
-    # Map the meter data to certificates
-    device_max_certificate_id = get_max_certificate_id_by_device_id(
-        read_session, device.id
-    )
-    if not device_max_certificate_id:
-        certificate_bundle_id_range_start = 1
-    else:
-        certificate_bundle_id_range_start = device_max_certificate_id + 1
+        if not meter_data:
+            logger.info(
+                f"No meter data retrieved for device {device.meter_data_id} from {period_start} to {period_end}"
+            )
+            continue
 
-    certificates = meter_data_client.map_metering_to_certificates(
-        generation_data=meter_data,
-        certificate_bundle_id_range_start=certificate_bundle_id_range_start,
-        account_id=device.account_id,
-        device=device,
-        is_storage=device.is_storage,
-        issuance_metadata_id=issuance_metadata_id,
-    )
+        period_certificates = meter_data_client.map_metering_to_certificates(
+            generation_data=meter_data,
+            certificate_bundle_id_range_start=(
+                certificates[-1]["certificate_bundle_id_range_end"] + 1
+                if certificates
+                else 1
+            ),
+            account_id=device.account_id,
+            device=device,
+            is_storage=device.is_storage,
+            issuance_metadata_id=issuance_metadata_id,
+        )
+        if period_certificates:
+            certificates.extend(period_certificates)
 
     if not certificates:
         err_msg = f"No meter data retrieved for device: {device.meter_data_id}"
         logger.error(err_msg)
         return None
 
-    if not device_max_certificate_id:
-        device_max_certificate_id = 0
+    # Validate the certificates together, as they are all issued to the same device
+    valid_certificates = validate_granular_certificate_bundles(
+        read_session,
+        certificates,
+        is_storage_device=device.is_storage,
+        max_certificate_id=0,
+    )
+    for valid_certificate in valid_certificates:
+        valid_certificate.hash = create_bundle_hash(valid_certificate, nonce="")
+        valid_certificate.issuance_id = create_issuance_id(valid_certificate)
 
-    # Validate the certificates
-    valid_certificates: list[Any] = []
-    for certificate in certificates:
-        # get max valid certificate max bundle id
-        if valid_certificates:
-            device_max_certificate_id = max(
-                [v.certificate_bundle_id_range_end for v in valid_certificates]
+    with cqrs.unit_of_work(write_session, read_session, esdb_client):
+        lock_device_issuance_ledger(write_session, device.id)
+
+        # Skip the certificates issued by a concurrent issuance to the device whilst
+        # the meter data was fetched, which may cover only part of a period
+        still_unissued_periods = get_unissued_periods(
+            write_session, device.id, from_datetime, to_datetime
+        )
+        certificates_to_issue = [
+            certificate
+            for certificate in valid_certificates
+            if any(
+                unissued_start
+                <= _to_naive_utc(certificate.production_starting_interval)
+                and _to_naive_utc(certificate.production_ending_interval)
+                <= unissued_end
+                for unissued_start, unissued_end in still_unissued_periods
             )
+        ]
+        n_skipped = len(valid_certificates) - len(certificates_to_issue)
+        if n_skipped:
+            logger.info(
+                f"Skipping {n_skipped} certificates for device {device.id} issued concurrently between {from_datetime} and {to_datetime}"
+            )
+        if not certificates_to_issue:
+            return None
 
-        if device_max_certificate_id is None:
-            err_msg = "Max certificate ID is None"
-            logger.error(err_msg)
-            raise ValueError(err_msg)
+        # Reserve the certificate IDs of all the bundles in one block
+        first_certificate_id = allocate_certificate_ids(
+            write_session,
+            device.id,
+            sum(certificate.bundle_quantity for certificate in certificates_to_issue),
+        )
+        assign_certificate_ids(certificates_to_issue, first_certificate_id)
 
-        valid_certificate = validate_granular_certificate_bundle(
+        # Batch commit the GC bundles to the database with the ledger
+        created_entities = cqrs.bulk_write_to_database(
+            certificates_to_issue,  # type: ignore
+            write_session,
             read_session,
-            certificate,
-            is_storage_device=device.is_storage,
-            max_certificate_id=device_max_certificate_id,
+            esdb_client,
         )
-        valid_certificate.hash = create_bundle_hash(valid_certificate, nonce="")
-        valid_certificate.issuance_id = create_issuance_id(valid_certificate)
-        valid_certificates.append(valid_certificate)
-
-        # Because this function is only applied to one device at a time, we can be
-        # certain that the highest bundle id range end is from the most recent bundle
-        # in this collection
-        device_max_certificate_id = valid_certificate.certificate_bundle_id_range_end
-
-    # Batch commit the GC bundles to the database
-    created_entities = cqrs.write_to_database(
-        valid_certificates,  # type: ignore
-        write_session,
-        read_session,
-        esdb_client,
-    )
+        record_device_issuance(write_session, device.id, certificates_to_issue)
 
     return created_entities
 
@@ -359,9 +668,10 @@ def issue_certificates_in_date_range(
     to_datetime: datetime.datetime,
     write_session: Session,
     read_session: Session,
-    esdb_client: EventStoreDBClient,
+    esdb_client: EventStore,
     issuance_metadata_id: int,
     meter_data_client: AbstractMeterDataClient,
+    session_scope: Callable[[str], AbstractContextManager[Session]] = db.session_scope,
 ) -> list[SQLModel] | None:
     """Issues certificates for a device using the following process.
     1. Get a list of devices in the registry and their capacities
@@ -377,6 +687,8 @@ def issue_certificates_in_date_range(
         read_session (Session): The database read session
         issuance_metadata_id (int): The issuance metadata ID
         meter_data_client (MeterDataClient, optional): The meter data client. Defaults to Depends(ElexonClient).
+        session_scope (Callable[[str], AbstractContextManager[Session]]): Opens the
+            sessions on which the issuance ledgers of the devices are created
 
     Returns:
         list[GranularCertificateBundle]: The list of certificates issued
@@ -413,6 +725,7 @@ def issue_certificates_in_date_range(
             esdb_client,
             issuance_metadata_id,
             meter_data_client,
+            session_scope,
         )
         if created_entities:
             certificate_bundles.extend(created_entities)
@@ -420,11 +733,137 @@ def issue_certificates_in_date_range(
     return certificate_bundles
 
 
+def _issue_certificates_to_device(
+    device: Device,
+    from_datetime: datetime.datetime,
+    to_datetime: datetime.datetime,
+    esdb_client: EventStore,
+    issuance_metadata_id: int,
+    meter_data_client: AbstractMeterDataClient,
+    session_scope: Callable[[str], AbstractContextManager[Session]],
+) -> DeviceIssuanceReport:
+    """Issue certificates to a Device on its own write and read sessions, so that a
+    failure only rolls back the issuance of this Device."""
+
+    started = time.perf_counter()
+    try:
+        with (
+            session_scope("db_write") as write_session,
+            session_scope("db_read") as read_session,
+        ):
+            created_entities = issue_certificates_by_device_in_date_range(
+                device,
+                from_datetime,
+                to_datetime,
+                write_session,
+                read_session,
+                esdb_client,
+                issuance_metadata_id,
+                meter_data_client,
+                session_scope,
+            )
+    except Exception as e:
+        logger.error(f"Error issuing certificates for device {device.id}: {str(e)}")
+        return DeviceIssuanceReport(
+            device_id=device.id,
+            status="failed",
+            error=str(e),
+            duration_seconds=time.perf_counter() - started,
+        )
+
+    return DeviceIssuanceReport(
+        device_id=device.id,
+        status="issued" if created_entities else "skipped",
+        n_bundles=len(created_entities or []),
+        duration_seconds=time.perf_counter() - started,
+    )
+
+
+def issue_certificates_in_date_range_parallel(
+    from_datetime: datetime.datetime,
+    to_datetime: datetime.datetime,
+    esdb_client: EventStore,
+    issuance_metadata_id: int,
+    meter_data_client: AbstractMeterDataClient,
+    session_scope: Callable[[str], AbstractContextManager[Session]] = db.session_scope,
+    max_workers: int = settings.ISSUANCE_MAX_WORKERS,
+) -> list[DeviceIssuanceReport]:
+    """Issue certificates to every device in the registry, as in
+    issue_certificates_in_date_range, but issuing to several devices at once.
+
+    Issuance is bound by fetching meter data and writing the GC Bundles, so devices
+    are issued to on a pool of threads. Each device is issued to on its own sessions
+    and transactions, and a device that fails is reported without affecting the
+    others.
+
+    Args:
+        from_datetime (datetime.datetime): The start of the period
+        to_datetime (datetime.datetime): The end of the period
+        esdb_client (EventStore): The event store client, shared by the workers
+        issuance_metadata_id (int): The issuance metadata ID
+        meter_data_client (AbstractMeterDataClient): The meter data client, shared
+            by the workers
+        session_scope (Callable[[str], AbstractContextManager[Session]]): Opens a
+            session on the named database for each device
+        max_workers (int): The number of devices issued to concurrently
+
+    Returns:
+        list[DeviceIssuanceReport]: The outcome of issuance for each device
+    """
+
+    with session_scope("db_read") as read_session:
+        devices = get_all_devices(read_session)
+
+    if not devices:
+        logger.error("No devices found in the registry")
+        return []
+
+    issuance_reports: list[DeviceIssuanceReport] = []
+    devices_to_issue: list[Device] = []
+    for device in devices:
+        if not device.id or not device.meter_data_id:
+            err_msg = f"No device ID or meter data ID for device: {device.id}"
+            logger.error(err_msg)
+            issuance_reports.append(
+                DeviceIssuanceReport(
+                    device_id=device.id, status="skipped", error=err_msg
+                )
+            )
+            continue
+        devices_to_issue.append(device)
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="issuance"
+    ) as executor:
+        issuance_reports.extend(
+            executor.map(
+                lambda device: _issue_certificates_to_device(
+                    device,
+                    from_datetime,
+                    to_datetime,
+                    esdb_client,
+                    issuance_metadata_id,
+                    meter_data_client,
+                    session_scope,
+                ),
+                devices_to_issue,
+            )
+        )
+
+    n_failed = sum(report.status == "failed" for report in issuance_reports)
+    n_bundles = sum(report.n_bundles for report in issuance_reports)
+    logger.info(
+        f"Issued {n_bundles} GC Bundles to {len(issuance_reports)} devices, {n_failed} failed"
+    )
+
+    return issuance_reports
+
+
 def process_certificate_bundle_action(
     certificate_action: GranularCertificateActionBase,
     write_session: Session,
     read_session: Session,
-    esdb_client: EventStoreDBClient,
+    esdb_client: EventStore,
 ) -> GranularCertificateAction | None:
     """Process the given certificate action.
 
@@ -432,7 +871,7 @@ def process_certificate_bundle_action(
         certificate_action (GranularCertificateAction): The certificate action
         write_session (Session): The database write session
         read_session (Session): The database read session
-        esdb_client (EventStoreDBClient): The EventStoreDB client
+        esdb_client (EventStore): The event store client
 
     Returns:
         list[GranularCertificateAction]: The list of certificates processed
@@ -463,17 +902,18 @@ def process_certificate_bundle_action(
         logger.error(err_msg)
         raise ValueError(err_msg)
 
-    # try:
     action_function: Callable[..., Any] = certificate_action_functions[
         valid_certificate_action.action_type
     ]
-    action_function(certificate_action, write_session, read_session, esdb_client)
-    # except Exception as e:
-    #     logger.error(f"Error whilst processing certificate action: {str(e)}")
 
-    db_certificate_actions = GranularCertificateAction.create(
-        valid_certificate_action, write_session, read_session, esdb_client
-    )
+    # Bundle splits, updates and the action record are committed together, with their
+    # events published in a single append, so a failed action leaves no partial changes
+    with cqrs.unit_of_work(write_session, read_session, esdb_client):
+        action_function(certificate_action, write_session, read_session, esdb_client)
+
+        db_certificate_actions = GranularCertificateAction.create(
+            valid_certificate_action, write_session, read_session, esdb_client
+        )
 
     return db_certificate_actions[0]  # type: ignore
 
@@ -488,7 +928,7 @@ def apply_bundle_quantity_or_percentage(
     | GranularCertificateLock,
     write_session: Session,
     read_session: Session,
-    esdb_client: EventStoreDBClient,
+    esdb_client: EventStore,
 ) -> list[GranularCertificateBundle]:
     """Apply the bundle quantity or percentage to the certificates from the query.
 
@@ -501,7 +941,7 @@ def apply_bundle_quantity_or_percentage(
         certificate_bundle_action (GranularCertificateAction): The certificate action
         write_session (Session): The database write session
         read_session (Session): The database read session
-        esdb_client (EventStoreDBClient): The EventStoreDB client
+        esdb_client (EventStore): The event store client
 
     Returns:
         list[GranularCertificateBundle]: The list of certificates to transfer, split if required
@@ -558,29 +998,16 @@ def apply_bundle_quantity_or_percentage(
     return certificates_bundles_to_transfer
 
 
-def query_certificate_bundles(
-    certificate_query: GranularCertificateQuery,
-    read_session: Session | None = None,
-    write_session: Session | None = None,
-) -> list[GranularCertificateBundle] | None:
-    """Query certificates based on the given filter parameters.
-
-    By default will return read versions of the GC bundles, but if update operations
-    are to be performed on them then passing a write session will override the
-    read session and return instances from the writer database with the associated
-    ActiveUtils methods.
-
-    If no certificates are found with the given query parameters, will return None.
-
-    Args:
-        certificate_query (GranularCertificateAction): The certificate action
-        read_session (Session): The database read session
-        write_session (Session | None): The database write session
+CertificateBundleModel = (
+    type[GranularCertificateBundle] | type[GranularCertificateBundleReadModel]
+)
 
-    Returns:
-        list[GranularCertificateBundle]: The list of certificates
 
-    """
+def _certificate_query_session(
+    read_session: Session | None, write_session: Session | None
+) -> tuple[Session, CertificateBundleModel] | None:
+    """Return the session and bundle table that a certificate query should use, with
+    a write session overriding the read session."""
 
     if (read_session is None) & (write_session is None):
         logger.error(
@@ -588,13 +1015,34 @@ def query_certificate_bundles(
         )
         return None
 
-    session: Session = read_session if write_session is None else write_session  # type: ignore
+    # Reads are served from the denormalised read table, which is indexed for these filters
+    if write_session is None:
+        return read_session, GranularCertificateBundleReadModel  # type: ignore
+
+    return write_session, GranularCertificateBundle
+
+
+def build_certificate_bundle_query(
+    certificate_query: GranularCertificateQuery,
+    bundle_model: CertificateBundleModel,
+) -> SelectOfScalar:
+    """Build the statement selecting the GC Bundles of the given bundle table that
+    match the filter parameters of the query, excluding deleted GC Bundles.
+
+    Args:
+        certificate_query (GranularCertificateQuery): The certificate query
+        bundle_model (CertificateBundleModel): The bundle table to query, either the
+            write table or the denormalised read table
+
+    Returns:
+        SelectOfScalar: The select statement
+    """
 
     # Query certificates based on the given filter parameters, without returning deleted
     # certificates
-    stmt: SelectOfScalar = select(GranularCertificateBundle).where(
-        GranularCertificateBundle.account_id == certificate_query.source_id,
-        GranularCertificateBundle.is_deleted == False,  # noqa
+    stmt: SelectOfScalar = select(bundle_model).where(
+        bundle_model.account_id == certificate_query.source_id,
+        bundle_model.is_deleted == False,  # noqa
     )
 
     exclude = {"user_id", "localise_time", "source_id"}
@@ -610,9 +1058,9 @@ def query_certificate_bundles(
             ]
             sparse_filter_clauses = [
                 (
-                    (GranularCertificateBundle.device_id == device_id)
+                    (bundle_model.device_id == device_id)
                     & (
-                        GranularCertificateBundle.production_starting_interval
+                        bundle_model.production_starting_interval
                         == production_starting_interval
                     )
                 )
@@ -621,31 +1069,275 @@ def query_certificate_bundles(
                     production_starting_interval,
                 ) in device_interval_pairs
             ]
-            stmt = select(GranularCertificateBundle).where(or_(*sparse_filter_clauses))
+            stmt = select(bundle_model).where(or_(*sparse_filter_clauses))
             break
         elif query_param == "certificate_period_start":
-            stmt = stmt.where(
-                GranularCertificateBundle.production_starting_interval >= query_value
-            )
+            stmt = stmt.where(bundle_model.production_starting_interval >= query_value)
         elif query_param == "certificate_period_end":
+            # Bundles end after they start, so also bounding the start lets the
+            # planner prune the monthly partitions after the end of the period
             stmt = stmt.where(
-                GranularCertificateBundle.production_ending_interval <= query_value
+                bundle_model.production_ending_interval <= query_value,
+                bundle_model.production_starting_interval < query_value,
             )
         else:
-            stmt = stmt.where(
-                getattr(GranularCertificateBundle, query_param) == query_value
-            )
+            stmt = stmt.where(getattr(bundle_model, query_param) == query_value)
+
+    return stmt
 
+
+def query_certificate_bundles(
+    certificate_query: GranularCertificateQuery,
+    read_session: Session | None = None,
+    write_session: Session | None = None,
+) -> list[GranularCertificateBundle] | list[GranularCertificateBundleReadModel] | None:
+    """Query certificates based on the given filter parameters.
+
+    By default will return the denormalised read model of the GC bundles, but if update
+    operations are to be performed on them then passing a write session will override
+    the read session and return instances from the writer database with the associated
+    ActiveUtils methods.
+
+    If no certificates are found with the given query parameters, will return None.
+
+    Args:
+        certificate_query (GranularCertificateAction): The certificate action
+        read_session (Session): The database read session
+        write_session (Session | None): The database write session
+
+    Returns:
+        list[GranularCertificateBundle] | list[GranularCertificateBundleReadModel]: The list of certificates
+
+    """
+
+    query_session = _certificate_query_session(read_session, write_session)
+    if query_session is None:
+        return None
+    session, bundle_model = query_session
+
+    stmt = build_certificate_bundle_query(certificate_query, bundle_model)
     granular_certificate_bundles = session.exec(stmt).all()
 
     return granular_certificate_bundles
 
 
+# Pages of certificate query results are ordered by the production start and then the
+# ID of their GC Bundles, which the account and interval indexes can serve
+CertificateBundleKey = tuple[datetime.datetime, int]
+
+
+def encode_certificate_query_cursor(
+    production_starting_interval: datetime.datetime, bundle_id: int
+) -> str:
+    """Encode the key of the last GC Bundle of a page as an opaque cursor."""
+
+    key = json.dumps([production_starting_interval.isoformat(), bundle_id])
+    return base64.urlsafe_b64encode(key.encode()).decode()
+
+
+def decode_certificate_query_cursor(cursor: str) -> CertificateBundleKey:
+    """Decode a cursor returned with a page of certificate query results into the key
+    of the last GC Bundle of that page."""
+
+    try:
+        production_starting_interval, bundle_id = json.loads(
+            base64.urlsafe_b64decode(cursor.encode())
+        )
+        return datetime.datetime.fromisoformat(production_starting_interval), int(
+            bundle_id
+        )
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid certificate query cursor: {cursor}")
+
+
+def parse_certificate_bundle_fields(fields: str) -> list[str]:
+    """Parse a comma separated selection of GC Bundle fields, which always includes
+    the GC Bundle ID.
+
+    Args:
+        fields (str): The comma separated field names
+
+    Returns:
+        list[str]: The selected field names, starting with the ID
+    """
+
+    selected_fields = list(
+        dict.fromkeys(["id", *(field.strip() for field in fields.split(","))])
+    )
+    selected_fields = [field for field in selected_fields if field]
+
+    unknown_fields = [
+        field
+        for field in selected_fields
+        if field not in GranularCertificateBundleRead.model_fields
+    ]
+    if unknown_fields:
+        raise ValueError(f"Unknown GC Bundle fields: {', '.join(unknown_fields)}")
+
+    return selected_fields
+
+
+def query_certificate_bundle_page(
+    certificate_query: GranularCertificateQuery,
+    limit: int | None = None,
+    after: CertificateBundleKey | None = None,
+    fields: list[str] | None = None,
+    read_session: Session | None = None,
+    write_session: Session | None = None,
+) -> (
+    tuple[
+        list[GranularCertificateBundle]
+        | list[GranularCertificateBundleReadModel]
+        | list[dict[str, Any]],
+        str | None,
+    ]
+    | None
+):
+    """Query a page of the certificates matching the given filter parameters, using
+    keyset pagination so that later pages cost the same as the first.
+
+    If fields are selected, only those columns are read from the database and the
+    GC Bundles are returned as dictionaries of the selected fields.
+
+    Args:
+        certificate_query (GranularCertificateQuery): The certificate query
+        limit (int | None): The maximum number of GC Bundles in the page, returning
+            every matching GC Bundle if not given
+        after (CertificateBundleKey | None): The key of the last GC Bundle of the
+            previous page
+        fields (list[str] | None): The GC Bundle fields to return
+        read_session (Session | None): The database read session
+        write_session (Session | None): The database write session, overriding the
+            read session
+
+    Returns:
+        tuple[list, str | None] | None: The GC Bundles of the page, and the cursor of
+            the next page if there are more matching GC Bundles
+    """
+
+    query_session = _certificate_query_session(read_session, write_session)
+    if query_session is None:
+        return None
+    session, bundle_model = query_session
+
+    stmt = build_certificate_bundle_query(certificate_query, bundle_model)
+    if fields is not None:
+        # The key columns are needed to build the cursor of the next page
+        key_fields = ["production_starting_interval", "id"] if limit else []
+        stmt = stmt.with_only_columns(
+            *[
+                getattr(bundle_model, field)
+                for field in dict.fromkeys([*fields, *key_fields])
+            ]
+        )
+
+    if limit is not None:
+        stmt = stmt.order_by(
+            bundle_model.production_starting_interval,
+            bundle_model.id,  # type: ignore
+        )
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(bundle_model.production_starting_interval, bundle_model.id)
+                > tuple_(*after)
+            )
+        # Fetch one GC Bundle beyond the page to find out whether another page follows
+        stmt = stmt.limit(limit + 1)
+
+    if fields is None:
+        rows: list = list(session.exec(stmt).all())
+    else:
+        rows = [dict(row) for row in session.execute(stmt).mappings()]
+
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        last_row = rows[-1]
+        if fields is None:
+            next_cursor = encode_certificate_query_cursor(
+                last_row.production_starting_interval, last_row.id
+            )
+        else:
+            next_cursor = encode_certificate_query_cursor(
+                last_row["production_starting_interval"], last_row["id"]
+            )
+
+    if fields is not None:
+        rows = [{field: row[field] for field in fields} for row in rows]
+
+    return rows, next_cursor
+
+
+def summarise_certificate_bundles(
+    certificate_query: GranularCertificateQuery,
+    read_session: Session | None = None,
+    write_session: Session | None = None,
+) -> tuple[int, int] | None:
+    """Count the GC Bundles matching the query and sum their volume in the database.
+
+    Args:
+        certificate_query (GranularCertificateQuery): The certificate query
+        read_session (Session | None): The database read session
+        write_session (Session | None): The database write session, overriding the
+            read session
+
+    Returns:
+        tuple[int, int] | None: The number of GC Bundles and their total volume
+    """
+
+    query_session = _certificate_query_session(read_session, write_session)
+    if query_session is None:
+        return None
+    session, bundle_model = query_session
+
+    matching_bundles = build_certificate_bundle_query(
+        certificate_query, bundle_model
+    ).subquery()
+    n_bundles, total_volume = session.execute(
+        select(
+            func.count(),
+            func.coalesce(func.sum(matching_bundles.c.bundle_quantity), 0),
+        ).select_from(matching_bundles)
+    ).one()
+
+    return n_bundles, total_volume
+
+
+def stream_certificate_bundles(
+    certificate_query: GranularCertificateQuery,
+    read_session: Session | None = None,
+    write_session: Session | None = None,
+    batch_size: int = settings.CERTIFICATE_QUERY_STREAM_BATCH_SIZE,
+) -> Iterator[GranularCertificateBundle | GranularCertificateBundleReadModel]:
+    """Yield the GC Bundles matching the query from a server-side cursor, fetching
+    them from the database in batches so that memory use does not grow with the
+    size of the result.
+
+    Args:
+        certificate_query (GranularCertificateQuery): The certificate query
+        read_session (Session | None): The database read session
+        write_session (Session | None): The database write session, overriding the
+            read session
+        batch_size (int): The number of GC Bundles fetched from the cursor at a time
+
+    Yields:
+        GranularCertificateBundle | GranularCertificateBundleReadModel: The GC Bundles
+    """
+
+    query_session = _certificate_query_session(read_session, write_session)
+    if query_session is None:
+        return
+    session, bundle_model = query_session
+
+    stmt = build_certificate_bundle_query(certificate_query, bundle_model)
+    yield from session.exec(stmt.execution_options(yield_per=batch_size))
+
+
 def transfer_certificates(
     certificate_bundle_action: GranularCertificateTransfer,
     write_session: Session,
     read_session: Session,
-    esdb_client: EventStoreDBClient,
+    esdb_client: EventStore,
 ) -> None:
     """Transfer a fixed number of certificates matched to the given filter parameters to the specified target Account.
 
@@ -653,7 +1345,7 @@ def transfer_certificates(
         certificate_bundle_action (GranularCertificateAction): The certificate action
         write_session (Session): The database write session
         read_session (Session): The database read session
-        esdb_client (EventStoreDBClient): The EventStoreDB client
+        esdb_client (EventStore): The event store client
 
     """
 
@@ -664,8 +1356,9 @@ def transfer_certificates(
         logger.error(err_msg)
         raise ValueError(err_msg)
 
-    # Check that the target account has whitelisted the source account
-    account = Account.by_id(certificate_bundle_action.target_id, read_session)
+    # Check that the target account has whitelisted the source account, reading it
+    # from the write DB so that a whitelist update made just before is observed
+    account = Account.by_id(certificate_bundle_action.target_id, write_session)
     account_whitelist = (
         [] if account.account_whitelist is None else account.account_whitelist
     )
@@ -702,11 +1395,16 @@ def transfer_certificates(
     )
 
     # Transfer certificates by updating account ID of target bundle
-    for certificate in certificates_bundles_to_transfer:
-        certificate_update = GranularCertificateBundleUpdate(
-            account_id=certificate_bundle_action.target_id
-        )
-        certificate.update(certificate_update, write_session, read_session, esdb_client)
+    certificate_update = GranularCertificateBundleUpdate(
+        account_id=certificate_bundle_action.target_id
+    )
+    cqrs.bulk_update_database_entities(
+        certificates_bundles_to_transfer,  # type: ignore
+        certificate_update,
+        write_session,
+        read_session,
+        esdb_client,
+    )
 
     return
 
@@ -715,7 +1413,7 @@ def cancel_certificates(
     certificate_transfer: GranularCertificateCancel,
     write_session: Session,
     read_session: Session,
-    esdb_client: EventStoreDBClient,
+    esdb_client: EventStore,
 ) -> None:
     """Cancel certificates matched to the given filter parameters.
 
@@ -723,7 +1421,7 @@ def cancel_certificates(
         certificate_bundle_action (GranularCertificateAction): The certificate action
         write_session (Session): The database write session
         read_session (Session): The database read session
-        esdb_client (EventStoreDBClient): The EventStoreDB client
+        esdb_client (EventStore): The event store client
 
     """
 
@@ -756,12 +1454,17 @@ def cancel_certificates(
     )
 
     # Cancel certificates
-    for certificate in certificates_bundles_to_cancel:
-        certificate_update = GranularCertificateBundleUpdate(
-            certificate_bundle_status=CertificateStatus.CANCELLED,
-            beneficiary=certificate_transfer.beneficiary,
-        )
-        certificate.update(certificate_update, write_session, read_session, esdb_client)
+    certificate_update = GranularCertificateBundleUpdate(
+        certificate_bundle_status=CertificateStatus.CANCELLED,
+        beneficiary=certificate_transfer.beneficiary,
+    )
+    cqrs.bulk_update_database_entities(
+        certificates_bundles_to_cancel,  # type: ignore
+        certificate_update,
+        write_session,
+        read_session,
+        esdb_client,
+    )
 
     return
 
@@ -770,7 +1473,7 @@ def claim_certificates(
     certificate_claim: GranularCertificateClaim,
     write_session: Session,
     read_session: Session,
-    esdb_client: EventStoreDBClient,
+    esdb_client: EventStore,
 ) -> None:
     """Claim certificates matched to the given filter parameters.
 
@@ -778,7 +1481,7 @@ def claim_certificates(
         certificate_bundle_action (GranularCertificateAction): The certificate action
         write_session (Session): The database write session
         read_session (Session): The database read session
-        esdb_client (EventStoreDBClient): The EventStoreDB client
+        esdb_client (EventStore): The event store client
 
     """
 
@@ -815,11 +1518,16 @@ def claim_certificates(
             certificate.certificate_bundle_status == CertificateStatus.CANCELLED
         ), f"Certificate with ID {certificate.issuance_id} is not cancelled and cannot be claimed"
 
-        certificate_update = GranularCertificateBundleUpdate(
-            certificate_bundle_status=CertificateStatus.CLAIMED
-        )
-
-        certificate.update(certificate_update, write_session, read_session, esdb_client)
+    certificate_update = GranularCertificateBundleUpdate(
+        certificate_bundle_status=CertificateStatus.CLAIMED
+    )
+    cqrs.bulk_update_database_entities(
+        certificates_bundles_to_claim,  # type: ignore
+        certificate_update,
+        write_session,
+        read_session,
+        esdb_client,
+    )
 
     return
 
@@ -828,7 +1536,7 @@ def withdraw_certificates(
     certificate_bundle_action: GranularCertificateWithdraw,
     write_session: Session,
     read_session: Session,
-    esdb_client: EventStoreDBClient,
+    esdb_client: EventStore,
 ) -> None:
     """Withdraw certificates matched to the given filter parameters.
 
@@ -836,7 +1544,7 @@ def withdraw_certificates(
         certificate_bundle_action (GranularCertificateAction): The certificate action
         write_session (Session): The database write session
         read_session (Session): The database read session
-        esdb_client (EventStoreDBClient): The EventStoreDB client
+        esdb_client (EventStore): The event store client
 
     """
 
@@ -862,11 +1570,16 @@ def withdraw_certificates(
     )
 
     # Withdraw certificates
-    for certificate in certificates_bundles_to_withdraw:
-        certificate_update = GranularCertificateBundleUpdate(
-            certificate_bundle_status=CertificateStatus.WITHDRAWN
-        )
-        certificate.update(certificate_update, write_session, read_session, esdb_client)
+    certificate_update = GranularCertificateBundleUpdate(
+        certificate_bundle_status=CertificateStatus.WITHDRAWN
+    )
+    cqrs.bulk_update_database_entities(
+        certificates_bundles_to_withdraw,  # type: ignore
+        certificate_update,
+        write_session,
+        read_session,
+        esdb_client,
+    )
 
     return
 
@@ -875,7 +1588,7 @@ def lock_certificates(
     certificate_bundle_action: GranularCertificateLock,
     write_session: Session,
     read_session: Session,
-    esdb_client: EventStoreDBClient,
+    esdb_client: EventStore,
 ) -> None:
     """Lock certificates matched to the given filter parameters.
 
@@ -883,7 +1596,7 @@ def lock_certificates(
         certificate_bundle_action (GranularCertificateAction): The certificate action
         write_session (Session): The database write session
         read_session (Session): The database read session
-        esdb_client (EventStoreDBClient): The EventStoreDB client
+        esdb_client (EventStore): The event store client
 
     Returns:
         list[GranularCertificateAction]: The list of certificates locked
@@ -910,11 +1623,16 @@ def lock_certificates(
     )
 
     # Lock certificates
-    for certificate in certificates_bundles_to_lock:
-        certificate_update = GranularCertificateBundleUpdate(
-            certificate_bundle_status=CertificateStatus.LOCKED
-        )
-        certificate.update(certificate_update, write_session, read_session, esdb_client)
+    certificate_update = GranularCertificateBundleUpdate(
+        certificate_bundle_status=CertificateStatus.LOCKED
+    )
+    cqrs.bulk_update_database_entities(
+        certificates_bundles_to_lock,  # type: ignore
+        certificate_update,
+        write_session,
+        read_session,
+        esdb_client,
+    )
 
     return
 
@@ -923,7 +1641,7 @@ def reserve_certificates(
     certificate_reserve: GranularCertificateReserve,
     write_session: Session,
     read_session: Session,
-    esdb_client: EventStoreDBClient,
+    esdb_client: EventStore,
 ) -> None:
     """Reserve certificates matched to the given filter parameters.
 
@@ -931,7 +1649,7 @@ def reserve_certificates(
         certificate_bundle_action (GranularCertificateAction): The certificate action
         write_session (Session): The database write session
         read_session (Session): The database read session
-        esdb_client (EventStoreDBClient): The EventStoreDB client
+        esdb_client (EventStore): The event store client
 
     """
 
@@ -955,10 +1673,15 @@ def reserve_certificates(
     )
 
     # Reserve certificates
-    for certificate in certificates_bundles_to_reserve:
-        certificate_update = GranularCertificateBundleUpdate(
-            certificate_bundle_status=CertificateStatus.RESERVED
-        )
-        certificate.update(certificate_update, write_session, read_session, esdb_client)
+    certificate_update = GranularCertificateBundleUpdate(
+        certificate_bundle_status=CertificateStatus.RESERVED
+    )
+    cqrs.bulk_update_database_entities(
+        certificates_bundles_to_reserve,  # type: ignore
+        certificate_update,
+        write_session,
+        read_session,
+        esdb_client,
+    )
 
     return
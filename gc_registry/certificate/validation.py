@@ -1,34 +1,40 @@
 from typing import Any
 
+import numpy as np
 from fastapi import HTTPException
-from fluent_validator import validate  # type: ignore
+from pydantic import ValidationError
 from sqlmodel import Session
 
 from gc_registry.certificate.models import (
     GranularCertificateAction,
     GranularCertificateBundle,
+    GranularCertificateBundleArchive,
 )
 from gc_registry.certificate.schemas import GranularCertificateBundleCreate
 from gc_registry.core.services import create_bundle_hash
 from gc_registry.device.services import (
     device_mw_capacity_to_wh_max,
-    get_device_capacity_by_id,
+    get_device_capacities_by_id,
 )
 from gc_registry.settings import settings
 from gc_registry.user.models import User
 
 
 def verifiy_bundle_lineage(
-    granular_certificate_bundle_parent: GranularCertificateBundle,
-    granular_certificate_bundle_child: GranularCertificateBundle,
+    granular_certificate_bundle_parent: GranularCertificateBundle
+    | GranularCertificateBundleArchive,
+    granular_certificate_bundle_child: GranularCertificateBundle
+    | GranularCertificateBundleArchive,
 ):
     """
     Given a parent and child GC Bundle, verify that the child's hash
     can be recreated from the parent's hash and the child's nonce.
 
+    Either bundle may have been moved to the archive of deleted GC Bundles.
+
     Args:
-        granular_certificate_bundle_parent (GranularCertificateBundle): The parent GC Bundle
-        granular_certificate_bundle_child (GranularCertificateBundle): The child GC Bundle
+        granular_certificate_bundle_parent (GranularCertificateBundle | GranularCertificateBundleArchive): The parent GC Bundle
+        granular_certificate_bundle_child (GranularCertificateBundle | GranularCertificateBundleArchive): The child GC Bundle
 
     Returns:
         bool: Whether the child's hash can be recreated from the parent's hash
@@ -42,43 +48,131 @@ def verifiy_bundle_lineage(
     )
 
 
-def validate_granular_certificate_bundle(
+def validate_granular_certificate_bundles(
     db_session: Session,
-    raw_granular_certificate_bundle: dict[str, Any],
+    raw_granular_certificate_bundles: list[dict[str, Any]],
     is_storage_device: bool,
     max_certificate_id: int,
     hours: float = settings.CERTIFICATE_GRANULARITY_HOURS,
-) -> GranularCertificateBundle:
-    granular_certificate_bundle = GranularCertificateBundleCreate.model_validate(
-        raw_granular_certificate_bundle
-    )
+) -> list[GranularCertificateBundle]:
+    """Validate a batch of GC Bundles in issuance order.
 
-    W_IN_MW = 1e6
-    device_id = granular_certificate_bundle.device_id
+    Equivalent to validating each bundle in turn against the ID range end of the
+    bundles before it, but the device capacities are looked up with a single query
+    and the quantity and ID range checks are applied to all bundles at once.
 
-    device_w = get_device_capacity_by_id(db_session, device_id)
+    Args:
+        db_session (Session): The database session to look up device capacities
+        raw_granular_certificate_bundles (list[dict[str, Any]]): The GC Bundles to
+            validate, ordered by their certificate ID ranges
+        is_storage_device (bool): Whether the GC Bundles were produced by a storage
+            device
+        max_certificate_id (int): The highest certificate ID issued to the device
+            before these GC Bundles
+        hours (float): The production period of each GC Bundle in hours
 
-    if not device_w:
-        raise ValueError(f"Device with ID {device_id} not found")
+    Raises:
+        ValueError: The error of the first invalid GC Bundle, as raised when the
+            bundles are validated one at a time
 
-    device_mw = device_w / W_IN_MW
-    device_max_watts_hours = device_mw_capacity_to_wh_max(device_mw, hours)
+    Returns:
+        list[GranularCertificateBundle]: The validated GC Bundles
+    """
 
-    # Validate the bundle quantity is equal to the difference between the bundle ID range
-    # and less than the device max watts hours
-    validate(
-        granular_certificate_bundle.bundle_quantity, identifier="bundle_quantity"
-    ).less_than(device_max_watts_hours * settings.CAPACITY_MARGIN).equal(
-        granular_certificate_bundle.certificate_bundle_id_range_end
-        - granular_certificate_bundle.certificate_bundle_id_range_start
-        + 1
-    )
+    granular_certificate_bundles: list[GranularCertificateBundleCreate] = []
+    schema_error: ValidationError | None = None
+    for raw_granular_certificate_bundle in raw_granular_certificate_bundles:
+        try:
+            granular_certificate_bundles.append(
+                GranularCertificateBundleCreate.model_validate(
+                    raw_granular_certificate_bundle
+                )
+            )
+        except ValidationError as e:
+            # Bundles after the first invalid one are never reached
+            schema_error = e
+            break
+
+    n_bundles = len(granular_certificate_bundles)
+    if n_bundles > 0:
+        device_ids = np.fromiter(
+            (bundle.device_id for bundle in granular_certificate_bundles),
+            dtype=np.int64,
+            count=n_bundles,
+        )
+        bundle_quantities = np.fromiter(
+            (bundle.bundle_quantity for bundle in granular_certificate_bundles),
+            dtype=np.int64,
+            count=n_bundles,
+        )
+        id_range_starts = np.fromiter(
+            (
+                bundle.certificate_bundle_id_range_start
+                for bundle in granular_certificate_bundles
+            ),
+            dtype=np.int64,
+            count=n_bundles,
+        )
+        id_range_ends = np.fromiter(
+            (
+                bundle.certificate_bundle_id_range_end
+                for bundle in granular_certificate_bundles
+            ),
+            dtype=np.int64,
+            count=n_bundles,
+        )
 
-    # Validate the bundle ID range start is greater than the previous max certificate ID
-    validate(
-        granular_certificate_bundle.certificate_bundle_id_range_start,
-        identifier="certificate_bundle_id_range_start",
-    ).equal(max_certificate_id + 1)
+        W_IN_MW = 1e6
+        unique_device_ids, device_index = np.unique(device_ids, return_inverse=True)
+        device_capacities = get_device_capacities_by_id(
+            db_session, unique_device_ids.tolist()
+        )
+        device_w = np.array(
+            [
+                device_capacities.get(device_id) or np.nan
+                for device_id in unique_device_ids.tolist()
+            ]
+        )[device_index]
+        device_max_watts_hours = device_mw_capacity_to_wh_max(device_w / W_IN_MW, hours)
+
+        # Each bundle must start after the highest certificate ID issued before it
+        previous_max_certificate_ids = np.empty(n_bundles, dtype=np.int64)
+        previous_max_certificate_ids[0] = max_certificate_id
+        previous_max_certificate_ids[1:] = np.maximum.accumulate(id_range_ends)[:-1]
+
+        # Checks in the order they are applied to each bundle, so that ties on the
+        # first invalid bundle raise the same error as individual validation
+        failed_checks = [
+            (np.isnan(device_w), "Device with ID {device_id} not found"),
+            (
+                ~(
+                    bundle_quantities
+                    < device_max_watts_hours * settings.CAPACITY_MARGIN
+                ),
+                "bundle_quantity does not match criteria for less_than",
+            ),
+            (
+                bundle_quantities != id_range_ends - id_range_starts + 1,
+                "bundle_quantity does not match criteria for equal",
+            ),
+            (
+                id_range_starts != previous_max_certificate_ids + 1,
+                "certificate_bundle_id_range_start does not match criteria for equal",
+            ),
+        ]
+        first_failures = [
+            (int(np.argmax(failed)), check_idx)
+            for check_idx, (failed, _) in enumerate(failed_checks)
+            if failed.any()
+        ]
+        if first_failures:
+            bundle_idx, check_idx = min(first_failures)
+            raise ValueError(
+                failed_checks[check_idx][1].format(device_id=device_ids[bundle_idx])
+            )
+
+    if schema_error is not None:
+        raise schema_error
 
     # At this point if integrating wtih EAC registry or possibility of cross registry transfer
     # add integrations with external sources for further validation e.g. cancellation of underlying EACs
@@ -87,9 +181,30 @@ def validate_granular_certificate_bundle(
         # TODO: add additional storage validation
         pass
 
-    return GranularCertificateBundle.model_validate(
-        granular_certificate_bundle.model_dump()
-    )
+    return [
+        GranularCertificateBundle.model_validate(
+            granular_certificate_bundle.model_dump()
+        )
+        for granular_certificate_bundle in granular_certificate_bundles
+    ]
+
+
+def validate_granular_certificate_bundle(
+    db_session: Session,
+    raw_granular_certificate_bundle: dict[str, Any],
+    is_storage_device: bool,
+    max_certificate_id: int,
+    hours: float = settings.CERTIFICATE_GRANULARITY_HOURS,
+) -> GranularCertificateBundle:
+    """Validate a single GC Bundle, see validate_granular_certificate_bundles."""
+
+    return validate_granular_certificate_bundles(
+        db_session,
+        [raw_granular_certificate_bundle],
+        is_storage_device=is_storage_device,
+        max_certificate_id=max_certificate_id,
+        hours=hours,
+    )[0]
 
 
 def validate_user_access(
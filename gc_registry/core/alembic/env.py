@@ -1,3 +1,4 @@
+import re
 from logging.config import fileConfig
 
 from alembic import context
@@ -24,6 +25,32 @@ db_name_to_client = get_db_name_to_client()
 # target_metadata = mymodel.Base.metadata
 target_metadata = SQLModel.metadata
 
+# Partitions of the GC Bundle table are managed by
+# gc_registry.core.database.partitions rather than declared on the models
+PARTITION_NAME_PATTERN = re.compile(
+    r"^granularcertificatebundle_(y\d{4}m\d{2}|default)$"
+)
+
+# Denormalised tables maintained by the read projections, which only exist on the
+# read DB. Migrations check the target_db option before creating them
+READ_DB_TABLES = {"granularcertificatebundlereadmodel"}
+
+
+def include_name(name, type_, parent_names) -> bool:
+    if type_ == "table":
+        return PARTITION_NAME_PATTERN.match(name) is None
+    return True
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    # Tables of the models are compared whether or not they were reflected, so the
+    # read DB tables are left out of the comparison of other databases here
+    table_name = object.table.name if type_ == "index" else name
+    if type_ in ("table", "index") and table_name in READ_DB_TABLES:
+        return config.get_main_option("target_db") == "db_read"
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -43,6 +70,8 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -63,7 +92,12 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_name=include_name,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -72,6 +106,7 @@ def run_migrations_online() -> None:
 for host in ["db_read", "db_write"]:
     DB_URL = db_name_to_client[host].connection_str
     config.set_main_option("sqlalchemy.url", DB_URL)
+    config.set_main_option("target_db", host)
 
     if context.is_offline_mode():
         run_migrations_offline()
@@ -0,0 +1,52 @@
+"""gcbundle_query_indexes
+
+Revision ID: d5f3b8c1e2a7
+Revises: c4e8a6b2d9f1
+Create Date: 2024-12-16 10:12:48.530217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f3b8c1e2a7'
+down_revision: Union[str, None] = 'c4e8a6b2d9f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_gcbundle_account_status_interval', ['account_id', 'certificate_bundle_status', 'production_starting_interval'], 'is_deleted = false'),
+    ('ix_gcbundle_account_interval', ['account_id', 'production_starting_interval'], 'is_deleted = false'),
+    ('ix_gcbundle_device_id_range_end', ['device_id', 'certificate_bundle_id_range_end'], "certificate_bundle_status <> 'WITHDRAWN'"),
+    ('ix_gcbundle_device_production_end', ['device_id', 'production_ending_interval'], "certificate_bundle_status <> 'WITHDRAWN'"),
+]
+
+
+def upgrade() -> None:
+    # Build the indexes without locking the bundle table against writes, which
+    # cannot be done inside the migration transaction
+    with op.get_context().autocommit_block():
+        for index_name, columns, where in INDEXES:
+            op.create_index(
+                index_name,
+                'granularcertificatebundle',
+                columns,
+                unique=False,
+                postgresql_where=where,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index_name, _, _ in reversed(INDEXES):
+            op.drop_index(
+                index_name,
+                table_name='granularcertificatebundle',
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,122 @@
+"""partition_gcbundle
+
+Revision ID: e6a4c9d2f8b3
+Revises: d5f3b8c1e2a7
+Create Date: 2024-12-17 15:26:03.904127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a4c9d2f8b3'
+down_revision: Union[str, None] = 'd5f3b8c1e2a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLE = 'granularcertificatebundle'
+PREVIOUS_TABLE = 'granularcertificatebundle_previous'
+PARTITION_MONTHS_AHEAD = 3
+
+INDEXES = [
+    ('ix_gcbundle_account_status_interval', ['account_id', 'certificate_bundle_status', 'production_starting_interval'], 'is_deleted = false'),
+    ('ix_gcbundle_account_interval', ['account_id', 'production_starting_interval'], 'is_deleted = false'),
+    ('ix_gcbundle_device_id_range_end', ['device_id', 'certificate_bundle_id_range_end'], "certificate_bundle_status <> 'WITHDRAWN'"),
+    ('ix_gcbundle_device_production_end', ['device_id', 'production_ending_interval'], "certificate_bundle_status <> 'WITHDRAWN'"),
+]
+
+
+def _move_table_aside() -> list[tuple[str, str]]:
+    """Rename the bundle table out of the way, dropping its primary key and indexes
+    so that their names can be reused, and return its foreign keys."""
+
+    foreign_keys = op.get_bind().execute(
+        sa.text(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = CAST(:table AS regclass) AND contype = 'f'"
+        ),
+        {'table': TABLE},
+    ).all()
+
+    op.rename_table(TABLE, PREVIOUS_TABLE)
+    op.drop_constraint(f'{TABLE}_pkey', PREVIOUS_TABLE, type_='primary')
+    for index_name, _, _ in INDEXES:
+        op.drop_index(index_name, table_name=PREVIOUS_TABLE, if_exists=True)
+
+    return [tuple(foreign_key) for foreign_key in foreign_keys]
+
+
+def _finish_table(primary_key: list[str], foreign_keys: list[tuple[str, str]]) -> None:
+    op.execute(f'INSERT INTO {TABLE} SELECT * FROM {PREVIOUS_TABLE}')
+    op.create_primary_key(f'{TABLE}_pkey', TABLE, primary_key)
+    for constraint_name, definition in foreign_keys:
+        op.execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT {constraint_name} {definition}')
+    for index_name, columns, where in INDEXES:
+        op.create_index(index_name, TABLE, columns, unique=False, postgresql_where=where)
+
+    # The ID sequence is shared by both tables, so must be handed over before the
+    # previous table is dropped
+    op.execute(f'ALTER SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id')
+    op.drop_table(PREVIOUS_TABLE)
+
+
+def upgrade() -> None:
+    foreign_keys = _move_table_aside()
+
+    op.execute(
+        f"""
+        CREATE TABLE {TABLE} (
+            LIKE {PREVIOUS_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+        ) PARTITION BY RANGE (production_starting_interval)
+        """
+    )
+
+    # Monthly partitions from the earliest bundle up to a few months ahead, with a
+    # default partition for anything outside them
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            month timestamp;
+        BEGIN
+            FOR month IN
+                SELECT generate_series(
+                    date_trunc('month', LEAST(
+                        (SELECT min(production_starting_interval) FROM {PREVIOUS_TABLE}),
+                        now()::timestamp
+                    )),
+                    date_trunc('month', now()::timestamp) + interval '{PARTITION_MONTHS_AHEAD} months',
+                    interval '1 month'
+                )
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF {TABLE} FOR VALUES FROM (%L) TO (%L)',
+                    '{TABLE}_y' || to_char(month, 'YYYY"m"MM'),
+                    month,
+                    month + interval '1 month'
+                );
+            END LOOP;
+        END $$;
+        """
+    )
+    op.execute(f'CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT')
+
+    _finish_table(['id', 'production_starting_interval'], foreign_keys)
+
+
+def downgrade() -> None:
+    foreign_keys = _move_table_aside()
+
+    op.execute(
+        f"""
+        CREATE TABLE {TABLE} (
+            LIKE {PREVIOUS_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+        )
+        """
+    )
+
+    _finish_table(['id'], foreign_keys)
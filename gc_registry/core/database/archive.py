@@ -0,0 +1,127 @@
+import argparse
+import datetime
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session
+
+from gc_registry.certificate.models import (
+    GranularCertificateBundle,
+    GranularCertificateBundleArchive,
+    GranularCertificateBundleReadModel,
+)
+from gc_registry.core.database import db
+from gc_registry.logging_config import logger
+from gc_registry.settings import settings
+
+
+def archive_deleted_certificate_bundles(
+    session: Session,
+    retention_days: int = settings.BUNDLE_ARCHIVE_RETENTION_DAYS,
+    batch_size: int = settings.BUNDLE_ARCHIVE_BATCH_SIZE,
+    now: datetime.datetime | None = None,
+    is_read_db: bool = True,
+) -> int:
+    """Move the deleted GC Bundles created before the retention window out of the
+    bundle table and into the archive table, removing their read model rows on the
+    read DB.
+
+    Bundles are moved in batches, committing after each one so that locks on the
+    bundle table are held briefly. Archival does not change the state of a bundle,
+    so no events are written, and rebuilds of the read DB skip archived bundles
+    when replaying the bundle events.
+
+    Args:
+        session (Session): The database session, for either the write or read DB
+        retention_days (int): The number of days deleted bundles are kept in the
+            bundle table after their creation
+        batch_size (int): The maximum number of bundles moved in each transaction
+        now (datetime.datetime | None): The time from which the retention window is
+            measured, defaulting to the current time
+        is_read_db (bool): Whether the session is on the read DB, the only database
+            with the read model table
+
+    Returns:
+        int: The number of GC Bundles archived
+    """
+
+    # Bundle timestamps are stored as naive UTC datetimes
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    if now.tzinfo is not None:
+        now = now.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    cutoff = now - datetime.timedelta(days=retention_days)
+
+    bundle_table = GranularCertificateBundle.__table__  # type: ignore
+    archive_table = GranularCertificateBundleArchive.__table__  # type: ignore
+    read_model = GranularCertificateBundleReadModel
+    column_names = [column.name for column in archive_table.columns]
+
+    n_archived = 0
+    while True:
+        batch_ids = (
+            select(bundle_table.c.id)
+            .where(
+                bundle_table.c.is_deleted == True,  # noqa
+                bundle_table.c.created_at < cutoff,
+            )
+            .limit(batch_size)
+        )
+        archived = (
+            delete(bundle_table)
+            .where(bundle_table.c.id.in_(batch_ids))
+            .returning(*[bundle_table.c[name] for name in column_names])
+            .cte("archived")
+        )
+
+        # A bundle replayed into the bundle table after it was archived replaces its
+        # previous archived copy
+        stmt = insert(archive_table).from_select(column_names, select(archived))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[archive_table.c.id],
+            set_={name: stmt.excluded[name] for name in column_names if name != "id"},
+        )
+        archived_ids = (
+            session.execute(stmt.returning(archive_table.c.id)).scalars().all()
+        )
+        if is_read_db:
+            session.execute(
+                delete(read_model).where(read_model.id.in_(archived_ids))  # type: ignore
+            )
+        session.commit()
+
+        n_archived += len(archived_ids)
+        if len(archived_ids) < batch_size:
+            break
+
+    logger.info(f"Archived {n_archived} deleted GC Bundles created before {cutoff}")
+
+    return n_archived
+
+
+def archive_deleted_bundles():
+    parser = argparse.ArgumentParser(
+        description="Move deleted GC Bundles past the retention window to the archive."
+    )
+    parser.add_argument(
+        "--retention-days",
+        type=int,
+        default=settings.BUNDLE_ARCHIVE_RETENTION_DAYS,
+        help="Number of days after creation that deleted bundles are kept.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.BUNDLE_ARCHIVE_BATCH_SIZE,
+        help="Number of bundles moved in each transaction.",
+    )
+    args = parser.parse_args()
+
+    _ = db.get_db_name_to_client()
+    for target in ("db_write", "db_read"):
+        with db.session_scope(target) as session:
+            archive_deleted_certificate_bundles(
+                session,
+                retention_days=args.retention_days,
+                batch_size=args.batch_size,
+                is_read_db=target == "db_read",
+            )
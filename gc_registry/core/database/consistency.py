@@ -0,0 +1,93 @@
+import asyncio
+import time
+from typing import NamedTuple
+
+from fastapi import Depends, Header
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from gc_registry.core.database import cqrs, db
+from gc_registry.core.database.projector import READ_MODEL_PROJECTOR_NAME
+from gc_registry.core.models.projector import ProjectorCheckpoint
+from gc_registry.settings import settings
+
+# Writes return the ESDB commit position of their last event in this header, which
+# reads can send back to observe those writes
+CONSISTENCY_TOKEN_HEADER = "X-Consistency-Token"
+
+
+class ConsistentReadSession(NamedTuple):
+    """The session a read should use to observe the writes of a consistency token,
+    and whether it is on the write DB rather than the read DB."""
+
+    session: AsyncSession
+    is_write_session: bool
+
+
+async def get_read_model_commit_position(
+    read_session: AsyncSession,
+    projector_name: str = READ_MODEL_PROJECTOR_NAME,
+) -> int | None:
+    """Return the commit position of the last event projected to the read DB."""
+
+    return (
+        await read_session.exec(
+            select(ProjectorCheckpoint.commit_position).where(
+                ProjectorCheckpoint.projector_name == projector_name
+            )
+        )
+    ).first()
+
+
+async def wait_for_read_model(
+    read_session: AsyncSession,
+    consistency_token: int,
+    timeout_seconds: float = settings.READ_CONSISTENCY_WAIT_SECONDS,
+    poll_interval_seconds: float = settings.READ_CONSISTENCY_POLL_INTERVAL_SECONDS,
+) -> bool:
+    """Wait for the projector to apply the events up to the given commit position to
+    the read DB.
+
+    Args:
+        read_session (AsyncSession): The read DB session
+        consistency_token (int): The commit position returned by a write
+        timeout_seconds (float): The longest time to wait for the read DB
+        poll_interval_seconds (float): The time between checks of the projector
+            checkpoint
+
+    Returns:
+        bool: Whether the read DB reflects the events within the timeout
+    """
+
+    # Synchronous projection commits the read DB before the write returns
+    if cqrs.project_read_model_synchronously():
+        return True
+
+    deadline = time.monotonic() + timeout_seconds
+    while True:
+        commit_position = await get_read_model_commit_position(read_session)
+        if commit_position is not None and commit_position >= consistency_token:
+            return True
+        if time.monotonic() >= deadline:
+            return False
+
+        await asyncio.sleep(poll_interval_seconds)
+
+
+async def get_consistent_read_session(
+    consistency_token: int | None = Header(
+        default=None, alias=CONSISTENCY_TOKEN_HEADER
+    ),
+    write_session: AsyncSession = Depends(db.get_async_write_session),
+    read_session: AsyncSession = Depends(db.get_async_read_session),
+) -> ConsistentReadSession:
+    """Route a read to the read DB once it has caught up with the consistency token
+    sent with the request, falling back to the write DB if it does not catch up in
+    time. Reads without a token are always served from the read DB."""
+
+    if consistency_token is None or await wait_for_read_model(
+        read_session, consistency_token
+    ):
+        return ConsistentReadSession(session=read_session, is_write_session=False)
+
+    return ConsistentReadSession(session=write_session, is_write_session=True)
@@ -1,22 +1,155 @@
-from esdbclient import EventStoreDBClient
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncGenerator, Callable, Generator
+
+from esdbclient import NewEvent
 from pydantic import BaseModel
+from sqlalchemy import insert, select, update
+from sqlalchemy.util import greenlet_spawn
 from sqlmodel import Session, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from gc_registry.core.database.events import batch_create_events, create_event
+from gc_registry.core.database.event_store import EventStore
+from gc_registry.core.database.events import append_events, create_esdb_event
 from gc_registry.core.models.base import EventTypes
+from gc_registry.core.models.outbox import EventOutbox
 from gc_registry.logging_config import logger
+from gc_registry.settings import settings
+
+# Key under which an open unit of work keeps its pending events in the write session's info dict
+UNIT_OF_WORK_EVENTS_KEY = "unit_of_work_events"
+
+
+# Denormalised read tables, keyed by the name of the write entity they are built from
+ReadProjection = Callable[[list[SQLModel], Session], None]
+READ_MODEL_PROJECTIONS: dict[str, list[ReadProjection]] = {}
 
 
 def transform_write_entities_to_read(entities: list[SQLModel] | SQLModel):
-    # TODO add transformations here when read schemas are defined
+    # The read DB mirrors the normalised write rows, with denormalised read tables
+    # maintained alongside them by the projections registered below
     return entities
 
 
+def register_read_projection(
+    entity_name: str,
+) -> Callable[[ReadProjection], ReadProjection]:
+    """Register a function that updates a denormalised read table whenever entities
+    of the given type are written to the read DB.
+
+    The function receives the read DB versions of the written entities and the read
+    session, and should issue set-based statements rather than per-row merges.
+    """
+
+    def decorator(projection: ReadProjection) -> ReadProjection:
+        READ_MODEL_PROJECTIONS.setdefault(entity_name, []).append(projection)
+        return projection
+
+    return decorator
+
+
+def project_read_models(read_entities: list[SQLModel], read_session: Session) -> None:
+    """Apply the registered read projections to the given read entities."""
+
+    entities_by_name: dict[str, list[SQLModel]] = {}
+    for entity in read_entities:
+        entities_by_name.setdefault(entity.__class__.__name__, []).append(entity)
+
+    for entity_name, entities in entities_by_name.items():
+        for projection in READ_MODEL_PROJECTIONS.get(entity_name, []):
+            projection(entities, read_session)
+
+
+def project_read_model_synchronously() -> bool:
+    """Whether the CQRS helpers should write to the read DB themselves, rather than
+    leaving it to the projector consuming the events stream."""
+    return settings.READ_MODEL_MODE == "synchronous"
+
+
+def publish_events(
+    esdb_events: list[NewEvent],
+    write_session: Session,
+    esdb_client: EventStore,
+) -> None:
+    """Append the events to ESDB, or in outbox mode add them to the outbox table so
+    that they are committed in the same write DB transaction as the entity changes
+    and published to ESDB afterwards by the outbox relay."""
+
+    if settings.EVENT_PUBLISH_MODE == "outbox":
+        write_session.add_all(
+            [EventOutbox.from_esdb_event(esdb_event) for esdb_event in esdb_events]
+        )
+        return
+
+    append_events(esdb_events, esdb_client)
+
+
+def in_unit_of_work(write_session: Session) -> bool:
+    return UNIT_OF_WORK_EVENTS_KEY in write_session.info
+
+
+@contextmanager
+def unit_of_work(
+    write_session: Session,
+    read_session: Session,
+    esdb_client: EventStore,
+) -> Generator[None, None, None]:
+    """Group the CQRS writes made within the context into a single transaction.
+
+    Whilst the unit of work is open, the CQRS helpers only flush their changes and
+    queue their events. On exit the queued events are published in one call
+    and each database is committed once; if any write fails, both databases are
+    rolled back and no events are published. Nested units of work join the
+    outermost one.
+    """
+
+    if in_unit_of_work(write_session):
+        yield
+        return
+
+    write_session.info[UNIT_OF_WORK_EVENTS_KEY] = []
+    try:
+        yield
+
+        pending_events: list[NewEvent] = write_session.info[UNIT_OF_WORK_EVENTS_KEY]
+        publish_events(pending_events, write_session, esdb_client)
+
+        write_session.commit()
+        read_session.commit()
+
+    except Exception as e:
+        logger.error(f"Error during unit of work, rolling back: {str(e)}")
+        write_session.rollback()
+        read_session.rollback()
+        raise
+
+    finally:
+        write_session.info.pop(UNIT_OF_WORK_EVENTS_KEY, None)
+
+
+def _commit_or_defer(
+    esdb_events: list[NewEvent],
+    write_session: Session,
+    read_session: Session,
+    esdb_client: EventStore,
+) -> None:
+    """Publish the events and commit both databases, or queue the events on the
+    open unit of work so that they are published when it completes."""
+
+    if in_unit_of_work(write_session):
+        write_session.info[UNIT_OF_WORK_EVENTS_KEY].extend(esdb_events)
+        return
+
+    publish_events(esdb_events, write_session, esdb_client)
+
+    write_session.commit()
+    read_session.commit()
+
+
 def write_to_database(
     entities: list[SQLModel] | SQLModel,
     write_session: Session,
     read_session: Session,
-    esdb_client: EventStoreDBClient,
+    esdb_client: EventStore,
 ) -> list[SQLModel] | None:
     """Write the provided entities to the read and write databases, saving an
     Event entry for each entity."""
@@ -37,9 +170,28 @@ def write_to_database(
         logger.error(
             f"Error during commit to write DB during create: {str(e)}, session ID {id(write_session)}"
         )
+        if in_unit_of_work(write_session):
+            raise
         write_session.rollback()
         return None
 
+    # Events carry the full entity state so that the read model can be projected from them
+    esdb_events = [
+        create_esdb_event(
+            entity_id=entity.id,  # type: ignore
+            entity_name=entity.__class__.__name__,
+            event_type=EventTypes.CREATE,
+            attributes_after=entity.model_dump(mode="json"),
+        )
+        for entity in entities
+    ]
+
+    if not project_read_model_synchronously():
+        _commit_or_defer(esdb_events, write_session, read_session, esdb_client)
+        for entity in entities:
+            write_session.refresh(entity)
+        return entities
+
     try:
         # if needed, transform the entity into its equivalent read DB representation
         read_entities = transform_write_entities_to_read(entities)
@@ -49,21 +201,17 @@ def write_to_database(
         read_session.add_all(read_entities)
         read_session.flush()
 
+        project_read_models(read_entities, read_session)
+
     except Exception as e:
         logger.error(f"Error during commit to read DB during create: {str(e)}")
+        if in_unit_of_work(write_session):
+            raise
         write_session.rollback()
         read_session.rollback()
         return None
 
-    batch_create_events(
-        entity_ids=[entity.id for entity in entities],  # type: ignore
-        entity_names=[entity.__class__.__name__ for entity in entities],
-        event_type=EventTypes.CREATE,
-        esdb_client=esdb_client,
-    )
-
-    write_session.commit()
-    read_session.commit()
+    _commit_or_defer(esdb_events, write_session, read_session, esdb_client)
 
     for entity in read_entities:
         read_session.refresh(entity)
@@ -71,17 +219,116 @@ def write_to_database(
     return read_entities
 
 
+def bulk_write_to_database(
+    entities: list[SQLModel] | SQLModel,
+    write_session: Session,
+    read_session: Session,
+    esdb_client: EventStore,
+) -> list[SQLModel] | None:
+    """Write the provided entities to the read and write databases using a single
+    multi-row INSERT ... RETURNING per database, saving an Event entry for each entity.
+
+    Unlike write_to_database, the entities are not added to the sessions and
+    refreshed one at a time, which makes this the preferred path for large
+    homogeneous batches such as GC Bundle issuance. All entities must be
+    instances of the same table model.
+    """
+
+    if not isinstance(entities, list):
+        entities = [entities]
+
+    if not entities:
+        return []
+
+    entity_class = type(entities[0])
+    if any(type(entity) is not entity_class for entity in entities):
+        raise ValueError(
+            f"Bulk writes require entities of a single type, expected {entity_class.__name__}"
+        )
+
+    # Let the write DB assign primary keys where they have not been provided
+    rows = [
+        {
+            column: value
+            for column, value in entity.model_dump().items()
+            if not (column == "id" and value is None)
+        }
+        for entity in entities
+    ]
+
+    try:
+        written_entities = list(
+            write_session.scalars(
+                insert(entity_class).returning(
+                    entity_class, sort_by_parameter_order=True
+                ),
+                rows,
+            ).all()
+        )
+
+    except Exception as e:
+        logger.error(
+            f"Error during bulk commit to write DB during create: {str(e)}, session ID {id(write_session)}"
+        )
+        if in_unit_of_work(write_session):
+            raise
+        write_session.rollback()
+        return None
+
+    esdb_events = [
+        create_esdb_event(
+            entity_id=entity.id,  # type: ignore
+            entity_name=entity_class.__name__,
+            event_type=EventTypes.CREATE,
+            attributes_after=entity.model_dump(mode="json"),
+        )
+        for entity in written_entities
+    ]
+
+    if not project_read_model_synchronously():
+        _commit_or_defer(esdb_events, write_session, read_session, esdb_client)
+        return written_entities  # type: ignore
+
+    try:
+        read_rows = [
+            entity.model_dump()
+            for entity in transform_write_entities_to_read(written_entities)
+        ]
+        read_entities = list(
+            read_session.scalars(
+                insert(entity_class).returning(
+                    entity_class, sort_by_parameter_order=True
+                ),
+                read_rows,
+            ).all()
+        )
+
+        project_read_models(read_entities, read_session)
+
+    except Exception as e:
+        logger.error(f"Error during bulk commit to read DB during create: {str(e)}")
+        if in_unit_of_work(write_session):
+            raise
+        write_session.rollback()
+        read_session.rollback()
+        return None
+
+    _commit_or_defer(esdb_events, write_session, read_session, esdb_client)
+
+    return read_entities
+
+
 def update_database_entity(
     entity: SQLModel,
     update_entity: BaseModel,
     write_session: Session,
     read_session: Session,
-    esdb_client: EventStoreDBClient,
+    esdb_client: EventStore,
 ) -> SQLModel | None:
     """Update the entity with the provided Model Update instance."""
 
-    # TODO I can't think of a performant way to bulk update whilst also
-    # tracking before/after values, will look at in the future
+    # Applying the same update to many entities should use bulk_update_database_entities,
+    # which avoids a flush, commit and event append per entity
 
     before_data = {
         attr: entity.__getattribute__(attr)
@@ -99,9 +346,24 @@ def update_database_entity(
 
     except Exception as e:
         logger.error(f"Error during commit to write DB during update: {str(e)}")
+        if in_unit_of_work(write_session):
+            raise
         write_session.rollback()
         return None
 
+    esdb_event = create_esdb_event(
+        entity_id=entity.id,  # type: ignore
+        entity_name=entity.__class__.__name__,
+        event_type=EventTypes.UPDATE,
+        attributes_before=before_data,
+        attributes_after=update_data,
+    )
+
+    if not project_read_model_synchronously():
+        _commit_or_defer([esdb_event], write_session, read_session, esdb_client)
+        write_session.refresh(entity)
+        return entity
+
     try:
         read_entity = transform_write_entities_to_read(entity)
         read_entity = read_session.merge(read_entity)
@@ -109,34 +371,132 @@ def update_database_entity(
         read_session.add(read_entity)
         read_session.flush()
 
+        project_read_models([read_entity], read_session)
+
     except Exception as e:
         logger.error(f"Error during commit to read DB during update: {str(e)}")
+        if in_unit_of_work(write_session):
+            raise
         write_session.rollback()
         read_session.rollback()
         return None
 
-    create_event(
-        entity_id=entity.id,  # type: ignore
-        entity_name=entity.__class__.__name__,
-        event_type=EventTypes.UPDATE,
-        attributes_before=before_data,
-        attributes_after=update_data,
-        esdb_client=esdb_client,
-    )
-
-    write_session.commit()
-    read_session.commit()
+    _commit_or_defer([esdb_event], write_session, read_session, esdb_client)
 
     read_session.refresh(read_entity)
 
     return read_entity
 
 
+def bulk_update_database_entities(
+    entities: list[SQLModel],
+    update_entity: BaseModel,
+    write_session: Session,
+    read_session: Session,
+    esdb_client: EventStore,
+) -> list[SQLModel] | None:
+    """Apply the same Model Update instance to all of the provided entities.
+
+    The before-values of the updated attributes are captured with a single locking
+    SELECT on the write DB, after which one UPDATE ... WHERE id IN (...) RETURNING
+    is issued per database and all UPDATE events are appended in a single call.
+    All entities must be instances of the same table model.
+    """
+
+    if not entities:
+        return []
+
+    entity_class = type(entities[0])
+    if any(type(entity) is not entity_class for entity in entities):
+        raise ValueError(
+            f"Bulk updates require entities of a single type, expected {entity_class.__name__}"
+        )
+
+    update_data: dict = update_entity.model_dump(exclude_unset=True)
+    entity_ids = [entity.id for entity in entities]  # type: ignore
+    id_column = entity_class.id  # type: ignore
+
+    try:
+        # Lock the rows so the before-values cannot change underneath the update
+        before_rows = write_session.execute(
+            select(id_column, *[getattr(entity_class, attr) for attr in update_data])
+            .where(id_column.in_(entity_ids))
+            .with_for_update()
+        ).all()
+        before_data = {
+            row[0]: dict(zip(update_data.keys(), row[1:], strict=True))
+            for row in before_rows
+        }
+
+        # Every entity needs its before-values for the UPDATE event, so refuse to
+        # update any of them if a row is missing from the write DB
+        missing_ids = set(entity_ids) - before_data.keys()
+        if missing_ids:
+            raise ValueError(
+                f"Cannot update {entity_class.__name__} entities missing from the write DB: {sorted(missing_ids)}"
+            )
+
+        written_entities = list(
+            write_session.scalars(
+                update(entity_class)
+                .where(id_column.in_(entity_ids))
+                .values(**update_data)
+                .returning(entity_class)
+            ).all()
+        )
+
+    except Exception as e:
+        logger.error(f"Error during bulk commit to write DB during update: {str(e)}")
+        if in_unit_of_work(write_session):
+            raise
+        write_session.rollback()
+        return None
+
+    esdb_events = [
+        create_esdb_event(
+            entity_id=entity.id,  # type: ignore
+            entity_name=entity_class.__name__,
+            event_type=EventTypes.UPDATE,
+            attributes_before=before_data[entity.id],  # type: ignore
+            attributes_after=update_data,
+        )
+        for entity in written_entities
+    ]
+
+    if not project_read_model_synchronously():
+        _commit_or_defer(esdb_events, write_session, read_session, esdb_client)
+        return written_entities  # type: ignore
+
+    try:
+        read_entities = list(
+            read_session.scalars(
+                update(entity_class)
+                .where(id_column.in_(entity_ids))
+                .values(**update_data)
+                .returning(entity_class)
+            ).all()
+        )
+
+        project_read_models(read_entities, read_session)
+
+    except Exception as e:
+        logger.error(f"Error during bulk commit to read DB during update: {str(e)}")
+        if in_unit_of_work(write_session):
+            raise
+        write_session.rollback()
+        read_session.rollback()
+        return None
+
+    _commit_or_defer(esdb_events, write_session, read_session, esdb_client)
+
+    return read_entities
+
+
 def delete_database_entities(
     entities: list[SQLModel] | SQLModel,
     write_session: Session,
     read_session: Session,
-    esdb_client: EventStoreDBClient,
+    esdb_client: EventStore,
 ) -> list[SQLModel] | None:
     """Perform a soft delete on the provided entities."""
 
@@ -154,9 +514,27 @@ def delete_database_entities(
 
     except Exception as e:
         print(f"Error during commit to write DB during delete: {str(e)}")
+        if in_unit_of_work(write_session):
+            raise
         write_session.rollback()
         return None
 
+    esdb_events = [
+        create_esdb_event(
+            entity_id=entity.id,  # type: ignore
+            entity_name=entity.__class__.__name__,
+            event_type=EventTypes.DELETE,
+            attributes_after=entity.model_dump(mode="json"),
+        )
+        for entity in entities
+    ]
+
+    if not project_read_model_synchronously():
+        _commit_or_defer(esdb_events, write_session, read_session, esdb_client)
+        for entity in entities:
+            write_session.refresh(entity)
+        return entities
+
     try:
         read_entities = transform_write_entities_to_read(entities)
         read_entities = [read_session.merge(entity) for entity in read_entities]
@@ -165,23 +543,134 @@ def delete_database_entities(
         read_session.add_all(read_entities)
         read_session.flush()
 
+        project_read_models(read_entities, read_session)
+
     except Exception as e:
         print(f"Error during commit to read DB during delete: {str(e)}")
+        if in_unit_of_work(write_session):
+            raise
         write_session.rollback()
         read_session.rollback()
         return None
 
-    batch_create_events(
-        entity_ids=[entity.id for entity in entities],  # type: ignore
-        entity_names=[entity.__class__.__name__ for entity in entities],
-        event_type=EventTypes.DELETE,
-        esdb_client=esdb_client,
-    )
-
-    write_session.commit()
-    read_session.commit()
+    _commit_or_defer(esdb_events, write_session, read_session, esdb_client)
 
     for entity in read_entities:
         read_session.refresh(entity)
 
     return read_entities
+
+
+# The async helpers below run their sync counterparts on the sessions proxied by the
+# given async sessions, within a greenlet that suspends the calling coroutine at
+# each database round trip rather than blocking the event loop
+
+
+@asynccontextmanager
+async def unit_of_work_async(
+    write_session: AsyncSession,
+    read_session: AsyncSession,
+    esdb_client: EventStore,
+) -> AsyncGenerator[None, None]:
+    """Async version of unit_of_work."""
+
+    context = unit_of_work(
+        write_session.sync_session, read_session.sync_session, esdb_client
+    )
+    await greenlet_spawn(context.__enter__)
+    try:
+        yield
+    except BaseException as e:
+        if not await greenlet_spawn(context.__exit__, type(e), e, e.__traceback__):
+            raise
+    else:
+        await greenlet_spawn(context.__exit__, None, None, None)
+
+
+async def write_to_database_async(
+    entities: list[SQLModel] | SQLModel,
+    write_session: AsyncSession,
+    read_session: AsyncSession,
+    esdb_client: EventStore,
+) -> list[SQLModel] | None:
+    """Async version of write_to_database."""
+
+    return await greenlet_spawn(
+        write_to_database,
+        entities,
+        write_session.sync_session,
+        read_session.sync_session,
+        esdb_client,
+    )
+
+
+async def bulk_write_to_database_async(
+    entities: list[SQLModel] | SQLModel,
+    write_session: AsyncSession,
+    read_session: AsyncSession,
+    esdb_client: EventStore,
+) -> list[SQLModel] | None:
+    """Async version of bulk_write_to_database."""
+
+    return await greenlet_spawn(
+        bulk_write_to_database,
+        entities,
+        write_session.sync_session,
+        read_session.sync_session,
+        esdb_client,
+    )
+
+
+async def update_database_entity_async(
+    entity: SQLModel,
+    update_entity: BaseModel,
+    write_session: AsyncSession,
+    read_session: AsyncSession,
+    esdb_client: EventStore,
+) -> SQLModel | None:
+    """Async version of update_database_entity."""
+
+    return await greenlet_spawn(
+        update_database_entity,
+        entity,
+        update_entity,
+        write_session.sync_session,
+        read_session.sync_session,
+        esdb_client,
+    )
+
+
+async def bulk_update_database_entities_async(
+    entities: list[SQLModel],
+    update_entity: BaseModel,
+    write_session: AsyncSession,
+    read_session: AsyncSession,
+    esdb_client: EventStore,
+) -> list[SQLModel] | None:
+    """Async version of bulk_update_database_entities."""
+
+    return await greenlet_spawn(
+        bulk_update_database_entities,
+        entities,
+        update_entity,
+        write_session.sync_session,
+        read_session.sync_session,
+        esdb_client,
+    )
+
+
+async def delete_database_entities_async(
+    entities: list[SQLModel] | SQLModel,
+    write_session: AsyncSession,
+    read_session: AsyncSession,
+    esdb_client: EventStore,
+) -> list[SQLModel] | None:
+    """Async version of delete_database_entities."""
+
+    return await greenlet_spawn(
+        delete_database_entities,
+        entities,
+        write_session.sync_session,
+        read_session.sync_session,
+        esdb_client,
+    )
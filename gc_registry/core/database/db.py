@@ -1,11 +1,23 @@
+import datetime
 import importlib
-from typing import Any, Generator
+import threading
+import time
+from contextlib import AbstractContextManager, contextmanager
+from functools import cached_property
+from typing import Any, AsyncGenerator, Callable, Generator
 
+from sqlalchemy import event
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from gc_registry.account import models as account_models
 from gc_registry.authentication import models as authentication_models
 from gc_registry.certificate import models as certificate_models
+from gc_registry.core.models import outbox as outbox_models
+from gc_registry.core.models import projector as projector_models
 from gc_registry.device import models as device_models
 from gc_registry.measurement import models as measurement_models
 from gc_registry.settings import settings
@@ -25,10 +37,121 @@ __all__ = [
     "certificate_models",
     "storage_models",
     "measurement_models",
+    "projector_models",
+    "outbox_models",
 ]
 
 
 # Defining utility functions and classes
+_PG_TIMESTAMP_EPOCH = datetime.datetime(2000, 1, 1)
+_PG_TIMESTAMP_INFINITY = 2**63 - 1
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+
+def _encode_timestamp(value: datetime.datetime) -> tuple[int]:
+    # Timezone aware datetimes are stored as naive UTC, as with psycopg2
+    if value.tzinfo is not None:
+        value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+
+    return ((value - _PG_TIMESTAMP_EPOCH) // _MICROSECOND,)
+
+
+def _decode_timestamp(value: tuple[int]) -> datetime.datetime:
+    (microseconds,) = value
+    if microseconds == _PG_TIMESTAMP_INFINITY:
+        return datetime.datetime.max
+    if microseconds == -_PG_TIMESTAMP_INFINITY - 1:
+        return datetime.datetime.min
+
+    return _PG_TIMESTAMP_EPOCH + microseconds * _MICROSECOND
+
+
+def _register_asyncpg_codecs(dbapi_connection, connection_record) -> None:
+    """asyncpg rejects timezone aware datetimes for timestamp columns, which the
+    models default to, so convert them as the sync driver does."""
+
+    dbapi_connection.run_async(
+        lambda connection: connection.set_type_codec(
+            "timestamp",
+            schema="pg_catalog",
+            encoder=_encode_timestamp,
+            decoder=_decode_timestamp,
+            format="tuple",
+        )
+    )
+
+
+class PoolMetrics:
+    """Connection checkout statistics of a connection pool, accumulated since the
+    engine was created."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.checkout_wait_seconds_total = 0.0
+        self.checkout_wait_seconds_max = 0.0
+
+    def record_checkout(self, wait_seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.checkout_timeouts += 1
+            else:
+                self.checkouts += 1
+            self.checkout_wait_seconds_total += wait_seconds
+            self.checkout_wait_seconds_max = max(
+                self.checkout_wait_seconds_max, wait_seconds
+            )
+
+    def to_dict(self) -> dict[str, Any]:
+        with self._lock:
+            attempts = self.checkouts + self.checkout_timeouts
+            return {
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+                "checkout_wait_seconds_total": self.checkout_wait_seconds_total,
+                "checkout_wait_seconds_mean": (
+                    self.checkout_wait_seconds_total / attempts if attempts else 0.0
+                ),
+                "checkout_wait_seconds_max": self.checkout_wait_seconds_max,
+            }
+
+
+class _InstrumentedPoolMixin:
+    """Records how long each connection checkout waits on the pool, including the
+    time taken to open new connections."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()  # type: ignore
+        except sa_exc.TimeoutError:
+            self.metrics.record_checkout(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record_checkout(time.perf_counter() - start)
+
+        return connection
+
+    def recreate(self):
+        # The pool is recreated when its engine is disposed, keeping its metrics
+        pool = super().recreate()  # type: ignore
+        pool.metrics = self.metrics
+
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
 def schema_path_to_class(schema_path):
     *module_path, schema_class_name = schema_path.split(".")
     schema_class = getattr(
@@ -48,6 +171,10 @@ class DButils:
         db_name: str | None = None,
         db_test_fp: str = "gc_registry_test.db",
         test: bool = False,
+        pool_size: int = settings.DATABASE_POOL_SIZE,
+        max_overflow: int = settings.DATABASE_POOL_MAX_OVERFLOW,
+        pool_recycle: int = settings.DATABASE_POOL_RECYCLE_SECONDS,
+        pool_timeout: float = settings.DATABASE_POOL_TIMEOUT_SECONDS,
     ):
         self._db_username = db_username
         self._db_password = db_password
@@ -55,20 +182,45 @@ class DButils:
         self._db_port = db_port
         self._db_name = db_name
         self._db_test_fp = db_test_fp
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self._pool_kwargs = {
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_recycle": pool_recycle,
+            "pool_timeout": pool_timeout,
+            "pool_pre_ping": True,
+        }
 
         if test:
             self.connection_str = f"sqlite:///{self._db_test_fp}"
+            self.async_connection_str = f"sqlite+aiosqlite:///{self._db_test_fp}"
         else:
             self.connection_str = (
                 f"postgresql://{self._db_username}:{self._db_password}@{self._db_host}:"
                 f"{self._db_port}/{self._db_name}"
             )
+            self.async_connection_str = self.connection_str.replace(
+                "postgresql://", "postgresql+asyncpg://", 1
+            )
 
-        self.engine = create_engine(self.connection_str, pool_pre_ping=True)
+        self.engine = create_engine(
+            self.connection_str, poolclass=InstrumentedQueuePool, **self._pool_kwargs
+        )
 
-    def yield_session(self) -> Generator[Any, Any, Any]:
-        with Session(self.engine) as session, session.begin():
-            yield session
+    @cached_property
+    def async_engine(self) -> AsyncEngine:
+        """The engine used by async sessions, created on first use so that processes
+        that only use sync sessions do not open a second connection pool."""
+        async_engine = create_async_engine(
+            self.async_connection_str,
+            poolclass=InstrumentedAsyncAdaptedQueuePool,
+            **self._pool_kwargs,
+        )
+        if async_engine.dialect.driver == "asyncpg":
+            event.listen(async_engine.sync_engine, "connect", _register_asyncpg_codecs)
+
+        return async_engine
 
     def yield_twophase_session(self, write_object) -> Generator[Any, Any, Any]:
         with Session(self.engine, twophase=True) as session:
@@ -77,6 +229,35 @@ class DButils:
     def get_session(self) -> Session:
         return Session(self.engine)
 
+    async def yield_async_session(self) -> AsyncGenerator[AsyncSession, None]:
+        # Attributes are not expired on commit, as reloading them would need IO
+        # outside of an awaited call
+        async with AsyncSession(self.async_engine, expire_on_commit=False) as session:
+            yield session
+
+    def pool_metrics(self) -> dict[str, dict[str, Any]]:
+        """Utilisation and checkout wait statistics of the connection pools, with
+        utilisation as the fraction of the pool size and overflow checked out."""
+
+        engines = {"sync": self.engine}
+        # The async engine is only reported once it has been created
+        if "async_engine" in self.__dict__:
+            engines["async"] = self.async_engine.sync_engine
+
+        capacity = self.pool_size + max(self.max_overflow, 0)
+        pool_metrics = {}
+        for name, engine in engines.items():
+            checked_out = engine.pool.checkedout()  # type: ignore
+            pool_metrics[name] = {
+                "pool_size": self.pool_size,
+                "max_overflow": self.max_overflow,
+                "checked_out": checked_out,
+                "utilisation": checked_out / capacity if capacity else 0.0,
+                **engine.pool.metrics.to_dict(),  # type: ignore
+            }
+
+        return pool_metrics
+
 
 # Initialising the DButil clients
 db_name_to_client: dict[str, Any] = {}
@@ -106,17 +287,54 @@ def get_db_name_to_client():
     return db_name_to_client
 
 
-def get_session(target: str) -> Generator[Session, None, None]:
-    with next(db_name_to_client[target].yield_session()) as session:
-        try:
-            yield session
-        finally:
-            session.close()
+@contextmanager
+def session_scope(target: str) -> Generator[Session, None, None]:
+    """Provide a session on the target database that is closed when the scope exits,
+    rolling back any uncommitted changes and returning its connection to the pool.
+
+    Args:
+        target (str): The name of the database, either "db_write" or "db_read"
+    """
+
+    with db_name_to_client[target].get_session() as session:
+        yield session
+
+
+def get_session_scope() -> Callable[[str], AbstractContextManager[Session]]:
+    """Dependency for routes that stream their response, which is sent after the
+    sessions of the other dependencies are closed, so that the stream can open its
+    own session through session_scope."""
+
+    return session_scope
+
+
+def get_write_session() -> Generator[Session, None, None]:
+    with session_scope("db_write") as session:
+        yield session
+
+
+def get_read_session() -> Generator[Session, None, None]:
+    with session_scope("db_read") as session:
+        yield session
+
+
+def get_pool_metrics() -> dict[str, dict[str, dict[str, Any]]]:
+    return {
+        db_name: db_client.pool_metrics()
+        for db_name, db_client in db_name_to_client.items()
+    }
+
+
+async def get_async_session(target: str) -> AsyncGenerator[AsyncSession, None]:
+    async for session in db_name_to_client[target].yield_async_session():
+        yield session
 
 
-def get_write_session() -> Session:
-    return next(get_session("db_write"))
+async def get_async_write_session() -> AsyncGenerator[AsyncSession, None]:
+    async for session in get_async_session("db_write"):
+        yield session
 
 
-def get_read_session() -> Session:
-    return next(get_session("db_read"))
+async def get_async_read_session() -> AsyncGenerator[AsyncSession, None]:
+    async for session in get_async_session("db_read"):
+        yield session
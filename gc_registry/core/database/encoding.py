@@ -0,0 +1,158 @@
+import datetime
+import json
+import uuid
+from typing import Literal
+
+import msgpack
+from esdbclient import NewEvent
+from pydantic_core import to_jsonable_python
+
+from gc_registry.core.models.base import Event
+from gc_registry.settings import settings
+
+EventEncoding = Literal["json", "msgpack"]
+
+JSON_CONTENT_TYPE = "application/json"
+BINARY_CONTENT_TYPE = "application/octet-stream"
+
+# The compact encoding packs each event as a msgpack array, so the fields of each
+# schema version are registered here in array order. Add a new version rather
+# than changing an existing one, as events already written must still decode.
+EVENT_SCHEMA_VERSION = 1
+EVENT_SCHEMAS: dict[int, tuple[str, ...]] = {
+    1: (
+        "entity_id",
+        "entity_name",
+        "attributes_before",
+        "attributes_after",
+        "timestamp",
+    ),
+}
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def _timestamp_to_microseconds(timestamp: datetime.datetime) -> int:
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=datetime.timezone.utc)
+
+    return (timestamp - _EPOCH) // datetime.timedelta(microseconds=1)
+
+
+def _microseconds_to_timestamp(microseconds: int) -> datetime.datetime:
+    return _EPOCH + datetime.timedelta(microseconds=microseconds)
+
+
+def parse_event_metadata(metadata: bytes) -> dict:
+    """Parse the JSON metadata of an event, which is empty for JSON encoded events
+    written before the compact encoding was introduced."""
+
+    if not metadata:
+        return {}
+
+    try:
+        parsed_metadata = json.loads(metadata)
+    except ValueError:
+        return {}
+
+    return parsed_metadata if isinstance(parsed_metadata, dict) else {}
+
+
+def event_content_type(metadata: bytes) -> str:
+    """The ESDB content type of an event, given its metadata."""
+
+    if parse_event_metadata(metadata).get("encoding") == "msgpack":
+        return BINARY_CONTENT_TYPE
+
+    return JSON_CONTENT_TYPE
+
+
+def encode_event(
+    event: Event,
+    event_type: str,
+    encoding: EventEncoding | None = None,
+    metadata: dict | None = None,
+) -> NewEvent:
+    """Serialise a registry Event into an ESDB event, ready to be appended.
+
+    JSON encoded events carry the full Event document and no schema metadata. Compact
+    events are packed with msgpack as an array of the fields of the current schema
+    version, with timestamps as integer microseconds since the epoch, and record the
+    encoding, schema version and entity in the JSON metadata so that the entity
+    streams projection can still link them.
+
+    Args:
+        event (Event): The registry event to serialise
+        event_type (str): The ESDB event type, e.g. CREATE
+        encoding (EventEncoding | None): The encoding to use, defaulting to the
+            EVENT_ENCODING setting
+        metadata (dict | None): Additional metadata to record with the event
+
+    Returns:
+        NewEvent: The ESDB event
+    """
+
+    encoding = encoding or settings.EVENT_ENCODING
+    metadata = dict(metadata or {})
+
+    if encoding == "json":
+        return NewEvent(
+            id=uuid.uuid4(),
+            type=event_type,
+            data=event.model_dump_json().encode(),
+            metadata=json.dumps(metadata).encode() if metadata else b"",
+            content_type=JSON_CONTENT_TYPE,
+        )
+
+    entity_id = (
+        event.entity_id if isinstance(event.entity_id, int) else str(event.entity_id)
+    )
+    data = msgpack.packb(
+        [
+            entity_id,
+            event.entity_name,
+            to_jsonable_python(event.attributes_before),
+            to_jsonable_python(event.attributes_after),
+            _timestamp_to_microseconds(event.timestamp),
+        ],
+        use_bin_type=True,
+    )
+    metadata.update(
+        {
+            "encoding": "msgpack",
+            "schema_version": EVENT_SCHEMA_VERSION,
+            "entity_name": event.entity_name,
+            "entity_id": entity_id,
+        }
+    )
+
+    return NewEvent(
+        id=uuid.uuid4(),
+        type=event_type,
+        data=data,
+        metadata=json.dumps(metadata).encode(),
+        content_type=BINARY_CONTENT_TYPE,
+    )
+
+
+def decode_event(data: bytes, metadata: bytes) -> Event:
+    """Deserialise the data of an ESDB event into a registry Event, whichever
+    encoding it was written with.
+
+    Raises:
+        ValueError: If the event was written with an unregistered schema version
+    """
+
+    parsed_metadata = parse_event_metadata(metadata)
+    if parsed_metadata.get("encoding") != "msgpack":
+        return Event.model_validate_json(data)
+
+    schema_version = parsed_metadata.get("schema_version")
+    fields = EVENT_SCHEMAS.get(schema_version)  # type: ignore
+    if fields is None:
+        raise ValueError(f"Unknown event schema version: {schema_version}")
+
+    event_dict = dict(zip(fields, msgpack.unpackb(data, raw=False), strict=True))
+    event_dict["timestamp"] = _microseconds_to_timestamp(event_dict["timestamp"])
+
+    return Event.model_validate(event_dict)
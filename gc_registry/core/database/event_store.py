@@ -0,0 +1,391 @@
+import datetime
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Iterable, Iterator, Literal, Sequence
+
+from esdbclient import EventStoreDBClient, NewEvent, RecordedEvent, StreamState
+from esdbclient.exceptions import AlreadyExists, NotFound, WrongCurrentVersion
+
+# Returns the names of the streams that a projection links a recorded event into
+ProjectionLinker = Callable[[RecordedEvent], list[str]]
+
+
+class EventStore(ABC):
+    """The subset of the EventStoreDB client API used by the registry.
+
+    Events are appended to named streams and read back in stream order, with each
+    append returning the commit position of the last event written. Implementations
+    must honour the same expected version checks and raise the same esdbclient
+    exceptions as EventStoreDB, so that they can be swapped without changes to the
+    callers.
+    """
+
+    @abstractmethod
+    def append_to_stream(
+        self,
+        stream_name: str,
+        *,
+        current_version: int | StreamState,
+        events: NewEvent | Iterable[NewEvent],
+        **kwargs,
+    ) -> int:
+        pass
+
+    @abstractmethod
+    def append_event(
+        self,
+        stream_name: str,
+        *,
+        current_version: int | StreamState,
+        event: NewEvent,
+        **kwargs,
+    ) -> int:
+        pass
+
+    @abstractmethod
+    def read_stream(
+        self,
+        stream_name: str,
+        *,
+        stream_position: int | None = None,
+        backwards: bool = False,
+        resolve_links: bool = False,
+        **kwargs,
+    ) -> Iterable[RecordedEvent]:
+        pass
+
+    @abstractmethod
+    def get_stream(
+        self,
+        stream_name: str,
+        *,
+        stream_position: int | None = None,
+        backwards: bool = False,
+        resolve_links: bool = False,
+        **kwargs,
+    ) -> Sequence[RecordedEvent]:
+        pass
+
+    @abstractmethod
+    def subscribe_to_stream(
+        self,
+        stream_name: str,
+        *,
+        stream_position: int | None = None,
+        **kwargs,
+    ) -> Iterable[RecordedEvent]:
+        pass
+
+    @abstractmethod
+    def get_current_version(
+        self, stream_name: str, **kwargs
+    ) -> int | Literal[StreamState.NO_STREAM]:
+        pass
+
+    @abstractmethod
+    def delete_stream(
+        self, stream_name: str, *, current_version: int | StreamState, **kwargs
+    ) -> None:
+        pass
+
+    @abstractmethod
+    def create_projection(self, *, name: str, query: str, **kwargs) -> None:
+        pass
+
+    @abstractmethod
+    def update_projection(self, name: str, *, query: str, **kwargs) -> None:
+        pass
+
+    @abstractmethod
+    def reconnect(self, *args, **kwargs) -> None:
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
+
+
+class ESDBEventStore(EventStoreDBClient, EventStore):
+    """Event store backed by an EventStoreDB node, via the esdbclient gRPC client."""
+
+
+class InMemorySubscription:
+    """Catch-up subscription to a stream of an InMemoryEventStore, yielding the
+    events recorded after the given stream position and then blocking for new ones
+    until stopped."""
+
+    def __init__(
+        self,
+        event_store: "InMemoryEventStore",
+        stream_name: str,
+        stream_position: int | None,
+        resolve_links: bool,
+    ):
+        self.event_store = event_store
+        self.stream_name = stream_name
+        self.resolve_links = resolve_links
+        self._next_position = 0 if stream_position is None else stream_position + 1
+        self._stopped = False
+
+    def __iter__(self) -> Iterator[RecordedEvent]:
+        return self
+
+    def __next__(self) -> RecordedEvent:
+        with self.event_store._appended:
+            while True:
+                if self._stopped:
+                    raise StopIteration
+
+                stream = self.event_store._streams.get(self.stream_name, [])
+                if self._next_position < len(stream):
+                    recorded_event = stream[self._next_position]
+                    self._next_position += 1
+                    if self.resolve_links:
+                        return self.event_store._resolve_link(recorded_event)
+                    return recorded_event
+
+                self.event_store._appended.wait()
+
+    def stop(self) -> None:
+        with self.event_store._appended:
+            self._stopped = True
+            self.event_store._appended.notify_all()
+
+
+class InMemoryEventStore(EventStore):
+    """Event store held in the memory of the current process.
+
+    Intended for tests and benchmarks that should not depend on an EventStoreDB
+    node. Appends, reads and subscriptions follow EventStoreDB semantics, including
+    expected version checks, and projections are emulated by linkers that are run
+    synchronously as each event is appended. Nothing is persisted between processes.
+
+    Args:
+        projection_linkers (dict[str, ProjectionLinker] | None): Linkers keyed on the
+            name of the projection they emulate, enabled once that projection has
+            been created
+    """
+
+    def __init__(self, projection_linkers: dict[str, ProjectionLinker] | None = None):
+        self.projection_linkers = projection_linkers or {}
+
+        self._streams: dict[str, list[RecordedEvent]] = {}
+        self._events_by_id: dict = {}
+        self._projections: dict[str, str] = {}
+        self._commit_position = 0
+        self._appended = threading.Condition()
+
+    def _check_current_version(
+        self, stream_name: str, current_version: int | StreamState
+    ) -> None:
+        stream = self._streams.get(stream_name)
+        if current_version == StreamState.ANY:
+            return
+        if current_version == StreamState.NO_STREAM and stream is None:
+            return
+        if current_version == StreamState.EXISTS and stream is not None:
+            return
+        if (
+            isinstance(current_version, int)
+            and stream is not None
+            and current_version == len(stream) - 1
+        ):
+            return
+
+        raise WrongCurrentVersion(
+            f"Stream {stream_name} is not at version {current_version}"
+        )
+
+    def _record(self, stream_name: str, new_event: NewEvent) -> RecordedEvent:
+        stream = self._streams.setdefault(stream_name, [])
+        self._commit_position += 1
+        recorded_event = RecordedEvent(
+            type=new_event.type,
+            data=new_event.data,
+            metadata=new_event.metadata,
+            content_type=new_event.content_type,
+            id=new_event.id,
+            stream_name=stream_name,
+            stream_position=len(stream),
+            commit_position=self._commit_position,
+            prepare_position=self._commit_position,
+            recorded_at=datetime.datetime.now(tz=datetime.timezone.utc),
+        )
+        stream.append(recorded_event)
+        return recorded_event
+
+    def _resolve_link(self, recorded_event: RecordedEvent) -> RecordedEvent:
+        if not recorded_event.is_link_event:
+            return recorded_event
+
+        original_event = self._events_by_id[recorded_event.data.decode()]
+        return RecordedEvent(
+            type=original_event.type,
+            data=original_event.data,
+            metadata=original_event.metadata,
+            content_type=original_event.content_type,
+            id=original_event.id,
+            stream_name=original_event.stream_name,
+            stream_position=original_event.stream_position,
+            commit_position=original_event.commit_position,
+            prepare_position=original_event.prepare_position,
+            recorded_at=original_event.recorded_at,
+            link=recorded_event,
+        )
+
+    def _link(self, projection_name: str, recorded_event: RecordedEvent) -> None:
+        linker = self.projection_linkers.get(projection_name)
+        if linker is None:
+            return
+
+        for link_stream_name in linker(recorded_event):
+            self._record(
+                link_stream_name,
+                NewEvent(
+                    type="$>",
+                    data=str(recorded_event.id).encode(),
+                    id=recorded_event.id,
+                ),
+            )
+
+    def append_to_stream(
+        self,
+        stream_name: str,
+        *,
+        current_version: int | StreamState,
+        events: NewEvent | Iterable[NewEvent],
+        **kwargs,
+    ) -> int:
+        new_events = [events] if isinstance(events, NewEvent) else list(events)
+
+        with self._appended:
+            self._check_current_version(stream_name, current_version)
+            if stream_name in self._streams and not new_events:
+                return self._commit_position
+
+            self._streams.setdefault(stream_name, [])
+            commit_position = self._commit_position
+            for new_event in new_events:
+                recorded_event = self._record(stream_name, new_event)
+                self._events_by_id[str(recorded_event.id)] = recorded_event
+                # As with ESDB, the commit position is that of the last appended
+                # event rather than of the link events written by projections
+                commit_position = recorded_event.commit_position
+                for projection_name in self._projections:
+                    self._link(projection_name, recorded_event)
+
+            self._appended.notify_all()
+
+        return commit_position
+
+    def append_event(
+        self,
+        stream_name: str,
+        *,
+        current_version: int | StreamState,
+        event: NewEvent,
+        **kwargs,
+    ) -> int:
+        return self.append_to_stream(
+            stream_name, current_version=current_version, events=[event]
+        )
+
+    def get_stream(
+        self,
+        stream_name: str,
+        *,
+        stream_position: int | None = None,
+        backwards: bool = False,
+        resolve_links: bool = False,
+        limit: int | None = None,
+        **kwargs,
+    ) -> Sequence[RecordedEvent]:
+        with self._appended:
+            if stream_name not in self._streams:
+                raise NotFound(f"Stream {stream_name} not found")
+            stream = list(self._streams[stream_name])
+
+        if backwards:
+            stream.reverse()
+            if stream_position is not None:
+                stream = [e for e in stream if e.stream_position <= stream_position]
+        elif stream_position is not None:
+            stream = stream[stream_position:]
+
+        if limit is not None:
+            stream = stream[:limit]
+
+        if resolve_links:
+            stream = [self._resolve_link(recorded_event) for recorded_event in stream]
+
+        return tuple(stream)
+
+    def read_stream(
+        self,
+        stream_name: str,
+        *,
+        stream_position: int | None = None,
+        backwards: bool = False,
+        resolve_links: bool = False,
+        limit: int | None = None,
+        **kwargs,
+    ) -> Iterable[RecordedEvent]:
+        return iter(
+            self.get_stream(
+                stream_name,
+                stream_position=stream_position,
+                backwards=backwards,
+                resolve_links=resolve_links,
+                limit=limit,
+            )
+        )
+
+    def subscribe_to_stream(
+        self,
+        stream_name: str,
+        *,
+        stream_position: int | None = None,
+        resolve_links: bool = False,
+        **kwargs,
+    ) -> InMemorySubscription:
+        return InMemorySubscription(self, stream_name, stream_position, resolve_links)
+
+    def get_current_version(
+        self, stream_name: str, **kwargs
+    ) -> int | Literal[StreamState.NO_STREAM]:
+        with self._appended:
+            stream = self._streams.get(stream_name)
+            if not stream:
+                return StreamState.NO_STREAM
+            return len(stream) - 1
+
+    def delete_stream(
+        self, stream_name: str, *, current_version: int | StreamState, **kwargs
+    ) -> None:
+        with self._appended:
+            self._check_current_version(stream_name, current_version)
+            self._streams.pop(stream_name, None)
+
+    def create_projection(self, *, name: str, query: str, **kwargs) -> None:
+        with self._appended:
+            if name in self._projections:
+                raise AlreadyExists(f"Projection {name} already exists")
+            self._projections[name] = query
+
+            # As in EventStoreDB, a new projection starts from the beginning of the
+            # streams it reads, so link the events recorded before it was created
+            for recorded_event in list(self._events_by_id.values()):
+                self._link(name, recorded_event)
+            self._appended.notify_all()
+
+    def update_projection(self, name: str, *, query: str, **kwargs) -> None:
+        with self._appended:
+            if name not in self._projections:
+                raise NotFound(f"Projection {name} not found")
+            self._projections[name] = query
+
+    def reconnect(self, *args, **kwargs) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
@@ -1,36 +1,240 @@
+import asyncio
+import json
+import queue
+import threading
+import time
 import uuid
+from concurrent.futures import Future
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Generator
 
-from esdbclient import EventStoreDBClient, NewEvent, StreamState
+from esdbclient import NewEvent, RecordedEvent, StreamState
+from esdbclient.exceptions import AlreadyExists, NotFound
 from fastapi import Depends
+from sqlalchemy.util import await_only
+from sqlalchemy.util.concurrency import in_greenlet
 
-from gc_registry.core.models.base import Event, EventTypes
+from gc_registry.core.database.encoding import (
+    decode_event,
+    encode_event,
+    parse_event_metadata,
+)
+from gc_registry.core.database.event_store import (
+    ESDBEventStore,
+    EventStore,
+    InMemoryEventStore,
+)
+from gc_registry.core.models.base import Event, EventRead, EventTypes
+from gc_registry.logging_config import logger
 from gc_registry.settings import settings
 
+# One client, and so one gRPC channel, is shared by all requests in the process
+_esdb_client: EventStore | None = None
+_esdb_client_lock = threading.Lock()
 
-def yield_esdb_client() -> Generator[EventStoreDBClient, None, None]:
-    with EventStoreDBClient(
+# Commit positions of the appends made whilst handling the current request. The list
+# is shared by reference with the worker threads and greenlets that serve the request,
+# so that appends made from them are also recorded
+_appended_commit_positions: ContextVar[list[int] | None] = ContextVar(
+    "appended_commit_positions", default=None
+)
+
+
+def create_esdb_client() -> EventStore:
+    """Create a client for the event store backend selected in the settings."""
+
+    if settings.EVENT_STORE_BACKEND == "memory":
+        return InMemoryEventStore(
+            projection_linkers={ENTITY_STREAMS_PROJECTION_NAME: entity_link_streams}
+        )
+
+    return ESDBEventStore(
         uri=f"esdb://{settings.ESDB_CONNECTION_STRING}:2113?tls=false"
-    ) as esdb_client:
+    )
+
+
+def get_esdb_client() -> EventStore:
+    """Return the process-wide EventStoreDB client, connecting on first use.
+
+    The client reconnects automatically when a call fails because the node is
+    unavailable, so it is safe to hold for the lifetime of the process.
+    """
+    global _esdb_client
+
+    if _esdb_client is None:
+        with _esdb_client_lock:
+            if _esdb_client is None:
+                _esdb_client = create_esdb_client()
+
+    return _esdb_client
+
+
+def yield_esdb_client() -> Generator[EventStore, None, None]:
+    yield get_esdb_client()
+
+
+def close_esdb_client() -> None:
+    global _esdb_client
+
+    close_event_append_batchers()
+
+    with _esdb_client_lock:
+        if _esdb_client is not None:
+            _esdb_client.close()
+            _esdb_client = None
+
+
+def check_esdb_client_health(esdb_client: EventStore) -> bool:
+    """Check that the client can reach EventStoreDB, reconnecting if it cannot.
+
+    Args:
+        esdb_client (EventStore): The event store client to check
+
+    Returns:
+        bool: Whether the client is connected after the check
+    """
+
+    try:
+        esdb_client.get_current_version("events")
+        return True
+    except Exception as e:
+        logger.warning(f"EventStoreDB health check failed, reconnecting: {str(e)}")
+
+    try:
+        esdb_client.reconnect()
+        esdb_client.get_current_version("events")
+        return True
+    except Exception as e:
+        logger.error(f"Unable to reconnect to EventStoreDB: {str(e)}")
+        return False
+
+
+# Continuous ESDB projection linking each event in the events stream into a stream
+# per entity, "<entity_name>-<entity_id>", and a stream per entity type,
+# "category-<entity_name>", reading the entity from the JSON body of the event or,
+# for compact encoded events, from its metadata. Appends stay on the single events stream so that a
+# batch of events for many entities is still written atomically in one call.
+ENTITY_STREAMS_PROJECTION_NAME = "entity-streams"
+ENTITY_STREAMS_PROJECTION_QUERY = """
+fromStream("events")
+.when({
+    $any: function (state, event) {
+        var entity = event.body;
+        if (!(entity && entity.entity_name) && event.metadataRaw) {
+            entity = JSON.parse(event.metadataRaw);
+        }
+        if (entity && entity.entity_name) {
+            linkTo(entity.entity_name + "-" + entity.entity_id, event);
+            linkTo("category-" + entity.entity_name, event);
+        }
+    }
+});
+"""
+
+
+def entity_stream_name(entity_name: str, entity_id: int | uuid.UUID) -> str:
+    return f"{entity_name}-{entity_id}"
+
+
+def entity_category_stream_name(entity_name: str) -> str:
+    return f"category-{entity_name}"
+
+
+def entity_link_streams(recorded_event: RecordedEvent) -> list[str]:
+    """The streams the entity streams projection links an events stream event into,
+    for event stores that emulate the projection in process."""
+
+    if recorded_event.stream_name != "events":
+        return []
+
+    # Compact encoded events carry the entity in their metadata rather than a JSON body
+    body = parse_event_metadata(recorded_event.metadata)
+    if not body.get("entity_name"):
         try:
-            yield esdb_client
-        finally:
-            esdb_client.close()
+            body = json.loads(recorded_event.data)
+        except ValueError:
+            return []
 
+    if not isinstance(body, dict) or not body.get("entity_name"):
+        return []
 
-def get_esdb_client() -> EventStoreDBClient:
-    return next(yield_esdb_client())
+    return [
+        entity_stream_name(body["entity_name"], body["entity_id"]),
+        entity_category_stream_name(body["entity_name"]),
+    ]
 
 
-def create_event(
+def link_stream_position(recorded_event: RecordedEvent) -> int:
+    """The position of the event in the stream being read, which for a resolved
+    link is the position of the link rather than of the original event."""
+
+    if recorded_event.link is not None:
+        return recorded_event.link.stream_position
+
+    return recorded_event.stream_position
+
+
+def ensure_entity_streams_projection(esdb_client: EventStore) -> None:
+    """Create the per-entity streams projection, or update its query if it exists."""
+
+    try:
+        esdb_client.create_projection(
+            name=ENTITY_STREAMS_PROJECTION_NAME,
+            query=ENTITY_STREAMS_PROJECTION_QUERY,
+            emit_enabled=True,
+            track_emitted_streams=True,
+        )
+    except AlreadyExists:
+        esdb_client.update_projection(
+            ENTITY_STREAMS_PROJECTION_NAME,
+            query=ENTITY_STREAMS_PROJECTION_QUERY,
+            emit_enabled=True,
+        )
+
+
+def get_entity_event_history(
+    entity_name: str,
+    entity_id: int | uuid.UUID,
+    esdb_client: EventStore,
+) -> list[EventRead]:
+    """Return the events recorded against a single entity, oldest first, read from
+    its entity stream rather than by scanning the events stream.
+
+    Args:
+        entity_name (str): The class name of the entity, e.g. GranularCertificateBundle
+        entity_id (int | uuid.UUID): The ID of the entity
+        esdb_client (EventStore): The event store client
+
+    Returns:
+        list[EventRead]: The entity's events, or an empty list if it has none
+    """
+
+    try:
+        recorded_events = esdb_client.get_stream(
+            entity_stream_name(entity_name, entity_id), resolve_links=True
+        )
+    except NotFound:
+        return []
+
+    return [
+        EventRead(
+            **decode_event(recorded_event.data, recorded_event.metadata).model_dump(),
+            event_type=recorded_event.type,
+            stream_position=recorded_event.stream_position,
+        )
+        for recorded_event in recorded_events
+    ]
+
+
+def create_esdb_event(
     entity_id: int,
     entity_name: str,
     event_type: EventTypes,
     attributes_before: dict | None = None,
     attributes_after: dict | None = None,
-    esdb_client: EventStoreDBClient = Depends(get_esdb_client),
-):
-    """Create a single event and append it to the ESDB events stream."""
+) -> NewEvent:
+    """Serialise a single registry Event into an ESDB event, ready to be appended."""
 
     event = Event(
         entity_id=entity_id,
@@ -39,18 +243,206 @@ def create_event(
         attributes_after=attributes_after,
     )
 
-    esdb_event = NewEvent(
-        id=uuid.uuid4(),
-        type=event_type,
-        data=event.model_dump_json().encode(),
-    )
+    return encode_event(event, event_type)
+
+
+class EventAppendBatcher:
+    """Group commit for appends to the events stream.
 
-    esdb_client.append_to_stream(
+    Events submitted by concurrent requests within a short window are appended to
+    ESDB in a single call, with the events of each submission kept contiguous and in
+    order. Each submission returns a future that resolves to the commit position of
+    the combined append once ESDB has acknowledged it, or to the error it raised.
+    """
+
+    def __init__(
+        self,
+        esdb_client: EventStore,
+        window_ms: float = settings.ESDB_APPEND_BATCH_WINDOW_MS,
+        max_events: int = settings.ESDB_APPEND_BATCH_MAX_EVENTS,
+    ):
+        self.esdb_client = esdb_client
+        self.window_seconds = window_ms / 1000
+        self.max_events = max_events
+
+        self._submissions: queue.Queue[tuple[list[NewEvent], Future] | None] = (
+            queue.Queue()
+        )
+        self._worker = threading.Thread(
+            target=self._run, name="esdb-append-batcher", daemon=True
+        )
+        self._worker.start()
+
+    def submit(self, esdb_events: list[NewEvent]) -> Future:
+        future: Future = Future()
+        self._submissions.put((esdb_events, future))
+        return future
+
+    def close(self) -> None:
+        self._submissions.put(None)
+        self._worker.join()
+
+    def _next_batch(self) -> tuple[list[tuple[list[NewEvent], Future]], bool]:
+        submission = self._submissions.get()
+        if submission is None:
+            return [], True
+
+        batch = [submission]
+        n_events = len(submission[0])
+        deadline = time.monotonic() + self.window_seconds
+
+        while n_events < self.max_events:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                submission = self._submissions.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if submission is None:
+                return batch, True
+            batch.append(submission)
+            n_events += len(submission[0])
+
+        return batch, False
+
+    def _run(self) -> None:
+        closed = False
+        while not closed:
+            batch, closed = self._next_batch()
+            if not batch:
+                continue
+
+            try:
+                commit_position = self.esdb_client.append_to_stream(
+                    stream_name="events",
+                    current_version=StreamState.ANY,
+                    events=[
+                        esdb_event
+                        for esdb_events, _ in batch
+                        for esdb_event in esdb_events
+                    ],
+                )
+            except Exception as e:
+                logger.error(f"Error appending batch of events to ESDB: {str(e)}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for _, future in batch:
+                future.set_result(commit_position)
+
+
+_event_append_batchers: dict[int, EventAppendBatcher] = {}
+
+
+def get_event_append_batcher(esdb_client: EventStore) -> EventAppendBatcher:
+    """Return the append batcher for the given client, starting it on first use."""
+
+    with _esdb_client_lock:
+        batcher = _event_append_batchers.get(id(esdb_client))
+        if batcher is None or batcher.esdb_client is not esdb_client:
+            batcher = EventAppendBatcher(esdb_client)
+            _event_append_batchers[id(esdb_client)] = batcher
+
+    return batcher
+
+
+def close_event_append_batchers() -> None:
+    with _esdb_client_lock:
+        batchers = list(_event_append_batchers.values())
+        _event_append_batchers.clear()
+
+    for batcher in batchers:
+        batcher.close()
+
+
+@contextmanager
+def track_appended_commit_positions() -> Generator[list[int], None, None]:
+    """Collect the commit positions of the events appended within the context."""
+
+    commit_positions: list[int] = []
+    token = _appended_commit_positions.set(commit_positions)
+    try:
+        yield commit_positions
+    finally:
+        _appended_commit_positions.reset(token)
+
+
+def _record_appended_commit_position(commit_position: int | None) -> None:
+    commit_positions = _appended_commit_positions.get()
+    if commit_positions is not None and commit_position is not None:
+        commit_positions.append(commit_position)
+
+
+def append_events(
+    esdb_events: list[NewEvent],
+    esdb_client: EventStore,
+) -> int | None:
+    """Append the given ESDB events to the events stream in a single call.
+
+    When append batching is enabled, the events are instead handed to the process
+    append batcher and this call blocks until they have been durably appended.
+
+    Returns:
+        int | None: The commit position of the append, or None if there were no events
+    """
+
+    if not esdb_events:
+        return None
+
+    # Called by an async CQRS helper, so append from a worker thread rather than
+    # blocking the event loop on the gRPC call
+    if in_greenlet():
+        commit_position = await_only(
+            asyncio.to_thread(_append_events_blocking, esdb_events, esdb_client)
+        )
+    else:
+        commit_position = _append_events_blocking(esdb_events, esdb_client)
+
+    _record_appended_commit_position(commit_position)
+
+    return commit_position
+
+
+def _append_events_blocking(
+    esdb_events: list[NewEvent],
+    esdb_client: EventStore,
+) -> int:
+    if settings.ESDB_APPEND_BATCHING:
+        return (
+            get_event_append_batcher(esdb_client)
+            .submit(esdb_events)
+            .result(timeout=settings.ESDB_APPEND_TIMEOUT_SECONDS)
+        )
+
+    return esdb_client.append_to_stream(
         stream_name="events",
         current_version=StreamState.ANY,
-        events=[esdb_event],
+        events=esdb_events,
+    )
+
+
+def create_event(
+    entity_id: int,
+    entity_name: str,
+    event_type: EventTypes,
+    attributes_before: dict | None = None,
+    attributes_after: dict | None = None,
+    esdb_client: EventStore = Depends(get_esdb_client),
+):
+    """Create a single event and append it to the ESDB events stream."""
+
+    esdb_event = create_esdb_event(
+        entity_id=entity_id,
+        entity_name=entity_name,
+        event_type=event_type,
+        attributes_before=attributes_before,
+        attributes_after=attributes_after,
     )
 
+    append_events([esdb_event], esdb_client)
+
 
 def batch_create_events(
     entity_ids: list[int],
@@ -58,7 +450,7 @@ def batch_create_events(
     event_type: EventTypes,
     attributes_before: list[dict | None] | None = None,
     attributes_after: list[dict | None] | None = None,
-    esdb_client: EventStoreDBClient = Depends(get_esdb_client),
+    esdb_client: EventStore = Depends(get_esdb_client),
 ):
     """Create a batch of events and append them to the ESDB events stream.
 
@@ -70,10 +462,11 @@ def batch_create_events(
     attributes_before = attributes_before or [None] * len(entity_ids)
     attributes_after = attributes_after or [None] * len(entity_ids)
 
-    events = [
-        Event(
+    esdb_events = [
+        create_esdb_event(
             entity_id=entity_id,
             entity_name=entity_name,
+            event_type=event_type,
             attributes_before=attributes_before,
             attributes_after=attributes_after,
         )
@@ -82,17 +475,4 @@ def batch_create_events(
         )
     ]
 
-    esdb_events = [
-        NewEvent(
-            id=uuid.uuid4(),
-            type=event_type,
-            data=event.model_dump_json().encode(),
-        )
-        for event in events
-    ]
-
-    esdb_client.append_to_stream(
-        stream_name="events",
-        current_version=StreamState.ANY,
-        events=esdb_events,
-    )
+    append_events(esdb_events, esdb_client)
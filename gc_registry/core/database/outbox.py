@@ -0,0 +1,82 @@
+import time
+
+from sqlmodel import Session, delete, select
+
+from gc_registry.core.database import db, events
+from gc_registry.core.database.event_store import EventStore
+from gc_registry.core.models.outbox import EventOutbox
+from gc_registry.logging_config import logger
+from gc_registry.settings import settings
+
+
+def relay_outbox_batch(
+    write_session: Session,
+    esdb_client: EventStore,
+    batch_size: int = settings.OUTBOX_RELAY_BATCH_SIZE,
+) -> int:
+    """Publish the oldest events in the outbox to ESDB in a single append and remove
+    them from the outbox.
+
+    The outbox rows are locked with SKIP LOCKED, so several relays can run without
+    publishing the same event twice; a single relay publishes events in outbox ID
+    order. IDs are taken from a sequence when the rows are inserted rather than when
+    their transaction commits, so the events of transactions committed between two
+    passes need not be published in commit order, and concurrent relays give no
+    ordering across their batches. Only the events of a single transaction are
+    guaranteed to keep their order when published by a single relay.
+    If the append succeeds but the delete does not, the events are appended again on
+    the next pass with their original IDs, which ESDB treats as a repeated write.
+
+    Args:
+        write_session (Session): The database write session
+        esdb_client (EventStore): The event store client
+        batch_size (int): The maximum number of events to publish
+
+    Returns:
+        int: The number of events published
+    """
+
+    outbox_events = write_session.exec(
+        select(EventOutbox)
+        .order_by(EventOutbox.id)  # type: ignore
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+
+    if not outbox_events:
+        write_session.rollback()
+        return 0
+
+    try:
+        events.append_events(
+            [outbox_event.to_esdb_event() for outbox_event in outbox_events],
+            esdb_client,
+        )
+
+        write_session.exec(
+            delete(EventOutbox).where(
+                EventOutbox.id.in_([outbox_event.id for outbox_event in outbox_events])  # type: ignore
+            )
+        )
+        write_session.commit()
+
+    except Exception as e:
+        logger.error(f"Error relaying outbox events to ESDB: {str(e)}")
+        write_session.rollback()
+        raise
+
+    return len(outbox_events)
+
+
+def run_outbox_relay():
+    _ = db.get_db_name_to_client()
+    esdb_client = events.get_esdb_client()
+
+    logger.info("Starting outbox relay")
+    with db.session_scope("db_write") as write_session:
+        while True:
+            n_published = relay_outbox_batch(write_session, esdb_client)
+            if n_published:
+                logger.info(f"Published {n_published} events from the outbox")
+            else:
+                time.sleep(settings.OUTBOX_RELAY_POLL_INTERVAL_SECONDS)
@@ -0,0 +1,254 @@
+import argparse
+import datetime
+import re
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+from gc_registry.certificate.models import GranularCertificateBundle
+from gc_registry.core.database import db
+from gc_registry.logging_config import logger
+from gc_registry.settings import settings
+
+BUNDLE_TABLE_NAME = GranularCertificateBundle.__tablename__
+BUNDLE_PARTITION_KEY = "production_starting_interval"
+
+_PARTITION_NAME_PATTERN = re.compile(r"_y(\d{4})m(\d{2})$")
+
+
+def month_start(timestamp: datetime.datetime) -> datetime.datetime:
+    """The start of the month containing the timestamp, as a naive UTC datetime."""
+
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+
+    return datetime.datetime(timestamp.year, timestamp.month, 1)
+
+
+def add_months(month: datetime.datetime, n_months: int) -> datetime.datetime:
+    year, month_index = divmod(month.year * 12 + month.month - 1 + n_months, 12)
+    return datetime.datetime(year, month_index + 1, 1)
+
+
+def partition_name(table_name: str, month: datetime.datetime) -> str:
+    return f"{table_name}_y{month.year:04d}m{month.month:02d}"
+
+
+def default_partition_name(table_name: str) -> str:
+    return f"{table_name}_default"
+
+
+def table_exists(session: Session, table_name: str) -> bool:
+    return session.execute(
+        text("SELECT to_regclass(:table_name) IS NOT NULL"),
+        {"table_name": table_name},
+    ).scalar_one()
+
+
+def get_monthly_partitions(
+    session: Session, table_name: str
+) -> dict[datetime.datetime, str]:
+    """Return the names of the monthly partitions attached to the table, keyed on
+    the month they hold."""
+
+    partition_names = session.execute(
+        text(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = CAST(:table_name AS regclass)
+            """
+        ),
+        {"table_name": table_name},
+    ).scalars()
+
+    partitions = {}
+    for name in partition_names:
+        match = _PARTITION_NAME_PATTERN.search(name)
+        if match:
+            partitions[datetime.datetime(int(match[1]), int(match[2]), 1)] = name
+
+    return partitions
+
+
+def create_monthly_partition(
+    session: Session,
+    table_name: str,
+    month: datetime.datetime,
+    partition_key: str = BUNDLE_PARTITION_KEY,
+) -> str | None:
+    """Create the partition holding the given month of the table, moving any rows
+    for that month out of the default partition into it.
+
+    The default partition cannot be attached while it holds rows belonging to a new
+    partition, so it is detached for the duration of the move. The caller is
+    responsible for committing the session.
+
+    Returns:
+        str | None: The name of the partition, or None if it already existed
+    """
+
+    month = month_start(month)
+    name = partition_name(table_name, month)
+    default_name = default_partition_name(table_name)
+
+    # Serialise partition maintenance on the table across processes
+    session.execute(
+        text("SELECT pg_advisory_xact_lock(hashtext(:table_name))"),
+        {"table_name": table_name},
+    )
+    if month in get_monthly_partitions(session, table_name):
+        return None
+
+    bounds = {"month_start": month, "month_end": add_months(month, 1)}
+    has_default = table_exists(session, default_name)
+    if has_default:
+        session.execute(
+            text(f'ALTER TABLE "{table_name}" DETACH PARTITION "{default_name}"')
+        )
+
+    session.execute(
+        text(
+            f'CREATE TABLE "{name}" PARTITION OF "{table_name}" '
+            f"FOR VALUES FROM ('{month.isoformat()}') "
+            f"TO ('{bounds['month_end'].isoformat()}')"
+        )
+    )
+
+    if has_default:
+        n_moved = session.execute(
+            text(
+                f"""
+                WITH moved AS (
+                    DELETE FROM "{default_name}"
+                    WHERE {partition_key} >= :month_start
+                    AND {partition_key} < :month_end
+                    RETURNING *
+                )
+                INSERT INTO "{table_name}" SELECT * FROM moved
+                """
+            ),
+            bounds,
+        ).rowcount
+        session.execute(
+            text(
+                f'ALTER TABLE "{table_name}" ATTACH PARTITION "{default_name}" DEFAULT'
+            )
+        )
+        if n_moved:
+            logger.info(f"Moved {n_moved} rows from {default_name} into {name}")
+
+    logger.info(f"Created partition {name}")
+    return name
+
+
+def ensure_monthly_partitions(
+    session: Session,
+    table_name: str = BUNDLE_TABLE_NAME,
+    months_ahead: int = settings.BUNDLE_PARTITION_MONTHS_AHEAD,
+    partition_key: str = BUNDLE_PARTITION_KEY,
+    now: datetime.datetime | None = None,
+) -> list[str]:
+    """Create the monthly partitions of the table from the earliest month held in
+    its default partition, or the current month, up to the given number of months
+    ahead, so that new rows are routed to their own month rather than the default.
+
+    Returns:
+        list[str]: The names of the partitions created
+    """
+
+    current_month = month_start(now or datetime.datetime.now(datetime.timezone.utc))
+
+    month = current_month
+    default_name = default_partition_name(table_name)
+    if table_exists(session, default_name):
+        earliest_default = session.execute(
+            text(f'SELECT min({partition_key}) FROM "{default_name}"')
+        ).scalar_one()
+        if earliest_default is not None:
+            month = min(month, month_start(earliest_default))
+
+    created = []
+    while month <= add_months(current_month, months_ahead):
+        name = create_monthly_partition(session, table_name, month, partition_key)
+        if name is not None:
+            created.append(name)
+        month = add_months(month, 1)
+
+    return created
+
+
+def detach_monthly_partitions(
+    session: Session,
+    before: datetime.datetime,
+    table_name: str = BUNDLE_TABLE_NAME,
+) -> list[str]:
+    """Detach the monthly partitions of the table holding months entirely before
+    the given date.
+
+    Detached partitions remain as standalone tables, no longer scanned by queries on
+    the parent table, ready to be archived and dropped. Partitions still holding
+    rows that are not deleted are left attached, so that live GC Bundles do not
+    disappear from queries. The caller is responsible for committing the session.
+
+    Returns:
+        list[str]: The names of the partitions detached
+    """
+
+    before = month_start(before)
+
+    detached = []
+    for month, name in sorted(get_monthly_partitions(session, table_name).items()):
+        if add_months(month, 1) > before:
+            continue
+
+        has_live_rows = session.execute(
+            text(f'SELECT EXISTS (SELECT 1 FROM "{name}" WHERE is_deleted = false)')
+        ).scalar_one()
+        if has_live_rows:
+            logger.warning(f"Not detaching partition {name}, which has live rows")
+            continue
+
+        session.execute(text(f'ALTER TABLE "{table_name}" DETACH PARTITION "{name}"'))
+        logger.info(f"Detached partition {name}")
+        detached.append(name)
+
+    return detached
+
+
+def manage_bundle_partitions():
+    parser = argparse.ArgumentParser(
+        description="Create or detach the monthly partitions of the GC Bundle table."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    create_parser = subparsers.add_parser(
+        "create", help="Create partitions up to a number of months ahead."
+    )
+    create_parser.add_argument(
+        "--months-ahead",
+        type=int,
+        default=settings.BUNDLE_PARTITION_MONTHS_AHEAD,
+        help="Number of months after the current month to create partitions for.",
+    )
+
+    detach_parser = subparsers.add_parser(
+        "detach", help="Detach partitions for archival."
+    )
+    detach_parser.add_argument(
+        "--before",
+        type=datetime.datetime.fromisoformat,
+        required=True,
+        help="Detach the partitions of months ending on or before this date that only hold deleted rows.",
+    )
+    args = parser.parse_args()
+
+    _ = db.get_db_name_to_client()
+    for target in ("db_write", "db_read"):
+        with db.session_scope(target) as session:
+            if args.command == "create":
+                ensure_monthly_partitions(session, months_ahead=args.months_ahead)
+            else:
+                detach_monthly_partitions(session, before=args.before)
+            session.commit()
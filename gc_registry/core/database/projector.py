@@ -0,0 +1,264 @@
+import queue
+import threading
+import time
+from typing import Any
+
+from esdbclient import RecordedEvent, StreamState
+from sqlmodel import Session, SQLModel, select
+
+from gc_registry.core.database import cqrs, db, events
+from gc_registry.core.database.encoding import decode_event
+from gc_registry.core.database.event_store import EventStore
+from gc_registry.core.models.base import Event, EventTypes
+from gc_registry.core.models.projector import ProjectorCheckpoint
+from gc_registry.logging_config import logger
+from gc_registry.settings import settings
+
+READ_MODEL_PROJECTOR_NAME = "read_model"
+
+
+def get_entity_class(entity_name: str) -> type[SQLModel]:
+    """Return the table model registered under the given class name."""
+
+    for mapper in SQLModel._sa_registry.mappers:  # type: ignore
+        if mapper.class_.__name__ == entity_name:
+            return mapper.class_
+
+    raise ValueError(f"No table model found for entity: {entity_name}")
+
+
+def get_checkpoint(
+    read_session: Session, projector_name: str = READ_MODEL_PROJECTOR_NAME
+) -> int | None:
+    checkpoint = read_session.get(ProjectorCheckpoint, projector_name)
+    if checkpoint is None:
+        return None
+
+    return checkpoint.stream_position
+
+
+def get_projector_lag(
+    read_session: Session,
+    esdb_client: EventStore,
+    projector_name: str = READ_MODEL_PROJECTOR_NAME,
+) -> int:
+    """Return the number of events in the events stream not yet applied to the read DB."""
+
+    current_version = esdb_client.get_current_version("events")
+    if current_version == StreamState.NO_STREAM:
+        return 0
+
+    checkpoint = get_checkpoint(read_session, projector_name)
+    applied = -1 if checkpoint is None else checkpoint
+
+    return int(current_version) - applied  # type: ignore
+
+
+def apply_events_to_read_model(
+    recorded_events: list[RecordedEvent],
+    read_session: Session,
+    projector_name: str = READ_MODEL_PROJECTOR_NAME,
+) -> int | None:
+    """Apply a batch of CREATE, UPDATE and DELETE events to the read DB and advance
+    the projector checkpoint, committing both in a single transaction.
+
+    Applying an event overwrites the read row with the state carried by the event,
+    so replaying a batch that has already been applied has no further effect.
+
+    Returns:
+        int | None: The stream position of the last event in the batch
+    """
+
+    if not recorded_events:
+        return get_checkpoint(read_session, projector_name)
+
+    registry_events: list[tuple[str, Event, type[SQLModel]]] = []
+    for recorded_event in recorded_events:
+        if recorded_event.type not in EventTypes.__members__:
+            continue
+        event = decode_event(recorded_event.data, recorded_event.metadata)
+
+        # Entity types may no longer have a table model, for example once renamed
+        try:
+            entity_class = get_entity_class(event.entity_name)
+        except ValueError:
+            logger.warning(
+                f"Skipping {recorded_event.type} event for unknown entity type {event.entity_name} {event.entity_id}"
+            )
+            continue
+        registry_events.append((recorded_event.type, event, entity_class))
+
+    # Load the existing read rows for the batch with one query per entity type
+    entity_ids_by_class: dict[type[SQLModel], set[Any]] = {}
+    for _, event, entity_class in registry_events:
+        entity_ids_by_class.setdefault(entity_class, set()).add(event.entity_id)
+
+    for entity_class, entity_ids in entity_ids_by_class.items():
+        read_session.exec(
+            select(entity_class).where(entity_class.id.in_(entity_ids))  # type: ignore
+        ).all()
+
+    read_entities: list[SQLModel] = []
+    for event_type, event, entity_class in registry_events:
+        read_entity = read_session.get(entity_class, event.entity_id)
+
+        if read_entity is None and event_type != EventTypes.CREATE:
+            logger.warning(
+                f"Skipping {event_type} event for missing {event.entity_name} {event.entity_id}"
+            )
+            continue
+
+        if event.attributes_after is None:
+            logger.warning(
+                f"Skipping {event_type} event without entity state for {event.entity_name} {event.entity_id}"
+            )
+            continue
+
+        entity_state = {} if read_entity is None else read_entity.model_dump()
+        entity_state.update(event.attributes_after)
+
+        read_entities.append(
+            read_session.merge(entity_class.model_validate(entity_state))
+        )
+
+    read_session.flush()
+    cqrs.project_read_models(read_entities, read_session)
+
+    last_stream_position = recorded_events[-1].stream_position
+    read_session.merge(
+        ProjectorCheckpoint(
+            projector_name=projector_name,
+            stream_position=last_stream_position,
+            commit_position=recorded_events[-1].commit_position,
+        )
+    )
+    read_session.commit()
+
+    return last_stream_position
+
+
+class ReadModelProjector:
+    """Keeps the read DB up to date from a catch-up subscription to the events stream.
+
+    Events received from the subscription are buffered until either the batch size is
+    reached or the batch timeout elapses, and each batch is then applied to the read
+    DB in a single transaction alongside the projector checkpoint.
+
+    If the subscription fails, for example when the connection to the event store is
+    lost, it is reopened after a backoff from the last event received.
+    """
+
+    def __init__(
+        self,
+        read_session: Session,
+        esdb_client: EventStore,
+        projector_name: str = READ_MODEL_PROJECTOR_NAME,
+        batch_size: int = settings.PROJECTOR_BATCH_SIZE,
+        batch_timeout_seconds: float = settings.PROJECTOR_BATCH_TIMEOUT_SECONDS,
+        resubscribe_backoff_seconds: float = settings.PROJECTOR_RESUBSCRIBE_BACKOFF_SECONDS,
+        resubscribe_max_backoff_seconds: float = settings.PROJECTOR_RESUBSCRIBE_MAX_BACKOFF_SECONDS,
+    ):
+        self.read_session = read_session
+        self.esdb_client = esdb_client
+        self.projector_name = projector_name
+        self.batch_size = batch_size
+        self.batch_timeout_seconds = batch_timeout_seconds
+        self.resubscribe_backoff_seconds = resubscribe_backoff_seconds
+        self.resubscribe_max_backoff_seconds = resubscribe_max_backoff_seconds
+
+        self._events: queue.Queue[RecordedEvent] = queue.Queue(maxsize=batch_size * 4)
+        self._stopped = threading.Event()
+
+    def _subscribe(self, checkpoint: int | None) -> None:
+        backoff_seconds = self.resubscribe_backoff_seconds
+        while not self._stopped.is_set():
+            try:
+                subscription = self.esdb_client.subscribe_to_stream(
+                    "events", stream_position=checkpoint
+                )
+                for recorded_event in subscription:
+                    if self._stopped.is_set():
+                        subscription.stop()
+                        return
+                    if (
+                        checkpoint is not None
+                        and recorded_event.stream_position <= checkpoint
+                    ):
+                        continue
+                    self._events.put(recorded_event)
+                    checkpoint = recorded_event.stream_position
+                    backoff_seconds = self.resubscribe_backoff_seconds
+            except Exception as e:
+                logger.error(
+                    f"Projector {self.projector_name} subscription failed, resubscribing from stream position {checkpoint} in {backoff_seconds}s: {str(e)}"
+                )
+                self._stopped.wait(backoff_seconds)
+                backoff_seconds = min(
+                    backoff_seconds * 2, self.resubscribe_max_backoff_seconds
+                )
+
+    def _next_batch(self) -> list[RecordedEvent]:
+        try:
+            batch = [self._events.get(timeout=self.batch_timeout_seconds)]
+        except queue.Empty:
+            return []
+
+        deadline = time.monotonic() + self.batch_timeout_seconds
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._events.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def run(self) -> None:
+        checkpoint = get_checkpoint(self.read_session, self.projector_name)
+        logger.info(
+            f"Starting projector {self.projector_name} from stream position {checkpoint}"
+        )
+
+        subscriber = threading.Thread(
+            target=self._subscribe, args=(checkpoint,), daemon=True
+        )
+        subscriber.start()
+
+        while not self._stopped.is_set():
+            batch = self._next_batch()
+            if not batch:
+                if not subscriber.is_alive() and not self._stopped.is_set():
+                    raise RuntimeError(
+                        f"Projector {self.projector_name} subscription has stopped"
+                    )
+                continue
+
+            try:
+                apply_events_to_read_model(
+                    batch, self.read_session, self.projector_name
+                )
+            except Exception as e:
+                logger.error(f"Error applying events to the read DB: {str(e)}")
+                self.read_session.rollback()
+                raise
+
+            lag = get_projector_lag(
+                self.read_session, self.esdb_client, self.projector_name
+            )
+            logger.info(
+                f"Projector {self.projector_name} applied {len(batch)} events, lag: {lag} events"
+            )
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+
+def run_projector():
+    _ = db.get_db_name_to_client()
+    esdb_client = events.get_esdb_client()
+
+    with db.session_scope("db_read") as read_session:
+        projector = ReadModelProjector(read_session, esdb_client)
+        projector.run()
@@ -0,0 +1,360 @@
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Iterable, Iterator
+
+from esdbclient import RecordedEvent
+from esdbclient.exceptions import NotFound
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, SQLModel, delete, select
+
+from gc_registry.certificate.models import (
+    DeviceIssuedInterval,
+    GranularCertificateBundleArchive,
+    GranularCertificateBundleReadModel,
+)
+from gc_registry.core.database import cqrs, db, events
+from gc_registry.core.database.encoding import decode_event
+from gc_registry.core.database.event_store import EventStore
+from gc_registry.core.database.projector import get_checkpoint, get_entity_class
+from gc_registry.core.models.base import EventTypes
+from gc_registry.core.models.outbox import EventOutbox
+from gc_registry.core.models.projector import ProjectorCheckpoint
+from gc_registry.logging_config import logger
+from gc_registry.settings import settings
+
+REBUILD_CHECKPOINT_PREFIX = "rebuild"
+
+# Tables that are not themselves recorded as events, and so would be lost if
+# truncated by a reset, and the denormalised read tables that are rebuilt from the
+# replayed rows by the read projections
+NON_ENTITY_TABLES = {
+    EventOutbox,
+    GranularCertificateBundleArchive,
+    DeviceIssuedInterval,
+    GranularCertificateBundleReadModel,
+}
+READ_MODEL_SOURCE_ENTITIES = ["GranularCertificateBundle"]
+# Archival moves entities out of their table without writing events, so replaying
+# the events of an archived entity must not restore it
+ARCHIVE_TABLES: dict[str, type[SQLModel]] = {
+    "GranularCertificateBundle": GranularCertificateBundleArchive,
+}
+
+
+def rebuild_checkpoint_name(
+    entity_name: str, partition: int = 0, n_partitions: int = 1
+) -> str:
+    return f"{REBUILD_CHECKPOINT_PREFIX}-{entity_name}-{partition}-of-{n_partitions}"
+
+
+def get_entity_names() -> list[str]:
+    """Return the names of the table models whose changes are recorded as events,
+    being those identified by an id column.
+
+    The mapper primary key is used rather than the table's, as partitioned tables
+    such as the GC Bundle table include the partition key in their primary key."""
+
+    return sorted(
+        mapper.class_.__name__
+        for mapper in SQLModel._sa_registry.mappers  # type: ignore
+        if mapper.class_ not in NON_ENTITY_TABLES
+        and [column.name for column in mapper.primary_key] == ["id"]
+    )
+
+
+def get_replay_waves(entity_names: list[str]) -> list[list[str]]:
+    """Group the entity types into waves that can be replayed in parallel, such that
+    every table referenced by a foreign key is replayed in an earlier wave."""
+
+    entity_tables = {
+        get_entity_class(entity_name).__table__: entity_name  # type: ignore
+        for entity_name in entity_names
+    }
+
+    depths: dict[Any, int] = {}
+
+    def depth(table) -> int:
+        if table not in depths:
+            referenced_tables = {
+                foreign_key.column.table
+                for foreign_key in table.foreign_keys
+                if foreign_key.column.table in entity_tables
+                and foreign_key.column.table is not table
+            }
+            depths[table] = 1 + max(map(depth, referenced_tables), default=-1)
+        return depths[table]
+
+    for table in entity_tables:
+        depth(table)
+
+    waves: list[list[str]] = [[] for _ in range(max(depths.values(), default=-1) + 1)]
+    for table, depth in depths.items():
+        waves[depth].append(entity_tables[table])
+
+    return waves
+
+
+def chunked(
+    recorded_events: Iterable[RecordedEvent], batch_size: int
+) -> Iterator[list[RecordedEvent]]:
+    batch: list[RecordedEvent] = []
+    for recorded_event in recorded_events:
+        batch.append(recorded_event)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def apply_events_in_bulk(
+    recorded_events: list[RecordedEvent],
+    entity_name: str,
+    read_session: Session,
+    checkpoint_name: str,
+    partition: int = 0,
+    n_partitions: int = 1,
+) -> int:
+    """Fold a batch of events for a single entity type into the resulting entity
+    states and upsert them into the read DB in one statement, advancing the rebuild
+    checkpoint in the same transaction.
+
+    When the entity type is split across several workers, only the entities whose
+    IDs fall in the given partition are written. Entities that have been archived
+    are not written back.
+
+    Returns:
+        int: The number of entities written
+    """
+
+    entity_class = get_entity_class(entity_name)
+    id_column = entity_class.id  # type: ignore
+
+    registry_events = [
+        decode_event(recorded_event.data, recorded_event.metadata)
+        for recorded_event in recorded_events
+        if recorded_event.type in EventTypes.__members__
+    ]
+    registry_events = [
+        event
+        for event in registry_events
+        if event.entity_name == entity_name
+        and int(event.entity_id) % n_partitions == partition
+    ]
+
+    entity_ids = {event.entity_id for event in registry_events}
+
+    archive_class = ARCHIVE_TABLES.get(entity_name)
+    if archive_class is not None and entity_ids:
+        archived_ids = read_session.exec(
+            select(archive_class.id).where(archive_class.id.in_(entity_ids))  # type: ignore
+        ).all()
+        entity_ids.difference_update(archived_ids)
+
+    entity_states: dict[Any, dict] = {
+        entity.id: entity.model_dump(mode="json")  # type: ignore
+        for entity in read_session.exec(
+            select(entity_class).where(id_column.in_(entity_ids))
+        )
+    }
+
+    for event in registry_events:
+        if event.attributes_after is None:
+            continue
+        entity_states.setdefault(event.entity_id, {}).update(event.attributes_after)
+
+    rows = [
+        entity_class.model_validate(entity_state).model_dump()
+        for entity_id, entity_state in entity_states.items()
+        if entity_id in entity_ids
+    ]
+
+    if rows:
+        # Partitioned tables include the partition key in their primary key
+        table = entity_class.__table__  # type: ignore
+        stmt = insert(entity_class)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(table.primary_key.columns),
+            set_={
+                column.name: stmt.excluded[column.name]
+                for column in table.columns
+                if not column.primary_key
+            },
+        )
+        read_session.execute(stmt, rows)
+
+    read_session.merge(
+        ProjectorCheckpoint(
+            projector_name=checkpoint_name,
+            stream_position=events.link_stream_position(recorded_events[-1]),
+        )
+    )
+    read_session.commit()
+
+    return len(rows)
+
+
+def rebuild_entity_type(
+    entity_name: str,
+    partition: int = 0,
+    n_partitions: int = 1,
+    batch_size: int = settings.PROJECTOR_BATCH_SIZE,
+    read_session: Session | None = None,
+    esdb_client: EventStore | None = None,
+) -> int:
+    """Replay the events of one entity type, or of one partition of its entity IDs,
+    into the read DB from its category stream, resuming from the last checkpoint.
+
+    Runs in a worker process, so opens its own database and ESDB connections unless
+    they are provided.
+
+    Returns:
+        int: The number of events replayed
+    """
+
+    if read_session is None:
+        _ = db.get_db_name_to_client()
+        with db.session_scope("db_read") as read_session:
+            return rebuild_entity_type(
+                entity_name,
+                partition,
+                n_partitions,
+                batch_size,
+                read_session,
+                esdb_client,
+            )
+    if esdb_client is None:
+        esdb_client = events.get_esdb_client()
+
+    checkpoint_name = rebuild_checkpoint_name(entity_name, partition, n_partitions)
+    checkpoint = get_checkpoint(read_session, checkpoint_name)
+    start_position = None if checkpoint is None else checkpoint + 1
+
+    n_events = 0
+    try:
+        recorded_events = esdb_client.read_stream(
+            events.entity_category_stream_name(entity_name),
+            stream_position=start_position,
+            resolve_links=True,
+        )
+        for batch in chunked(recorded_events, batch_size):
+            apply_events_in_bulk(
+                batch,
+                entity_name,
+                read_session,
+                checkpoint_name,
+                partition,
+                n_partitions,
+            )
+            n_events += len(batch)
+            logger.info(f"Replayed {n_events} {entity_name} events")
+
+    except NotFound:
+        logger.info(f"No events recorded for {entity_name}")
+
+    return n_events
+
+
+def rebuild_read_projections(read_session: Session, batch_size: int) -> None:
+    """Rebuild the denormalised read tables from the replayed normalised rows, once
+    all entity types are in place."""
+
+    for entity_name in READ_MODEL_SOURCE_ENTITIES:
+        entity_class = get_entity_class(entity_name)
+        last_id = None
+        while True:
+            stmt = select(entity_class).order_by(entity_class.id).limit(batch_size)  # type: ignore
+            if last_id is not None:
+                stmt = stmt.where(entity_class.id > last_id)  # type: ignore
+            entities = list(read_session.exec(stmt))
+            if not entities:
+                break
+
+            cqrs.project_read_models(entities, read_session)  # type: ignore
+            read_session.commit()
+            last_id = entities[-1].id  # type: ignore
+
+
+def reset_read_db(read_session: Session, entity_names: list[str]) -> None:
+    """Empty the rebuilt tables and rebuild checkpoints in the read DB."""
+
+    table_names = [
+        get_entity_class(entity_name).__tablename__ for entity_name in entity_names
+    ] + [GranularCertificateBundleReadModel.__tablename__]
+
+    quoted_table_names = ", ".join(f'"{table_name}"' for table_name in table_names)
+    read_session.execute(text(f"TRUNCATE TABLE {quoted_table_names} CASCADE"))
+    read_session.exec(
+        delete(ProjectorCheckpoint).where(
+            ProjectorCheckpoint.projector_name.startswith(REBUILD_CHECKPOINT_PREFIX)  # type: ignore
+        )
+    )
+    read_session.commit()
+
+
+def rebuild_read_db():
+    parser = argparse.ArgumentParser(
+        description="Rebuild the read database by replaying the ESDB event streams."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=multiprocessing.cpu_count(),
+        help="Number of worker processes replaying entity types in parallel.",
+    )
+    parser.add_argument(
+        "--partitions",
+        type=int,
+        default=1,
+        help="Number of ID partitions to split each entity type into across workers.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.PROJECTOR_BATCH_SIZE,
+        help="Number of events applied to the read DB per transaction.",
+    )
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="Empty the read DB tables and discard checkpoints before replaying.",
+    )
+    args = parser.parse_args()
+
+    _ = db.get_db_name_to_client()
+    entity_names = get_entity_names()
+    if args.reset:
+        logger.info("Resetting the READ database....")
+        with db.session_scope("db_read") as read_session:
+            reset_read_db(read_session, entity_names)
+
+    logger.info(
+        f"Replaying events for {len(entity_names)} entity types across {args.workers} workers...."
+    )
+    with ProcessPoolExecutor(
+        max_workers=args.workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        # Entity types referenced by foreign keys must be in place before the types
+        # that reference them, so each wave completes before the next is started
+        for wave in get_replay_waves(entity_names):
+            futures = {
+                executor.submit(
+                    rebuild_entity_type,
+                    entity_name,
+                    partition,
+                    args.partitions,
+                    args.batch_size,
+                ): f"{entity_name} (partition {partition})"
+                for entity_name in wave
+                for partition in range(args.partitions)
+            }
+            for future in as_completed(futures):
+                logger.info(f"Replayed {future.result()} {futures[future]} events")
+
+    logger.info("Rebuilding denormalised read tables....")
+    with db.session_scope("db_read") as read_session:
+        rebuild_read_projections(read_session, args.batch_size)
+
+    logger.info("Read database rebuild complete")
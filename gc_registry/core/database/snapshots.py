@@ -0,0 +1,180 @@
+import datetime
+import uuid
+
+from esdbclient import StreamState
+from esdbclient.exceptions import NotFound
+
+from gc_registry.core.database import events
+from gc_registry.core.database.encoding import (
+    decode_event,
+    encode_event,
+    parse_event_metadata,
+)
+from gc_registry.core.database.event_store import EventStore
+from gc_registry.core.models.base import EntityState, Event, EventTypes
+from gc_registry.settings import settings
+
+
+def snapshot_stream_name(entity_name: str, entity_id: int | uuid.UUID) -> str:
+    return f"snapshot-{events.entity_stream_name(entity_name, entity_id)}"
+
+
+def get_latest_snapshot(
+    entity_name: str,
+    entity_id: int | uuid.UUID,
+    esdb_client: EventStore,
+    at: datetime.datetime | None = None,
+) -> EntityState | None:
+    """Return the most recent snapshot of the entity, or the most recent one taken
+    at or before the given time.
+    """
+
+    try:
+        recorded_snapshots = esdb_client.read_stream(
+            snapshot_stream_name(entity_name, entity_id), backwards=True
+        )
+        for recorded_snapshot in recorded_snapshots:
+            snapshot = decode_event(recorded_snapshot.data, recorded_snapshot.metadata)
+            if at is not None and snapshot.timestamp > at:
+                continue
+
+            return EntityState(
+                entity_id=snapshot.entity_id,
+                entity_name=snapshot.entity_name,
+                attributes=snapshot.attributes_after or {},
+                stream_position=parse_event_metadata(recorded_snapshot.metadata)[
+                    "entity_stream_position"
+                ],
+                timestamp=snapshot.timestamp,
+            )
+    except NotFound:
+        pass
+
+    return None
+
+
+def write_snapshot(entity_state: EntityState, esdb_client: EventStore) -> None:
+    """Append the entity state to the entity's snapshot stream, recording the entity
+    stream position up to which it has been folded."""
+
+    snapshot = Event(
+        entity_id=entity_state.entity_id,
+        entity_name=entity_state.entity_name,
+        attributes_before=None,
+        attributes_after=entity_state.attributes,
+        timestamp=entity_state.timestamp,
+    )
+
+    esdb_client.append_to_stream(
+        stream_name=snapshot_stream_name(
+            entity_state.entity_name, entity_state.entity_id
+        ),
+        current_version=StreamState.ANY,
+        events=[
+            encode_event(
+                snapshot,
+                EventTypes.SNAPSHOT,
+                metadata={"entity_stream_position": entity_state.stream_position},
+            )
+        ],
+    )
+
+
+def fold_entity_events(
+    entity_name: str,
+    entity_id: int | uuid.UUID,
+    esdb_client: EventStore,
+    at: datetime.datetime | None = None,
+) -> tuple[EntityState | None, int]:
+    """Fold the events recorded in the entity stream since the latest snapshot onto
+    the snapshotted state, returning the state and the number of events folded."""
+
+    if at is not None and at.tzinfo is None:
+        at = at.replace(tzinfo=datetime.timezone.utc)
+
+    entity_state = get_latest_snapshot(entity_name, entity_id, esdb_client, at)
+    start_position = None if entity_state is None else entity_state.stream_position + 1
+
+    n_events_folded = 0
+    try:
+        recorded_events = esdb_client.read_stream(
+            events.entity_stream_name(entity_name, entity_id),
+            stream_position=start_position,
+            resolve_links=True,
+        )
+        for recorded_event in recorded_events:
+            event = decode_event(recorded_event.data, recorded_event.metadata)
+            if at is not None and event.timestamp > at:
+                break
+
+            if entity_state is None:
+                entity_state = EntityState(
+                    entity_id=entity_id,
+                    entity_name=entity_name,
+                    attributes={},
+                    stream_position=events.link_stream_position(recorded_event),
+                    timestamp=event.timestamp,
+                )
+
+            entity_state.attributes.update(event.attributes_after or {})
+            entity_state.stream_position = events.link_stream_position(recorded_event)
+            entity_state.timestamp = event.timestamp
+            n_events_folded += 1
+
+    except NotFound:
+        pass
+
+    return entity_state, n_events_folded
+
+
+def load_entity_state(
+    entity_name: str,
+    entity_id: int | uuid.UUID,
+    esdb_client: EventStore,
+    at: datetime.datetime | None = None,
+) -> EntityState | None:
+    """Reconstruct the state of an entity from its latest snapshot and the events
+    recorded in its entity stream since, optionally as it was at a point in time.
+
+    When bringing an entity up to date requires folding more than
+    SNAPSHOT_INTERVAL_EVENTS events, a new snapshot is written so that the cost of
+    later loads stays bounded.
+
+    Args:
+        entity_name (str): The class name of the entity, e.g. Account
+        entity_id (int | uuid.UUID): The ID of the entity
+        esdb_client (EventStore): The event store client
+        at (datetime.datetime | None): Reconstruct the state as at this UTC time
+
+    Returns:
+        EntityState | None: The entity state, or None if it had no events by then
+    """
+
+    entity_state, n_events_folded = fold_entity_events(
+        entity_name, entity_id, esdb_client, at
+    )
+
+    if (
+        entity_state is not None
+        and at is None
+        and n_events_folded >= settings.SNAPSHOT_INTERVAL_EVENTS
+    ):
+        write_snapshot(entity_state, esdb_client)
+
+    return entity_state
+
+
+def snapshot_entity(
+    entity_name: str,
+    entity_id: int | uuid.UUID,
+    esdb_client: EventStore,
+) -> EntityState | None:
+    """Take a snapshot of the current state of the entity on demand."""
+
+    entity_state, n_events_folded = fold_entity_events(
+        entity_name, entity_id, esdb_client
+    )
+    if entity_state is not None and n_events_folded > 0:
+        write_snapshot(entity_state, esdb_client)
+
+    return entity_state
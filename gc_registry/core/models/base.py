@@ -69,6 +69,7 @@ class EventTypes(str, Enum):
     CREATE = "CREATE"
     UPDATE = "UPDATE"
     DELETE = "DELETE"
+    SNAPSHOT = "SNAPSHOT"
 
 
 class Event(BaseModel):
@@ -79,6 +80,25 @@ class Event(BaseModel):
     timestamp: datetime.datetime = Field(default_factory=utc_datetime_now)  # type: ignore
 
 
+class EventRead(Event):
+    event_type: str
+    stream_position: int
+
+
+class EntityState(BaseModel):
+    """The state of an entity reconstructed from its event history."""
+
+    entity_id: int | uuid.UUID
+    entity_name: str
+    attributes: dict
+    stream_position: int = Field(
+        description="Position in the entity stream of the last event applied."
+    )
+    timestamp: datetime.datetime = Field(
+        description="The time of the last event applied."
+    )
+
+
 class logging_levels(str, enum.Enum):
     DEBUG = "DEBUG"
     INFO = "INFO"
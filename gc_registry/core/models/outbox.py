@@ -0,0 +1,47 @@
+import datetime
+import uuid
+
+from esdbclient import NewEvent
+from sqlalchemy import BigInteger, Column, LargeBinary
+from sqlmodel import Field, SQLModel
+
+from gc_registry.core.database.encoding import event_content_type
+from gc_registry.core.models.base import utc_datetime_now
+
+
+class EventOutbox(SQLModel, table=True):
+    """An event committed to the write DB alongside the entity change it records,
+    awaiting publication to the ESDB events stream by the outbox relay."""
+
+    id: int | None = Field(
+        default=None,
+        sa_column=Column(BigInteger(), primary_key=True, autoincrement=True),
+        description="Incremental ID giving the order in which events are published.",
+    )
+    event_id: uuid.UUID = Field(
+        description="The ESDB event ID, which lets ESDB discard a repeated append."
+    )
+    event_type: str
+    data: bytes = Field(sa_column=Column(LargeBinary(), nullable=False))
+    event_metadata: bytes = Field(
+        default=b"", sa_column=Column(LargeBinary(), nullable=False)
+    )
+    created_at: datetime.datetime = Field(default_factory=utc_datetime_now)
+
+    @classmethod
+    def from_esdb_event(cls, esdb_event: NewEvent) -> "EventOutbox":
+        return cls(
+            event_id=esdb_event.id,
+            event_type=esdb_event.type,
+            data=esdb_event.data,
+            event_metadata=esdb_event.metadata,
+        )
+
+    def to_esdb_event(self) -> NewEvent:
+        return NewEvent(
+            id=self.event_id,
+            type=self.event_type,
+            data=self.data,
+            metadata=self.event_metadata,
+            content_type=event_content_type(self.event_metadata),
+        )
@@ -0,0 +1,20 @@
+import datetime
+
+from sqlalchemy import BigInteger, Column
+from sqlmodel import Field, SQLModel
+
+from gc_registry.core.models.base import utc_datetime_now
+
+
+class ProjectorCheckpoint(SQLModel, table=True):
+    """The position in the ESDB events stream up to which a projector has applied
+    events to the read DB. Written in the same transaction as the projected rows."""
+
+    projector_name: str = Field(primary_key=True)
+    stream_position: int
+    # Position in the ESDB transaction log of the last applied event, compared with
+    # the consistency tokens returned by writes
+    commit_position: int | None = Field(
+        default=None, sa_column=Column(BigInteger(), nullable=True)
+    )
+    updated_at: datetime.datetime = Field(default_factory=utc_datetime_now)
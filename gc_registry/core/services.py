@@ -2,6 +2,7 @@ from hashlib import sha256
 
 from gc_registry.certificate.models import (
     GranularCertificateBundle,
+    GranularCertificateBundleArchive,
     GranularCertificateBundleBase,
 )
 from gc_registry.certificate.schemas import mutable_gc_attributes
@@ -9,6 +10,7 @@ from gc_registry.certificate.schemas import mutable_gc_attributes
 
 def create_bundle_hash(
     granular_certificate_bundle: GranularCertificateBundle
+    | GranularCertificateBundleArchive
     | GranularCertificateBundleBase,
     nonce: str | None = "",
 ):
@@ -21,7 +23,10 @@ def create_bundle_hash(
     used, a JSON model dump of the base bundle class is used to avoid
     automcatically generated fields such as the bundle's ID. In addition,
     only non-mutable fields are included such that lineage can be traced
-    no matter the lifecycle stage the GC is in.
+    no matter the lifecycle stage the GC is in. The bundle is validated
+    against the base class first so that the fields are dumped in the same
+    order whether the bundle was loaded from the database, including from
+    the archive, or constructed in memory.
 
     Args:
         granular_certificate_bundle (GranularCertificateBundle): The child GC Bundle
@@ -31,7 +36,7 @@ def create_bundle_hash(
         str: The hash of the child GC Bundle
     """
 
-    granular_certificate_bundle_dict = granular_certificate_bundle.model_dump_json(
-        exclude=set(["id", "created_at", "hash"] + mutable_gc_attributes)
-    )
+    granular_certificate_bundle_dict = GranularCertificateBundleBase.model_validate(
+        granular_certificate_bundle.model_dump()
+    ).model_dump_json(exclude=set(["hash"] + mutable_gc_attributes))
     return sha256(f"{granular_certificate_bundle_dict}{nonce}".encode()).hexdigest()
@@ -0,0 +1,230 @@
+"""Benchmark the query plans of the GC Bundle hot paths with and without the bundle
+indexes declared on the GranularCertificateBundle model.
+
+A scratch copy of the bundle table is filled with synthetic bundles in the write
+database, each query is explained before and after the indexes are built on it, and
+the scratch table is dropped afterwards. Run with:
+
+    python -m gc_registry.dev.benchmark_bundle_indexes --rows 5000000
+"""
+
+import argparse
+import datetime
+import time
+
+from sqlalchemy import Index, MetaData, Table, func, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import Select
+
+from gc_registry.certificate.models import GranularCertificateBundle
+from gc_registry.core.database import db
+from gc_registry.core.models.base import CertificateStatus
+from gc_registry.logging_config import logger
+
+BENCHMARK_TABLE_NAME = "granularcertificatebundle_index_benchmark"
+PRODUCTION_START = datetime.datetime(2024, 1, 1)
+
+
+def create_benchmark_table(
+    connection: Connection, n_rows: int, n_devices: int, n_accounts: int
+) -> Table:
+    """Create an unindexed copy of the bundle table holding one hourly bundle per
+    device for as many hours as it takes to reach the given number of rows."""
+
+    connection.execute(text(f"DROP TABLE IF EXISTS {BENCHMARK_TABLE_NAME}"))
+    connection.execute(
+        text(
+            f"CREATE TABLE {BENCHMARK_TABLE_NAME} "
+            f"(LIKE {GranularCertificateBundle.__tablename__} INCLUDING DEFAULTS)"
+        )
+    )
+
+    # Each account holds an equal block of devices, around a twentieth of bundles are
+    # withdrawn and a fiftieth deleted, and each device's certificate IDs run
+    # sequentially
+    connection.execute(
+        text(
+            f"""
+            INSERT INTO {BENCHMARK_TABLE_NAME} (
+                id, created_at, issuance_id, certificate_bundle_status, account_id,
+                metadata_id, certificate_bundle_id_range_start,
+                certificate_bundle_id_range_end, bundle_quantity, energy_carrier,
+                energy_source, face_value, issuance_post_energy_carrier_conversion,
+                device_id, production_starting_interval, production_ending_interval,
+                expiry_datestamp, is_storage, is_deleted
+            )
+            SELECT
+                n,
+                now(),
+                'benchmark-' || n,
+                CASE
+                    WHEN abs(hashint4(n)) % 20 = 0 THEN 'WITHDRAWN'
+                    WHEN abs(hashint4(n)) % 7 = 0 THEN 'CANCELLED'
+                    ELSE 'ACTIVE'
+                END::certificatestatus,
+                1 + (n % :n_devices) * :n_accounts / :n_devices,
+                1,
+                (n / :n_devices) * 1000,
+                (n / :n_devices) * 1000 + 999,
+                1000,
+                enum_first(NULL::energycarriertype),
+                enum_first(NULL::energysourcetype),
+                1,
+                false,
+                1 + n % :n_devices,
+                :production_start + (n / :n_devices) * interval '1 hour',
+                :production_start + (n / :n_devices + 1) * interval '1 hour',
+                :production_start + interval '2 years',
+                0,
+                abs(hashint4(-n)) % 50 = 0
+            FROM generate_series(1, :n_rows) AS n
+            """
+        ),
+        {
+            "n_rows": n_rows,
+            "n_devices": n_devices,
+            "n_accounts": n_accounts,
+            "production_start": PRODUCTION_START,
+        },
+    )
+    connection.execute(text(f"ANALYZE {BENCHMARK_TABLE_NAME}"))
+
+    return Table(BENCHMARK_TABLE_NAME, MetaData(), autoload_with=connection)
+
+
+def create_benchmark_indexes(connection: Connection, table: Table) -> None:
+    """Build the indexes of the bundle table model on the benchmark table."""
+
+    for index in GranularCertificateBundle.__table__.indexes:  # type: ignore
+        Index(
+            f"{index.name}_benchmark",
+            *[table.c[column.name] for column in index.columns],
+            postgresql_where=index.dialect_options["postgresql"]["where"],
+        ).create(connection)
+
+    connection.execute(text(f"ANALYZE {BENCHMARK_TABLE_NAME}"))
+
+
+def benchmark_queries(table: Table, n_hours: int) -> dict[str, Select]:
+    """The shapes of the bundle queries issued by the certificate services, for the
+    first account and device and a week in the middle of the generated bundles."""
+
+    period_start = PRODUCTION_START + datetime.timedelta(hours=n_hours // 2)
+    period_end = period_start + datetime.timedelta(days=7)
+    withdrawn = CertificateStatus.WITHDRAWN.name
+    active = CertificateStatus.ACTIVE.name
+
+    account_bundles = select(table).where(
+        table.c.account_id == 1,
+        table.c.is_deleted == False,  # noqa
+        table.c.production_starting_interval >= period_start,
+        table.c.production_ending_interval <= period_end,
+    )
+
+    return {
+        "Account bundles in period": account_bundles,
+        "Account bundles in period by status": account_bundles.where(
+            table.c.certificate_bundle_status == active
+        ),
+        "Max certificate ID of device": select(
+            func.max(table.c.certificate_bundle_id_range_end)
+        ).where(
+            table.c.device_id == 1,
+            table.c.certificate_bundle_status != withdrawn,
+        ),
+        "Max production timestamp of device": select(
+            func.max(table.c.production_ending_interval)
+        ).where(
+            table.c.device_id == 1,
+            table.c.certificate_bundle_status != withdrawn,
+        ),
+    }
+
+
+def plan_nodes(plan: dict) -> list[str]:
+    nodes = [
+        plan["Node Type"]
+        + (f" on {plan['Index Name']}" if "Index Name" in plan else "")
+    ]
+    for child in plan.get("Plans", []):
+        nodes.extend(plan_nodes(child))
+    return nodes
+
+
+def explain_query(connection: Connection, query: Select) -> dict:
+    """Run the query under EXPLAIN ANALYZE, returning its plan and timings."""
+
+    compiled_query = query.compile(connection, compile_kwargs={"literal_binds": True})
+    explained = connection.execute(
+        text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {compiled_query}")
+    ).scalar_one()[0]
+
+    return {
+        "plan": " > ".join(plan_nodes(explained["Plan"])),
+        "rows": explained["Plan"]["Actual Rows"],
+        "execution_ms": explained["Execution Time"],
+        "buffers": explained["Plan"].get("Shared Hit Blocks", 0)
+        + explained["Plan"].get("Shared Read Blocks", 0),
+    }
+
+
+def log_explained_queries(connection: Connection, queries: dict[str, Select]) -> None:
+    for query_name, query in queries.items():
+        # Warm the cache so that the timings compare plans rather than disk reads
+        explain_query(connection, query)
+        explained = explain_query(connection, query)
+        logger.info(
+            f"{query_name}: {explained['rows']} rows in "
+            f"{explained['execution_ms']:.2f} ms, "
+            f"{explained['buffers']} buffers, {explained['plan']}"
+        )
+
+
+def benchmark_bundle_indexes():
+    parser = argparse.ArgumentParser(
+        description="Compare bundle query plans with and without the bundle indexes."
+    )
+    parser.add_argument(
+        "--rows", type=int, default=5_000_000, help="Number of bundles to generate."
+    )
+    parser.add_argument(
+        "--devices", type=int, default=1_000, help="Number of devices issuing bundles."
+    )
+    parser.add_argument(
+        "--accounts", type=int, default=100, help="Number of accounts holding bundles."
+    )
+    args = parser.parse_args()
+
+    engine = db.get_db_name_to_client()["db_write"].engine
+
+    with engine.connect() as connection:
+        try:
+            logger.info(f"Generating {args.rows} bundles in {BENCHMARK_TABLE_NAME}....")
+            start_time = time.perf_counter()
+            table = create_benchmark_table(
+                connection, args.rows, args.devices, args.accounts
+            )
+            connection.commit()
+            logger.info(f"Generated bundles in {time.perf_counter() - start_time:.1f}s")
+
+            queries = benchmark_queries(table, args.rows // args.devices)
+
+            logger.info("Without indexes:")
+            log_explained_queries(connection, queries)
+
+            start_time = time.perf_counter()
+            create_benchmark_indexes(connection, table)
+            connection.commit()
+            logger.info(f"Built indexes in {time.perf_counter() - start_time:.1f}s")
+
+            logger.info("With indexes:")
+            log_explained_queries(connection, queries)
+
+        finally:
+            connection.rollback()
+            connection.execute(text(f"DROP TABLE IF EXISTS {BENCHMARK_TABLE_NAME}"))
+            connection.commit()
+
+
+if __name__ == "__main__":
+    benchmark_bundle_indexes()
@@ -1,9 +1,13 @@
 # Imports
-from esdbclient import EventStoreDBClient
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from gc_registry.core.database import db, events
+from gc_registry.core.database.consistency import (
+    ConsistentReadSession,
+    get_consistent_read_session,
+)
+from gc_registry.core.database.event_store import EventStore
 from gc_registry.device import models
 
 # Router initialisation
@@ -11,13 +15,13 @@ router = APIRouter(tags=["Devices"])
 
 
 @router.post("/create", response_model=models.DeviceRead)
-def create_device(
+async def create_device(
     device_base: models.DeviceBase,
-    write_session: Session = Depends(db.get_write_session),
-    read_session: Session = Depends(db.get_read_session),
-    esdb_client: EventStoreDBClient = Depends(events.get_esdb_client),
+    write_session: AsyncSession = Depends(db.get_async_write_session),
+    read_session: AsyncSession = Depends(db.get_async_read_session),
+    esdb_client: EventStore = Depends(events.get_esdb_client),
 ):
-    devices = models.Device.create(
+    devices = await models.Device.create_async(
         device_base, write_session, read_session, esdb_client
     )
     if not devices:
@@ -29,34 +33,40 @@ def create_device(
 
 
 @router.get("/{device_id}", response_model=models.DeviceRead)
-def read_device(
+async def read_device(
     device_id: int,
-    read_session: Session = Depends(db.get_read_session),
+    consistent_read: ConsistentReadSession = Depends(get_consistent_read_session),
 ):
-    device = models.Device.by_id(device_id, read_session)
+    device = await models.Device.by_id_async(device_id, consistent_read.session)
 
     return device
 
 
 @router.patch("/update/{device_id}", response_model=models.DeviceRead)
-def update_device(
+async def update_device(
     device_id: int,
     device_update: models.DeviceUpdate,
-    write_session: Session = Depends(db.get_write_session),
-    read_session: Session = Depends(db.get_read_session),
-    esdb_client: EventStoreDBClient = Depends(events.get_esdb_client),
+    write_session: AsyncSession = Depends(db.get_async_write_session),
+    read_session: AsyncSession = Depends(db.get_async_read_session),
+    esdb_client: EventStore = Depends(events.get_esdb_client),
 ):
-    device = models.Device.by_id(device_id, read_session)
+    device = await models.Device.by_id_async(device_id, write_session)
 
-    return device.update(device_update, write_session, read_session, esdb_client)
+    return await device.update_async(
+        device_update, write_session, read_session, esdb_client
+    )
 
 
 @router.delete("/delete/{device_id}", response_model=models.DeviceRead)
-def delete_device(
+async def delete_device(
     device_id: int,
-    write_session: Session = Depends(db.get_write_session),
-    read_session: Session = Depends(db.get_read_session),
-    esdb_client: EventStoreDBClient = Depends(events.get_esdb_client),
+    write_session: AsyncSession = Depends(db.get_async_write_session),
+    read_session: AsyncSession = Depends(db.get_async_read_session),
+    esdb_client: EventStore = Depends(events.get_esdb_client),
 ):
-    device = models.Device.by_id(device_id, write_session)
-    return device.delete(write_session, read_session, esdb_client)
+    device = await models.Device.by_id_async(device_id, write_session)
+    devices = await device.delete_async(write_session, read_session, esdb_client)
+    if not devices:
+        raise HTTPException(status_code=404, detail="Could not delete Device")
+
+    return devices[0]
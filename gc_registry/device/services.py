@@ -21,6 +21,20 @@ def get_device_capacity_by_id(db_session: Session, device_id: int) -> float | No
         return None
 
 
+def get_device_capacities_by_id(
+    db_session: Session, device_ids: list[int]
+) -> dict[int, float]:
+    """Look up the capacities of the given devices with a single query, omitting
+    devices that do not exist or have no capacity."""
+
+    stmt = select(Device.id, Device.capacity).where(Device.id.in_(device_ids))  # type: ignore
+    return {
+        device_id: float(device_capacity)
+        for device_id, device_capacity in db_session.exec(stmt).all()
+        if device_capacity
+    }
+
+
 def device_mw_capacity_to_wh_max(
     device_capacity_mw: float, hours: float = settings.CERTIFICATE_GRANULARITY_HOURS
 ) -> float:
@@ -1,16 +1,23 @@
+import asyncio
+import datetime
 import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import Depends, FastAPI, Request
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 from markdown import markdown
+from sqlmodel import Session
 from starlette.middleware.sessions import SessionMiddleware
 
+from gc_registry.core.database.event_store import EventStore
+
 from .account.routes import router as account_router
 from .certificate.routes import router as certificate_router
+from .core.database import consistency, cqrs, db, events, projector, snapshots
 from .core.database.db import get_db_name_to_client
-from .core.models.base import LoggingLevelRequest
+from .core.models.base import EntityState, EventRead, LoggingLevelRequest
 from .device.routes import router as device_router
 from .logging_config import logger, set_logger_and_children_level
 from .measurement.routes import router as measurements_router
@@ -50,7 +57,35 @@ tags_metadata = [
     },
 ]
 
+
+async def monitor_esdb_client(esdb_client: EventStore) -> None:
+    while True:
+        await asyncio.sleep(settings.ESDB_HEALTH_CHECK_INTERVAL_SECONDS)
+        await asyncio.to_thread(events.check_esdb_client_health, esdb_client)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open the shared EventStoreDB client once at startup rather than per request,
+    # honouring any override of the client dependency
+    get_esdb_client = app.dependency_overrides.get(
+        events.get_esdb_client, events.get_esdb_client
+    )
+    esdb_client = await asyncio.to_thread(get_esdb_client)
+    try:
+        await asyncio.to_thread(events.ensure_entity_streams_projection, esdb_client)
+    except Exception as e:
+        logger.error(f"Unable to create the entity streams projection: {str(e)}")
+    health_check = asyncio.create_task(monitor_esdb_client(esdb_client))
+
+    yield
+
+    health_check.cancel()
+    events.close_esdb_client()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     openapi_tags=tags_metadata,
     title="Energy Tag API Specification",
     description=descriptions["api"],
@@ -122,6 +157,22 @@ async def read_root(request: Request):
     return templates.TemplateResponse("index.jinja", params)
 
 
+@app.middleware("http")
+async def add_consistency_token(request: Request, call_next):
+    """Return the commit position of the events appended by a write, which reads can
+    send back to observe the write once the read DB has caught up with it."""
+
+    with events.track_appended_commit_positions() as commit_positions:
+        response = await call_next(request)
+
+    if commit_positions:
+        response.headers[consistency.CONSISTENCY_TOKEN_HEADER] = str(
+            max(commit_positions)
+        )
+
+    return response
+
+
 # Assemble fastapi loggers
 uvicorn_logger = logging.getLogger("uvicorn")
 uvicorn_access_logger = logging.getLogger("uvicorn.access")
@@ -188,3 +239,93 @@ async def change_log_level_endpoint(request: LoggingLevelRequest):
         "message": f"Log level changed to {request.level}",
         "logger_status": debug_info,
     }
+
+
+@app.get("/health", tags=["Core"])
+def health_check(
+    esdb_client: EventStore = Depends(events.get_esdb_client),
+):
+    """Check the connection to EventStoreDB, reconnecting if it has been lost."""
+
+    if not events.check_esdb_client_health(esdb_client):
+        raise HTTPException(status_code=503, detail="EventStoreDB is unavailable")
+
+    return {"esdb": "ok"}
+
+
+@app.get(
+    "/events/{entity_name}/{entity_id}",
+    response_model=list[EventRead],
+    tags=["Core"],
+)
+def read_entity_event_history(
+    entity_name: str,
+    entity_id: int,
+    esdb_client: EventStore = Depends(events.get_esdb_client),
+):
+    """Return the full event history of a single entity, oldest first."""
+
+    return events.get_entity_event_history(entity_name, entity_id, esdb_client)
+
+
+@app.get(
+    "/events/{entity_name}/{entity_id}/state",
+    response_model=EntityState,
+    tags=["Core"],
+)
+def read_entity_state(
+    entity_name: str,
+    entity_id: int,
+    at: datetime.datetime | None = None,
+    esdb_client: EventStore = Depends(events.get_esdb_client),
+):
+    """Reconstruct the state of a single entity from the event store, either as it
+    is now or as it was at the given UTC datetime."""
+
+    entity_state = snapshots.load_entity_state(entity_name, entity_id, esdb_client, at)
+    if entity_state is None:
+        raise HTTPException(status_code=404, detail="No events found for entity")
+
+    return entity_state
+
+
+@app.post(
+    "/events/{entity_name}/{entity_id}/snapshot",
+    response_model=EntityState,
+    tags=["Core"],
+)
+def create_entity_snapshot(
+    entity_name: str,
+    entity_id: int,
+    esdb_client: EventStore = Depends(events.get_esdb_client),
+):
+    """Snapshot the current state of a single entity in the event store."""
+
+    entity_state = snapshots.snapshot_entity(entity_name, entity_id, esdb_client)
+    if entity_state is None:
+        raise HTTPException(status_code=404, detail="No events found for entity")
+
+    return entity_state
+
+
+@app.get("/db_pool_metrics", tags=["Core"])
+def db_pool_metrics():
+    """Utilisation and connection checkout wait statistics of the connection pools of
+    each database, to diagnose requests queueing for connections."""
+
+    return db.get_pool_metrics()
+
+
+@app.get("/read_model_lag", tags=["Core"])
+def read_model_lag(
+    read_session: Session = Depends(db.get_read_session),
+    esdb_client: EventStore = Depends(events.get_esdb_client),
+):
+    """Number of events appended to the event store not yet applied to the read DB
+    by the projector. Always zero when the read model is updated synchronously."""
+
+    lag = 0
+    if not cqrs.project_read_model_synchronously():
+        lag = projector.get_projector_lag(read_session, esdb_client)
+
+    return {"read_model_mode": settings.READ_MODEL_MODE, "lag": lag}
@@ -1,9 +1,13 @@
 # Imports
-from esdbclient import EventStoreDBClient
 from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel import Session
 
 from gc_registry.core.database import db, events
+from gc_registry.core.database.consistency import (
+    ConsistentReadSession,
+    get_consistent_read_session,
+)
+from gc_registry.core.database.event_store import EventStore
 from gc_registry.measurement import models
 from gc_registry.measurement.services import parse_measurement_json
 
@@ -18,7 +22,7 @@ def submit_readings(
     measurement_json: str,
     write_session: Session = Depends(db.get_write_session),
     read_session: Session = Depends(db.get_read_session),
-    esdb_client: EventStoreDBClient = Depends(events.get_esdb_client),
+    esdb_client: EventStore = Depends(events.get_esdb_client),
 ):
     """Submit meter readings as a JSON-serialised CSV file for one or more devices,
     creating a MeasurementReport for each production interval against which GC
@@ -61,7 +65,7 @@ def create_measurement(
     measurement_base: models.MeasurementReportBase,
     write_session: Session = Depends(db.get_write_session),
     read_session: Session = Depends(db.get_read_session),
-    esdb_client: EventStoreDBClient = Depends(events.get_esdb_client),
+    esdb_client: EventStore = Depends(events.get_esdb_client),
 ):
     measurement = models.MeasurementReport.create(
         measurement_base, write_session, read_session, esdb_client
@@ -71,11 +75,13 @@ def create_measurement(
 
 
 @router.get("/{measurement_id}", response_model=models.MeasurementReportRead)
-def read_measurement(
+async def read_measurement(
     measurement_id: int,
-    read_session: Session = Depends(db.get_read_session),
+    consistent_read: ConsistentReadSession = Depends(get_consistent_read_session),
 ):
-    measurement = models.MeasurementReport.by_id(measurement_id, read_session)
+    measurement = await models.MeasurementReport.by_id_async(
+        measurement_id, consistent_read.session
+    )
 
     return measurement
 
@@ -86,9 +92,9 @@ def update_measurement(
     measurement_update: models.MeasurementReportUpdate,
     write_session: Session = Depends(db.get_write_session),
     read_session: Session = Depends(db.get_read_session),
-    esdb_client: EventStoreDBClient = Depends(events.get_esdb_client),
+    esdb_client: EventStore = Depends(events.get_esdb_client),
 ):
-    measurement = models.MeasurementReport.by_id(measurement_id, read_session)
+    measurement = models.MeasurementReport.by_id(measurement_id, write_session)
 
     return measurement.update(
         measurement_update, write_session, read_session, esdb_client
@@ -100,7 +106,7 @@ def delete_measurement(
     measurement_id: int,
     write_session: Session = Depends(db.get_write_session),
     read_session: Session = Depends(db.get_read_session),
-    esdb_client: EventStoreDBClient = Depends(events.get_esdb_client),
+    esdb_client: EventStore = Depends(events.get_esdb_client),
 ):
     db_measurement = models.MeasurementReport.by_id(measurement_id, write_session)
     return db_measurement.delete(write_session, read_session, esdb_client)
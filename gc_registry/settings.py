@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -17,6 +19,13 @@ class Settings(BaseSettings):
     DB_TEST_FP: str
     ENVIRONMENT: str
 
+    # Connection pool of each database engine, sized for the number of concurrent
+    # requests, with overflow connections opened during bursts and closed after use
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_POOL_MAX_OVERFLOW: int = 20
+    DATABASE_POOL_RECYCLE_SECONDS: int = 1800
+    DATABASE_POOL_TIMEOUT_SECONDS: float = 30
+
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
@@ -25,6 +34,62 @@ class Settings(BaseSettings):
     MIDDLEWARE_SECRET_KEY: str
 
     ESDB_CONNECTION_STRING: str
+    # "esdb" connects to EventStoreDB, "memory" keeps events in process for tests
+    # and benchmarks that should run without an EventStoreDB node
+    EVENT_STORE_BACKEND: Literal["esdb", "memory"] = "esdb"
+    # "msgpack" packs event payloads in a compact binary encoding, recording its
+    # schema version in the event metadata; events in either encoding can be read
+    EVENT_ENCODING: Literal["json", "msgpack"] = "json"
+    ESDB_HEALTH_CHECK_INTERVAL_SECONDS: float = 30
+
+    # Group commit of event appends across concurrent requests
+    ESDB_APPEND_BATCHING: bool = False
+    ESDB_APPEND_BATCH_WINDOW_MS: float = 5
+    ESDB_APPEND_BATCH_MAX_EVENTS: int = 1000
+    ESDB_APPEND_TIMEOUT_SECONDS: float = 30
+
+    # "direct" appends events to ESDB within each request, "outbox" commits them to
+    # the write DB outbox table for the outbox relay worker to publish
+    EVENT_PUBLISH_MODE: Literal["direct", "outbox"] = "direct"
+    OUTBOX_RELAY_BATCH_SIZE: int = 1000
+    OUTBOX_RELAY_POLL_INTERVAL_SECONDS: float = 0.5
+
+    # Number of months after the current month for which GC Bundle partitions are
+    # created ahead of time by the partition maintenance command
+    BUNDLE_PARTITION_MONTHS_AHEAD: int = 3
+
+    # Deleted GC Bundles, for example the parents of split bundles, are moved to the
+    # archive table once this many days have passed since their creation
+    BUNDLE_ARCHIVE_RETENTION_DAYS: int = 90
+    BUNDLE_ARCHIVE_BATCH_SIZE: int = 10_000
+
+    # Number of GC Bundles fetched from the server-side cursor at a time when
+    # streaming certificate query results
+    CERTIFICATE_QUERY_STREAM_BATCH_SIZE: int = 1000
+
+    # Largest number of GC Bundles returned in one page of certificate query results
+    CERTIFICATE_QUERY_MAX_PAGE_SIZE: int = 1000
+
+    # Number of Devices issued certificates concurrently, each holding a write and a
+    # read connection, so keep within the connection pool size and overflow
+    ISSUANCE_MAX_WORKERS: int = 8
+
+    # Number of events folded when loading an entity before a new snapshot is taken
+    SNAPSHOT_INTERVAL_EVENTS: int = 100
+
+    # "synchronous" writes the read DB within each request, "projected" leaves it
+    # to the read model projector worker consuming the ESDB events stream
+    READ_MODEL_MODE: Literal["synchronous", "projected"] = "synchronous"
+    PROJECTOR_BATCH_SIZE: int = 500
+    PROJECTOR_BATCH_TIMEOUT_SECONDS: float = 0.5
+    # The projector resubscribes after a dropped subscription, doubling its wait
+    # after each consecutive failure up to the maximum
+    PROJECTOR_RESUBSCRIBE_BACKOFF_SECONDS: float = 1.0
+    PROJECTOR_RESUBSCRIBE_MAX_BACKOFF_SECONDS: float = 30.0
+    # Reads sending the consistency token of a write wait this long for the projector
+    # to apply it before they are served from the write DB instead
+    READ_CONSISTENCY_WAIT_SECONDS: float = 0.5
+    READ_CONSISTENCY_POLL_INTERVAL_SECONDS: float = 0.02
 
     LOG_LEVEL: str
 
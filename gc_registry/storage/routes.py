@@ -1,12 +1,17 @@
-from esdbclient import EventStoreDBClient
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel import Session
 
 from gc_registry.certificate.models import GranularCertificateBundle
 from gc_registry.certificate.schemas import (
     GranularCertificateBundleCreate,
 )
-from gc_registry.core.database import db, events
+from gc_registry.certificate.services import (
+    allocate_certificate_ids,
+    assign_certificate_ids,
+    record_device_issuance,
+)
+from gc_registry.core.database import cqrs, db, events
+from gc_registry.core.database.event_store import EventStore
 from gc_registry.storage.models import (
     StorageAction,
     StorageChargeRecord,
@@ -33,7 +38,7 @@ def create_SCR(
     scr_base: StorageChargeRecordBase,
     write_session: Session = Depends(db.get_write_session),
     read_session: Session = Depends(db.get_read_session),
-    esdb_client: EventStoreDBClient = Depends(events.get_esdb_client),
+    esdb_client: EventStore = Depends(events.get_esdb_client),
 ):
     """Create a Storage Charge Record with the specified properties."""
     scr = StorageChargeRecord.create(scr_base, write_session, read_session, esdb_client)
@@ -50,7 +55,7 @@ def query_SCR(
     scr_query: StorageAction,
     write_session: Session = Depends(db.get_write_session),
     read_session: Session = Depends(db.get_read_session),
-    esdb_client: EventStoreDBClient = Depends(events.get_esdb_client),
+    esdb_client: EventStore = Depends(events.get_esdb_client),
 ):
     """Return all SCRs from the specified Account that match the provided search criteria."""
     scr_action = StorageAction.create(
@@ -69,7 +74,7 @@ def create_SDR(
     sdr_base: StorageDischargeRecordBase,
     write_session: Session = Depends(db.get_write_session),
     read_session: Session = Depends(db.get_read_session),
-    esdb_client: EventStoreDBClient = Depends(events.get_esdb_client),
+    esdb_client: EventStore = Depends(events.get_esdb_client),
 ):
     """Create a Storage Discharge Record with the specified properties."""
     sdr = StorageDischargeRecord.create(
@@ -88,7 +93,7 @@ def query_SDR(
     sdr_query: StorageAction,
     write_session: Session = Depends(db.get_write_session),
     read_session: Session = Depends(db.get_read_session),
-    esdb_client: EventStoreDBClient = Depends(events.get_esdb_client),
+    esdb_client: EventStore = Depends(events.get_esdb_client),
 ):
     """Return all SDRs from the specified Account that match the provided search criteria."""
     sdr_action = StorageAction.create(
@@ -107,7 +112,7 @@ def SCR_withdraw(
     storage_action_base: StorageAction,
     write_session: Session = Depends(db.get_write_session),
     read_session: Session = Depends(db.get_read_session),
-    esdb_client: EventStoreDBClient = Depends(events.get_esdb_client),
+    esdb_client: EventStore = Depends(events.get_esdb_client),
 ):
     """(Issuing Body only) - Withdraw a fixed number of SCRs from the specified Account matching the provided search criteria."""
     scr_action = StorageAction.create(
@@ -126,7 +131,7 @@ def SDR_withdraw(
     storage_action_base: StorageAction,
     write_session: Session = Depends(db.get_write_session),
     read_session: Session = Depends(db.get_read_session),
-    esdb_client: EventStoreDBClient = Depends(events.get_esdb_client),
+    esdb_client: EventStore = Depends(events.get_esdb_client),
 ):
     """(Issuing Body only) - Withdraw a fixed number of SDRs from the specified Account matching the provided search criteria."""
     sdr_action = StorageAction.create(
@@ -145,7 +150,7 @@ def issue_SDGC(
     sdgc_create: GranularCertificateBundleCreate,
     write_session: Session = Depends(db.get_write_session),
     read_session: Session = Depends(db.get_read_session),
-    esdb_client: EventStoreDBClient = Depends(events.get_esdb_client),
+    esdb_client: EventStore = Depends(events.get_esdb_client),
 ):
     """A GC Bundle that has been issued following the verification of a cancelled GC Bundle and the proper allocation of a pair
     of Storage Charge and Discharge Records. The GC Bundle is issued to the Account of the Storage Device, and is identical to
@@ -153,10 +158,29 @@ def issue_SDGC(
 
     These bundles can be queried using the same GC Bundle query endpoint as regular GC Bundles, but with the additional option to filter
     by the storage_id and the discharging_start_datetime, which is inherited from the allocated SDR.
+
+    As with other GC Bundles, the certificate ID range is allocated by the registry from the next IDs
+    of the Storage Device, according to the bundle quantity.
     """
 
-    sdgc = GranularCertificateBundle.create(
-        sdgc_create, write_session, read_session, esdb_client
-    )
+    with cqrs.unit_of_work(write_session, read_session, esdb_client):
+        first_certificate_id = allocate_certificate_ids(
+            write_session, sdgc_create.device_id, sdgc_create.bundle_quantity
+        )
+        assign_certificate_ids([sdgc_create], first_certificate_id)
+
+        sdgcs = GranularCertificateBundle.create(
+            sdgc_create, write_session, read_session, esdb_client
+        )
+        if not sdgcs:
+            raise HTTPException(status_code=400, detail="Could not create SDGC")
+        record_device_issuance(
+            write_session,
+            sdgc_create.device_id,
+            sdgcs,  # type: ignore
+        )
+
+        # Dumped before the commit expires the bundle
+        sdgc = sdgcs[0].model_dump()
 
     return sdgc
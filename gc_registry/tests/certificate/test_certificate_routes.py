@@ -1,6 +1,6 @@
+import json
 from typing import Any
 
-from esdbclient import EventStoreDBClient
 from fastapi.testclient import TestClient
 from sqlmodel import Session
 
@@ -8,6 +8,7 @@ from gc_registry.account.models import Account
 from gc_registry.account.schemas import AccountUpdate
 from gc_registry.certificate.models import GranularCertificateBundle
 from gc_registry.certificate.services import create_issuance_id
+from gc_registry.core.database.event_store import EventStore
 from gc_registry.user.models import User
 
 
@@ -19,7 +20,7 @@ def test_transfer_certificate(
     fake_db_account_2: Account,
     write_session: Session,
     read_session: Session,
-    esdb_client: EventStoreDBClient,
+    esdb_client: EventStore,
 ):
     # Test case 1: Try to transfer a certificate without target_id
     test_data_1: dict[str, Any] = {
@@ -387,3 +388,124 @@ def test_query_certificate_bundles(
         response.json()["detail"][0]["msg"]
         == "Input should be 'solar_pv', 'wind', 'hydro', 'biomass', 'nuclear', 'electrolysis', 'geothermal', 'battery_storage', 'chp' or 'other'"
     )
+
+
+def test_stream_certificate_bundles(
+    api_client,
+    fake_db_granular_certificate_bundle: GranularCertificateBundle,
+    fake_db_granular_certificate_bundle_2: GranularCertificateBundle,
+    fake_db_user: User,
+    fake_db_account: Account,
+):
+    query: dict[str, Any] = {
+        "source_id": fake_db_account.id,
+        "user_id": fake_db_user.id,
+    }
+
+    response = api_client.post("/certificate/query/stream", json=query)
+
+    assert response.status_code == 202
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["X-Certificate-Bundle-Count"] == "2"
+    assert int(response.headers["X-Total-Certificate-Volume"]) == (
+        fake_db_granular_certificate_bundle.bundle_quantity
+        + fake_db_granular_certificate_bundle_2.bundle_quantity
+    )
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert {row["id"] for row in rows} == {
+        fake_db_granular_certificate_bundle.id,
+        fake_db_granular_certificate_bundle_2.id,
+    }
+
+    # Queries matching no GC Bundles are rejected before streaming, as with /query
+    query["device_id"] = -1
+    response = api_client.post("/certificate/query/stream", json=query)
+
+    assert response.status_code == 422
+
+
+def test_query_certificate_bundles_paged(
+    api_client,
+    fake_db_granular_certificate_bundle: GranularCertificateBundle,
+    fake_db_granular_certificate_bundle_2: GranularCertificateBundle,
+    fake_db_user: User,
+    fake_db_account: Account,
+):
+    query: dict[str, Any] = {
+        "source_id": fake_db_account.id,
+        "user_id": fake_db_user.id,
+    }
+    total_volume = (
+        fake_db_granular_certificate_bundle.bundle_quantity
+        + fake_db_granular_certificate_bundle_2.bundle_quantity
+    )
+    fields = "certificate_bundle_status,bundle_quantity,production_starting_interval"
+
+    # Page through the GC Bundles one at a time, returning only the selected fields
+    bundles = []
+    params: dict[str, Any] = {"limit": 1, "fields": fields}
+    while True:
+        response = api_client.post("/certificate/query", json=query, params=params)
+
+        assert response.status_code == 202
+        # The total is only calculated for the first page
+        assert response.json()["total_certificate_volume"] == (
+            None if "cursor" in params else total_volume
+        )
+
+        page = response.json()["granular_certificate_bundles"]
+        assert len(page) == 1
+        assert set(page[0].keys()) == {"id", *fields.split(",")}
+        bundles.extend(page)
+
+        if response.json()["next_cursor"] is None:
+            break
+        params["cursor"] = response.json()["next_cursor"]
+
+    assert [bundle["id"] for bundle in bundles] == [
+        fake_db_granular_certificate_bundle.id,
+        fake_db_granular_certificate_bundle_2.id,
+    ]
+
+    # Unknown fields, invalid cursors and oversized pages are rejected
+    response = api_client.post(
+        "/certificate/query", json=query, params={"fields": "id,password"}
+    )
+    assert response.status_code == 422
+    assert "password" in response.json()["detail"]
+
+    response = api_client.post(
+        "/certificate/query", json=query, params={"cursor": "not-a-cursor"}
+    )
+    assert response.status_code == 422
+
+    response = api_client.post(
+        "/certificate/query", json=query, params={"limit": 1_000_000}
+    )
+    assert response.status_code == 422
+
+
+def test_create_certificate_bundle_allocates_ids(
+    api_client,
+    fake_db_granular_certificate_bundle: GranularCertificateBundle,
+):
+    certificate_bundle = fake_db_granular_certificate_bundle.model_dump(
+        mode="json", exclude={"id", "created_at"}
+    )
+
+    # Certificate IDs follow on from the existing GC Bundles of the device
+    created_bundles = []
+    for _ in range(2):
+        response = api_client.post("/certificate/create", json=certificate_bundle)
+        assert response.status_code == 201
+        created_bundles.append(response.json())
+
+    assert (
+        created_bundles[0]["certificate_bundle_id_range_start"]
+        == fake_db_granular_certificate_bundle.certificate_bundle_id_range_end + 1
+    )
+    assert (
+        created_bundles[1]["certificate_bundle_id_range_start"]
+        == created_bundles[0]["certificate_bundle_id_range_end"] + 1
+    )
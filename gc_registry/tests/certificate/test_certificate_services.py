@@ -1,15 +1,18 @@
 import datetime
-from typing import Any, Hashable
+from contextlib import AbstractContextManager
+from typing import Any, Callable, Hashable
 
 import pandas as pd
 import pytest
-from esdbclient import EventStoreDBClient
-from sqlmodel import Session
+from sqlmodel import Session, func, select
 
 from gc_registry.account.models import Account
 from gc_registry.account.schemas import AccountUpdate
 from gc_registry.certificate.models import (
+    DeviceIssuanceLedger,
+    DeviceIssuedInterval,
     GranularCertificateBundle,
+    GranularCertificateBundleArchive,
     IssuanceMetaData,
 )
 from gc_registry.certificate.schemas import (
@@ -18,18 +21,28 @@ from gc_registry.certificate.schemas import (
     GranularCertificateTransfer,
 )
 from gc_registry.certificate.services import (
+    allocate_certificate_ids,
+    assign_certificate_ids,
+    create_device_issuance_ledger,
     create_issuance_id,
+    get_certificate_bundle_lineage,
     get_certificate_bundles_by_id,
-    get_max_certificate_id_by_device_id,
-    get_max_certificate_timestamp_by_device_id,
+    get_unissued_periods,
     issuance_id_to_device_and_interval,
     issue_certificates_by_device_in_date_range,
     issue_certificates_in_date_range,
+    issue_certificates_in_date_range_parallel,
+    lock_device_issuance_ledger,
     process_certificate_bundle_action,
     query_certificate_bundles,
     split_certificate_bundle,
 )
-from gc_registry.certificate.validation import validate_granular_certificate_bundle
+from gc_registry.certificate.validation import (
+    validate_granular_certificate_bundle,
+    validate_granular_certificate_bundles,
+)
+from gc_registry.core.database.archive import archive_deleted_certificate_bundles
+from gc_registry.core.database.event_store import EventStore
 from gc_registry.core.models.base import CertificateStatus
 from gc_registry.device.meter_data.elexon.elexon import ElexonClient
 from gc_registry.device.meter_data.manual_submission import ManualSubmissionMeterClient
@@ -44,44 +57,44 @@ from gc_registry.user.models import User
 
 
 class TestCertificateServices:
-    def test_get_max_certificate_id_by_device_id(
-        self,
-        read_session,
-        fake_db_wind_device,
-        fake_db_granular_certificate_bundle,
-    ):
-        max_certificate_id = get_max_certificate_id_by_device_id(
-            read_session, fake_db_wind_device.id
-        )
-        assert (
-            max_certificate_id
-            == fake_db_granular_certificate_bundle.certificate_bundle_id_range_end
-        )
-
-    def test_get_max_certificate_id_by_device_id_no_certificates(
+    def test_create_device_issuance_ledger(
         self,
-        read_session,
-        fake_db_wind_device,
-    ):
-        max_certificate_id = get_max_certificate_id_by_device_id(
-            read_session, fake_db_wind_device.id
-        )
-        assert max_certificate_id is None
-
-    def test_get_max_certificate_timestamp_by_device_id(
-        self,
-        read_session,
-        fake_db_wind_device,
-        fake_db_granular_certificate_bundle,
+        write_session: Session,
+        fake_db_wind_device: Device,
+        fake_db_granular_certificate_bundle: GranularCertificateBundle,
     ):
-        max_certificate_timestamp = get_max_certificate_timestamp_by_device_id(
-            read_session, fake_db_wind_device.id
-        )
-        assert (
-            max_certificate_timestamp
-            == fake_db_granular_certificate_bundle.production_ending_interval
-        )
-        assert isinstance(max_certificate_timestamp, datetime.datetime)
+        # An adjacent bundle, a withdrawn bundle and a bundle after a gap
+        first_start = fake_db_granular_certificate_bundle.production_starting_interval
+        hour = datetime.timedelta(hours=1)
+        for hours_after, status in [
+            (1, CertificateStatus.ACTIVE),
+            (3, CertificateStatus.WITHDRAWN),
+            (5, CertificateStatus.ACTIVE),
+        ]:
+            bundle = GranularCertificateBundle.model_validate(
+                fake_db_granular_certificate_bundle.model_dump(exclude={"id"})
+            )
+            bundle.certificate_bundle_status = status
+            bundle.production_starting_interval = first_start + hours_after * hour
+            bundle.production_ending_interval = first_start + (hours_after + 1) * hour
+            bundle.certificate_bundle_id_range_start += 1000 * hours_after
+            bundle.certificate_bundle_id_range_end += 1000 * hours_after
+            write_session.add(bundle)
+        write_session.flush()
+
+        create_device_issuance_ledger(write_session, fake_db_wind_device.id)
+
+        ledger = write_session.get(DeviceIssuanceLedger, fake_db_wind_device.id)
+        assert ledger is not None
+        assert ledger.max_certificate_id == 5999
+
+        # The gap left by the withdrawn bundle is still to be issued
+        assert get_unissued_periods(
+            write_session,
+            fake_db_wind_device.id,
+            first_start,
+            first_start + 6 * hour,
+        ) == [(first_start + 2 * hour, first_start + 5 * hour)]
 
     def test_issuance_id_to_device_and_interval(
         self,
@@ -124,8 +137,8 @@ class TestCertificateServices:
 
         # Test case 1: certificate already exists for the device in the given period
         # This will fail because the certificate_bundle_id_range_start is not equal to the max_certificate_id + 1
-        device_max_certificate_id = get_max_certificate_id_by_device_id(
-            read_session, granular_certificate_bundle_dict["device_id"]
+        device_max_certificate_id = (
+            fake_db_granular_certificate_bundle.certificate_bundle_id_range_end
         )
 
         with pytest.raises(ValueError) as exc_info:
@@ -196,6 +209,72 @@ class TestCertificateServices:
             max_certificate_id=device_max_certificate_id,
         )
 
+    def test_validate_granular_certificate_bundles(
+        self,
+        read_session,
+        fake_db_wind_device,
+        fake_db_granular_certificate_bundle,
+    ):
+        max_certificate_id = (
+            fake_db_granular_certificate_bundle.certificate_bundle_id_range_end
+        )
+
+        # A run of contiguous hourly bundles following the existing bundle
+        raw_bundles = []
+        range_start = max_certificate_id + 1
+        for hour in range(24):
+            raw_bundle = fake_db_granular_certificate_bundle.model_dump()
+            raw_bundle["production_starting_interval"] += datetime.timedelta(hours=hour)
+            raw_bundle["production_ending_interval"] += datetime.timedelta(hours=hour)
+            raw_bundle["certificate_bundle_id_range_start"] = range_start
+            raw_bundle["certificate_bundle_id_range_end"] = (
+                range_start + raw_bundle["bundle_quantity"] - 1
+            )
+            range_start = raw_bundle["certificate_bundle_id_range_end"] + 1
+            raw_bundles.append(raw_bundle)
+
+        valid_bundles = validate_granular_certificate_bundles(
+            read_session,
+            raw_bundles,
+            is_storage_device=False,
+            max_certificate_id=max_certificate_id,
+        )
+        assert [bundle.certificate_bundle_id_range_end for bundle in valid_bundles] == [
+            raw_bundle["certificate_bundle_id_range_end"] for raw_bundle in raw_bundles
+        ]
+
+        # The batch raises the error of the first bundle that fails when validated
+        # one at a time against the bundles before it
+        def validate_individually(raw_bundles):
+            previous_max_certificate_id = max_certificate_id
+            for raw_bundle in raw_bundles:
+                bundle = validate_granular_certificate_bundle(
+                    read_session,
+                    raw_bundle,
+                    is_storage_device=False,
+                    max_certificate_id=previous_max_certificate_id,
+                )
+                previous_max_certificate_id = bundle.certificate_bundle_id_range_end
+
+        invalidations = [
+            (20, "device_id", -1),
+            (10, "certificate_bundle_id_range_start", max_certificate_id),
+            (5, "bundle_quantity", fake_db_wind_device.capacity * 2),
+        ]
+        for idx, field, value in invalidations:
+            raw_bundles[idx][field] = value
+
+            with pytest.raises(ValueError) as individual_exc_info:
+                validate_individually(raw_bundles)
+            with pytest.raises(ValueError) as batch_exc_info:
+                validate_granular_certificate_bundles(
+                    read_session,
+                    raw_bundles,
+                    is_storage_device=False,
+                    max_certificate_id=max_certificate_id,
+                )
+            assert str(batch_exc_info.value) == str(individual_exc_info.value)
+
     def test_issue_certificates_in_date_range(
         self,
         write_session,
@@ -203,6 +282,7 @@ class TestCertificateServices:
         fake_db_account,
         fake_db_issuance_metadata,
         esdb_client,
+        session_scope,
     ):
         from_datetime = datetime.datetime(2024, 1, 1, 0, 0, 0)
         to_datetime = from_datetime + datetime.timedelta(hours=2)
@@ -238,6 +318,7 @@ class TestCertificateServices:
             esdb_client,
             fake_db_issuance_metadata.id,
             client,
+            session_scope,
         )
 
         assert issued_certificates is not None
@@ -247,7 +328,7 @@ class TestCertificateServices:
         fake_db_granular_certificate_bundle: GranularCertificateBundle,
         write_session: Session,
         read_session: Session,
-        esdb_client: EventStoreDBClient,
+        esdb_client: EventStore,
     ):
         """
         Split the bundle into two and assert that the bundle quantities align post-split,
@@ -284,6 +365,61 @@ class TestCertificateServices:
             == fake_db_granular_certificate_bundle.certificate_bundle_id_range_end
         )
 
+    def test_bundle_lineage_from_archive(
+        self,
+        fake_db_granular_certificate_bundle: GranularCertificateBundle,
+        write_session: Session,
+        read_session: Session,
+        esdb_client: EventStore,
+    ):
+        """
+        Split a bundle twice, archive the deleted parents and assert that the
+        lineage of the remaining bundle is traced through the archive.
+        """
+
+        issued_bundle_id = fake_db_granular_certificate_bundle.id
+        _, child_bundle = split_certificate_bundle(
+            fake_db_granular_certificate_bundle,
+            250,
+            write_session,
+            read_session,
+            esdb_client,
+        )
+        child_bundle_id = child_bundle.id
+        _, grandchild_bundle = split_certificate_bundle(
+            write_session.merge(child_bundle),
+            100,
+            write_session,
+            read_session,
+            esdb_client,
+        )
+
+        # Deleted bundles within the retention window are kept in the bundle table
+        assert archive_deleted_certificate_bundles(write_session, is_read_db=False) == 0
+
+        n_archived = archive_deleted_certificate_bundles(
+            write_session,
+            is_read_db=False,
+            retention_days=0,
+            now=datetime.datetime.now(datetime.timezone.utc)
+            + datetime.timedelta(minutes=1),
+        )
+        assert n_archived == 2
+        assert (
+            get_certificate_bundles_by_id(
+                [issued_bundle_id, child_bundle_id],  # type: ignore
+                write_session,
+            )
+            == []
+        )
+
+        lineage = get_certificate_bundle_lineage(grandchild_bundle, write_session)
+
+        assert [bundle.id for bundle in lineage] == [child_bundle_id, issued_bundle_id]
+        assert all(
+            isinstance(bundle, GranularCertificateBundleArchive) for bundle in lineage
+        )
+
     def test_transfer_gcs(
         self,
         fake_db_account: Account,
@@ -292,7 +428,7 @@ class TestCertificateServices:
         fake_db_granular_certificate_bundle: GranularCertificateBundle,
         write_session: Session,
         read_session: Session,
-        esdb_client: EventStoreDBClient,
+        esdb_client: EventStore,
     ):
         """
         Transfer a fixed number of certificates from one account to another.
@@ -375,7 +511,7 @@ class TestCertificateServices:
         fake_db_granular_certificate_bundle: GranularCertificateBundle,
         write_session: Session,
         read_session: Session,
-        esdb_client: EventStoreDBClient,
+        esdb_client: EventStore,
     ):
         """
         Try to transfer a cancelled certificate bundle
@@ -435,7 +571,7 @@ class TestCertificateServices:
         fake_db_user: User,
         write_session: Session,
         read_session: Session,
-        esdb_client: EventStoreDBClient,
+        esdb_client: EventStore,
     ):
         """
         Cancel 75% of the bundle, and assert that the bundle was correctly
@@ -546,7 +682,8 @@ class TestCertificateServices:
         read_session: Session,
         fake_db_wind_device: Device,
         fake_db_issuance_metadata: IssuanceMetaData,
-        esdb_client: EventStoreDBClient,
+        esdb_client: EventStore,
+        session_scope: Callable[[str], AbstractContextManager[Session]],
     ):
         measurement_json = serialise_measurement_csv(
             "gc_registry/tests/data/test_measurements.csv"
@@ -585,6 +722,7 @@ class TestCertificateServices:
             esdb_client,
             fake_db_issuance_metadata.id,
             client,
+            session_scope,
         )
 
         assert issued_certificates is not None
@@ -596,6 +734,340 @@ class TestCertificateServices:
             == measurement_df["interval_usage"].sum()
         ), "Incorrect total certificate quantity issued."
 
+    def test_issue_certificates_backfills_unissued_periods(
+        self,
+        write_session: Session,
+        read_session: Session,
+        fake_db_wind_device: Device,
+        fake_db_issuance_metadata: IssuanceMetaData,
+        esdb_client: EventStore,
+        session_scope: Callable[[str], AbstractContextManager[Session]],
+    ):
+        measurement_df: pd.DataFrame = parse_measurement_json(
+            serialise_measurement_csv("gc_registry/tests/data/test_measurements.csv"),
+            to_df=True,
+        )
+        measurement_df["device_id"] = fake_db_wind_device.id
+        MeasurementReport.create(
+            measurement_df.to_dict(orient="records"),
+            write_session,
+            read_session,
+            esdb_client,
+        )
+
+        def issue(from_datetime, to_datetime):
+            return issue_certificates_by_device_in_date_range(
+                fake_db_wind_device,
+                from_datetime,
+                to_datetime,
+                write_session,
+                read_session,
+                esdb_client,
+                fake_db_issuance_metadata.id,  # type: ignore
+                ManualSubmissionMeterClient(),
+                session_scope,
+            )
+
+        # Issue the middle of the month first, leaving a gap before it
+        month_start = datetime.datetime(2024, 1, 1, 0, 0, 0)
+        month_end = month_start + datetime.timedelta(days=31)
+        issued_certificates = issue(
+            month_start + datetime.timedelta(days=10),
+            month_start + datetime.timedelta(days=20),
+        )
+        assert issued_certificates is not None
+        assert len(issued_certificates) == 24 * 10
+
+        assert get_unissued_periods(
+            write_session, fake_db_wind_device.id, month_start, month_end
+        ) == [
+            (month_start, month_start + datetime.timedelta(days=10)),
+            (month_start + datetime.timedelta(days=20), month_end),
+        ]
+
+        # Issuing the whole month backfills the gap before the issued period
+        issued_certificates = issue(month_start, month_end)
+        assert issued_certificates is not None
+        assert len(issued_certificates) == 24 * 21
+        assert (
+            min(
+                cert.production_starting_interval  # type: ignore
+                for cert in issued_certificates
+            )
+            == month_start
+        )
+
+        ledger = lock_device_issuance_ledger(write_session, fake_db_wind_device.id)
+        assert (
+            ledger.max_certificate_id
+            == write_session.exec(
+                select(
+                    func.max(GranularCertificateBundle.certificate_bundle_id_range_end)
+                ).where(GranularCertificateBundle.device_id == fake_db_wind_device.id)
+            ).one()
+        )
+        assert (
+            get_unissued_periods(
+                write_session, fake_db_wind_device.id, month_start, month_end
+            )
+            == []
+        )
+        assert issue(month_start, month_end) is None
+
+    def test_allocate_certificate_ids(
+        self,
+        write_session: Session,
+        fake_db_granular_certificate_bundle: GranularCertificateBundle,
+    ):
+        device_id = fake_db_granular_certificate_bundle.device_id
+
+        # The first allocation continues from the existing GC Bundles of the device
+        first_block_start = allocate_certificate_ids(write_session, device_id, 100)
+        assert (
+            first_block_start
+            == fake_db_granular_certificate_bundle.certificate_bundle_id_range_end + 1
+        )
+
+        # Later blocks follow on without overlapping
+        second_block_start = allocate_certificate_ids(write_session, device_id, 50)
+        assert second_block_start == first_block_start + 100
+
+        bundles = [
+            GranularCertificateBundle.model_validate(
+                {
+                    **fake_db_granular_certificate_bundle.model_dump(),
+                    "bundle_quantity": 20,
+                }
+            )
+            for _ in range(3)
+        ]
+        assign_certificate_ids(bundles, second_block_start)
+        assert [
+            (
+                bundle.certificate_bundle_id_range_start,
+                bundle.certificate_bundle_id_range_end,
+            )
+            for bundle in bundles
+        ] == [
+            (second_block_start, second_block_start + 19),
+            (second_block_start + 20, second_block_start + 39),
+            (second_block_start + 40, second_block_start + 59),
+        ]
+
+    def test_issue_certificates_leaves_meter_data_gaps_unissued(
+        self,
+        write_session: Session,
+        read_session: Session,
+        fake_db_wind_device: Device,
+        fake_db_issuance_metadata: IssuanceMetaData,
+        esdb_client: EventStore,
+        session_scope: Callable[[str], AbstractContextManager[Session]],
+    ):
+        measurement_df: pd.DataFrame = parse_measurement_json(
+            serialise_measurement_csv("gc_registry/tests/data/test_measurements.csv"),
+            to_df=True,
+        )
+        measurement_df["device_id"] = fake_db_wind_device.id
+
+        # Leave a hole in the meter data inside the issued period
+        month_start = datetime.datetime(2024, 1, 1, 0, 0, 0)
+        hole_start = month_start + datetime.timedelta(days=5, hours=10)
+        hole_end = hole_start + datetime.timedelta(hours=4)
+        interval_starts = pd.to_datetime(measurement_df["interval_start_datetime"])
+        measurement_df = measurement_df[
+            (interval_starts < hole_start) | (interval_starts >= hole_end)
+        ]
+        MeasurementReport.create(
+            measurement_df.to_dict(orient="records"),
+            write_session,
+            read_session,
+            esdb_client,
+        )
+
+        month_end = month_start + datetime.timedelta(days=31)
+        issued_certificates = issue_certificates_by_device_in_date_range(
+            fake_db_wind_device,
+            month_start,
+            month_end,
+            write_session,
+            read_session,
+            esdb_client,
+            fake_db_issuance_metadata.id,  # type: ignore
+            ManualSubmissionMeterClient(),
+            session_scope,
+        )
+        assert issued_certificates is not None
+        assert len(issued_certificates) == 24 * 31 - 4
+
+        # The hole is offered for issuance again once its meter data arrives
+        assert get_unissued_periods(
+            write_session, fake_db_wind_device.id, month_start, month_end
+        ) == [(hole_start, hole_end)]
+
+    def test_issue_certificates_skips_partially_concurrent_issuance(
+        self,
+        write_session: Session,
+        read_session: Session,
+        fake_db_wind_device: Device,
+        fake_db_issuance_metadata: IssuanceMetaData,
+        esdb_client: EventStore,
+        session_scope: Callable[[str], AbstractContextManager[Session]],
+    ):
+        measurement_df: pd.DataFrame = parse_measurement_json(
+            serialise_measurement_csv("gc_registry/tests/data/test_measurements.csv"),
+            to_df=True,
+        )
+        measurement_df["device_id"] = fake_db_wind_device.id
+        MeasurementReport.create(
+            measurement_df.to_dict(orient="records"),
+            write_session,
+            read_session,
+            esdb_client,
+        )
+
+        month_start = datetime.datetime(2024, 1, 1, 0, 0, 0)
+        month_end = month_start + datetime.timedelta(days=31)
+        concurrent_start = month_start + datetime.timedelta(days=10)
+        concurrent_end = month_start + datetime.timedelta(days=20)
+
+        class ConcurrentlyIssuedMeterClient(ManualSubmissionMeterClient):
+            def get_metering_by_device_in_datetime_range(self, *args, **kwargs):
+                # Another issuance covers part of the period whilst it is fetched
+                write_session.add(
+                    DeviceIssuedInterval(
+                        device_id=fake_db_wind_device.id,
+                        interval_start=concurrent_start,
+                        interval_end=concurrent_end,
+                    )
+                )
+                write_session.flush()
+                return super().get_metering_by_device_in_datetime_range(*args, **kwargs)
+
+        issued_certificates = issue_certificates_by_device_in_date_range(
+            fake_db_wind_device,
+            month_start,
+            month_end,
+            write_session,
+            read_session,
+            esdb_client,
+            fake_db_issuance_metadata.id,  # type: ignore
+            ConcurrentlyIssuedMeterClient(),
+            session_scope,
+        )
+
+        # Only the part of the period left unissued is issued and recorded
+        assert issued_certificates is not None
+        assert len(issued_certificates) == 24 * 21
+        assert not any(
+            concurrent_start <= cert.production_starting_interval < concurrent_end  # type: ignore
+            for cert in issued_certificates
+        )
+        assert (
+            get_unissued_periods(
+                write_session, fake_db_wind_device.id, month_start, month_end
+            )
+            == []
+        )
+
+    def test_issue_certificates_leaves_caller_session_uncommitted(
+        self,
+        write_session: Session,
+        read_session: Session,
+        fake_db_wind_device: Device,
+        fake_db_issuance_metadata: IssuanceMetaData,
+        esdb_client: EventStore,
+        session_scope: Callable[[str], AbstractContextManager[Session]],
+    ):
+        with session_scope("db_write") as caller_session:
+            caller_session.add(
+                MeasurementReport(
+                    device_id=fake_db_wind_device.id,
+                    interval_usage=10,
+                    interval_start_datetime=datetime.datetime(2023, 1, 1, 0, 0, 0),
+                    interval_end_datetime=datetime.datetime(2023, 1, 1, 1, 0, 0),
+                    gross_net_indicator="NET",
+                )
+            )
+
+            # Without meter data nothing is issued, and the ledger is created on
+            # its own session rather than by committing that of the caller
+            from_datetime = datetime.datetime(2024, 1, 1, 0, 0, 0)
+            issued_certificates = issue_certificates_by_device_in_date_range(
+                fake_db_wind_device,
+                from_datetime,
+                from_datetime + datetime.timedelta(days=1),
+                caller_session,
+                read_session,
+                esdb_client,
+                fake_db_issuance_metadata.id,  # type: ignore
+                ManualSubmissionMeterClient(),
+                session_scope,
+            )
+            assert issued_certificates is None
+
+            caller_session.rollback()
+
+        assert (
+            write_session.exec(
+                select(MeasurementReport).where(
+                    MeasurementReport.device_id == fake_db_wind_device.id
+                )
+            ).first()
+            is None
+        )
+
+    def test_issue_certificates_in_date_range_parallel(
+        self,
+        write_session: Session,
+        read_session: Session,
+        fake_db_wind_device: Device,
+        fake_db_solar_device: Device,
+        fake_db_issuance_metadata: IssuanceMetaData,
+        esdb_client: EventStore,
+        session_scope: Callable[[str], AbstractContextManager[Session]],
+    ):
+        measurement_df: pd.DataFrame = parse_measurement_json(
+            serialise_measurement_csv("gc_registry/tests/data/test_measurements.csv"),
+            to_df=True,
+        )
+        measurement_df["device_id"] = fake_db_wind_device.id
+        MeasurementReport.create(
+            measurement_df.to_dict(orient="records"),
+            write_session,
+            read_session,
+            esdb_client,
+        )
+
+        class FailingSolarMeterClient(ManualSubmissionMeterClient):
+            def get_metering_by_device_in_datetime_range(self, *args, **kwargs):
+                if args[2] == fake_db_solar_device.id:
+                    raise ValueError("Meter data unavailable")
+                return super().get_metering_by_device_in_datetime_range(*args, **kwargs)
+
+        # Each device is issued to on its own sessions, joined to the test
+        # transactions through savepoints so that a failing device is rolled back
+        # alone. The sessions share the test connections, so issue on one thread
+        from_datetime = datetime.datetime(2024, 1, 1, 0, 0, 0)
+        issuance_reports = issue_certificates_in_date_range_parallel(
+            from_datetime,
+            from_datetime + datetime.timedelta(days=31),
+            esdb_client,
+            fake_db_issuance_metadata.id,  # type: ignore
+            FailingSolarMeterClient(),
+            session_scope=session_scope,
+            max_workers=1,
+        )
+
+        reports_by_device = {report.device_id: report for report in issuance_reports}
+        assert reports_by_device[fake_db_wind_device.id].status == "issued"
+        assert reports_by_device[fake_db_wind_device.id].n_bundles == 24 * 31
+
+        # The failing device is reported without stopping issuance to the others
+        assert reports_by_device[fake_db_solar_device.id].status == "failed"
+        assert (
+            reports_by_device[fake_db_solar_device.id].error == "Meter data unavailable"
+        )
+
     def test_issue_certificates_from_elexon(
         self,
         write_session: Session,
@@ -603,7 +1075,8 @@ class TestCertificateServices:
         fake_db_account: Account,
         fake_db_wind_device: Device,
         fake_db_issuance_metadata: IssuanceMetaData,
-        esdb_client: EventStoreDBClient,
+        esdb_client: EventStore,
+        session_scope: Callable[[str], AbstractContextManager[Session]],
     ):
         from_datetime = datetime.datetime(2024, 1, 1, 0, 0, 0)
         to_datetime = from_datetime + datetime.timedelta(hours=4)
@@ -654,6 +1127,7 @@ class TestCertificateServices:
             esdb_client,
             fake_db_issuance_metadata.id,
             client,  # type: ignore
+            session_scope,
         )
 
         assert issued_certificates is not None
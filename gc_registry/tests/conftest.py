@@ -1,12 +1,14 @@
 import os
-from typing import Generator
+from contextlib import AbstractContextManager, nullcontext
+from typing import Callable, Generator
 
 import pytest
 from dotenv import load_dotenv
-from esdbclient import EventStoreDBClient, NewEvent, StreamState
+from esdbclient import NewEvent, StreamState
 from sqlalchemy import create_engine
 from sqlalchemy.engine.base import Engine
 from sqlmodel import Session, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 from starlette.testclient import TestClient
 from testcontainers.core.container import DockerContainer  # type: ignore
 from testcontainers.core.waiting_utils import wait_for_logs  # type: ignore
@@ -17,7 +19,8 @@ from gc_registry.certificate.models import (
     GranularCertificateBundle,
     IssuanceMetaData,
 )
-from gc_registry.core.database import db, events
+from gc_registry.core.database import cqrs, db, events
+from gc_registry.core.database.event_store import ESDBEventStore, EventStore
 from gc_registry.core.models.base import (
     CertificateStatus,
     DeviceTechnologyType,
@@ -37,7 +40,7 @@ load_dotenv()
 
 @pytest.fixture()
 def api_client(
-    write_session: Session, read_session: Session, esdb_client: EventStoreDBClient
+    write_session: Session, read_session: Session, esdb_client: EventStore
 ) -> Generator[TestClient, None, None]:
     """API Client for testing routes"""
 
@@ -55,12 +58,31 @@ def api_client(
             "read": read_session,
         }
 
+    # Async routes run on the same transactional sessions, so that they see the
+    # uncommitted fixture data and their changes are rolled back with the test
+    async def get_async_write_session_override():
+        yield AsyncSession(sync_session_class=lambda **_: write_session)
+
+    async def get_async_read_session_override():
+        yield AsyncSession(sync_session_class=lambda **_: read_session)
+
+    def get_session_scope_override():
+        sessions = {"db_write": write_session, "db_read": read_session}
+        return lambda target: nullcontext(sessions[target])
+
     def get_esdb_client_override():
         return esdb_client
 
     # Set dependency overrides
     app.dependency_overrides[db.get_write_session] = get_write_session_override
     app.dependency_overrides[db.get_read_session] = get_read_session_override
+    app.dependency_overrides[db.get_async_write_session] = (
+        get_async_write_session_override
+    )
+    app.dependency_overrides[db.get_async_read_session] = (
+        get_async_read_session_override
+    )
+    app.dependency_overrides[db.get_session_scope] = get_session_scope_override
     app.dependency_overrides[db.get_db_name_to_client] = get_db_name_to_client_override
     app.dependency_overrides[events.get_esdb_client] = get_esdb_client_override
 
@@ -184,14 +206,35 @@ def read_session(read_engine: Engine) -> Generator[Session, None, None]:
     connection.close()
 
 
+@pytest.fixture(scope="function")
+def session_scope(
+    write_session: Session, read_session: Session
+) -> Callable[[str], AbstractContextManager[Session]]:
+    """Opens sessions joined to the test transactions through savepoints, so that
+    code committing its own short transactions sees, and is rolled back with, the
+    uncommitted fixture data."""
+
+    connections = {
+        "db_write": write_session.connection(),
+        "db_read": read_session.connection(),
+    }
+
+    return lambda target: Session(
+        bind=connections[target], join_transaction_mode="create_savepoint"
+    )
+
+
 @pytest.fixture(scope="session")
-def esdb_client() -> Generator[EventStoreDBClient, None, None]:
-    """Returns an instance of the EventStoreDBClient that rolls back the event
-    stream after each test.
+def esdb_client() -> Generator[EventStore, None, None]:
+    """Returns an event store client that rolls back the event stream after each
+    test, using an in-process event store rather than an EventStoreDB container when
+    EVENT_STORE_BACKEND is set to "memory".
     """
-    uri = get_esdb_url()
+    if settings.EVENT_STORE_BACKEND == "memory":
+        client = events.create_esdb_client()
+    else:
+        client = ESDBEventStore(uri=get_esdb_url())
 
-    client = EventStoreDBClient(uri=uri)
     client.append_event(
         stream_name="events",
         event=NewEvent(type="init", data=b"test_data"),
@@ -218,6 +261,8 @@ def add_entity_to_write_and_read(
 
     # read_entity = read_session.merge(read_entity)
     read_session.add(read_entity)
+    read_session.flush()
+    cqrs.project_read_models([read_entity], read_session)
     read_session.commit()
     read_session.refresh(read_entity)
 
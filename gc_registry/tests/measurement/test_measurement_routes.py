@@ -1,6 +1,12 @@
 import json
 
 import pytest
+from sqlmodel import Session
+
+from gc_registry.core.database.event_store import EventStore
+from gc_registry.device.models import Device
+from gc_registry.measurement.models import MeasurementReport
+from gc_registry.settings import settings
 
 
 @pytest.fixture
@@ -50,3 +56,39 @@ def test_submit_readings_success(
     assert response_data["total_usage_per_device"] == {"1": 25, "2": 20}
     assert response_data["first_reading_datetime"] == "2024-11-18T10:00:00"
     assert response_data["last_reading_datetime"] == "2024-11-18T12:00:00"
+
+
+def test_update_measurement_not_yet_projected(
+    api_client,
+    write_session: Session,
+    read_session: Session,
+    esdb_client: EventStore,
+    fake_db_wind_device: Device,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Test that a measurement report can be updated before it reaches the read DB."""
+
+    monkeypatch.setattr(settings, "READ_MODEL_MODE", "projected")
+    measurement_reports = MeasurementReport.create(
+        {
+            "device_id": fake_db_wind_device.id,
+            "interval_usage": 10,
+            "interval_start_datetime": "2024-11-18T10:00:00",
+            "interval_end_datetime": "2024-11-18T11:00:00",
+            "gross_net_indicator": "NET",
+        },
+        write_session,
+        read_session,
+        esdb_client,
+    )
+    assert measurement_reports is not None
+    measurement_id = measurement_reports[0].id
+    assert read_session.get(MeasurementReport, measurement_id) is None
+
+    response = api_client.patch(
+        f"measurement/update/{measurement_id}",
+        json={"interval_end_datetime": "2024-11-18T10:30:00"},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["interval_end_datetime"] == "2024-11-18T10:30:00"
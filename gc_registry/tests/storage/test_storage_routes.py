@@ -0,0 +1,30 @@
+from fastapi.testclient import TestClient
+
+from gc_registry.certificate.models import GranularCertificateBundle
+
+
+def test_issue_sdgc_allocates_ids(
+    api_client: TestClient,
+    fake_db_granular_certificate_bundle: GranularCertificateBundle,
+):
+    sdgc = fake_db_granular_certificate_bundle.model_dump(
+        mode="json", exclude={"id", "created_at"}
+    )
+    sdgc["is_storage"] = True
+
+    # Client-supplied certificate IDs are replaced by those allocated to the device
+    sdgc["certificate_bundle_id_range_start"] = 1
+    sdgc["certificate_bundle_id_range_end"] = sdgc["bundle_quantity"]
+
+    response = api_client.post("/storage/issue_sdgc", json=sdgc)
+
+    assert response.status_code == 200
+    assert (
+        response.json()["certificate_bundle_id_range_start"]
+        == fake_db_granular_certificate_bundle.certificate_bundle_id_range_end + 1
+    )
+    assert (
+        response.json()["certificate_bundle_id_range_end"]
+        == fake_db_granular_certificate_bundle.certificate_bundle_id_range_end
+        + sdgc["bundle_quantity"]
+    )
@@ -1,16 +1,53 @@
+import asyncio
+import datetime
 import json
+import threading
 
-from esdbclient import EventStoreDBClient
+import pytest
+from esdbclient import NewEvent, StreamState
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from gc_registry.account.models import Account
+from gc_registry.account.schemas import AccountUpdate
+from gc_registry.certificate.models import (
+    GranularCertificateBundle,
+    GranularCertificateBundleArchive,
+    GranularCertificateBundleReadModel,
+    GranularCertificateBundleUpdate,
+)
+from gc_registry.core.database.archive import archive_deleted_certificate_bundles
 from gc_registry.core.database.cqrs import (
+    bulk_update_database_entities,
+    bulk_write_to_database,
     delete_database_entities,
+    unit_of_work,
+    unit_of_work_async,
     update_database_entity,
     write_to_database,
+    write_to_database_async,
+)
+from gc_registry.core.database.event_store import EventStore, InMemoryEventStore
+from gc_registry.core.database.events import (
+    ENTITY_STREAMS_PROJECTION_NAME,
+    create_esdb_event,
+    ensure_entity_streams_projection,
+    entity_link_streams,
+)
+from gc_registry.core.database.projector import (
+    ReadModelProjector,
+    apply_events_to_read_model,
+    get_checkpoint,
+)
+from gc_registry.core.database.rebuild import (
+    get_entity_names,
+    rebuild_checkpoint_name,
+    rebuild_entity_type,
 )
+from gc_registry.core.models.base import EventTypes
 from gc_registry.device.models import Device, DeviceUpdate
-from gc_registry.user.models import User
+from gc_registry.settings import settings
+from gc_registry.user.models import User, UserUpdate
 
 
 class TestCQRS:
@@ -21,7 +58,7 @@ class TestCQRS:
         fake_db_wind_device: Device,
         fake_db_account: Account,
         fake_db_user: User,
-        esdb_client: EventStoreDBClient,
+        esdb_client: EventStore,
     ):
         device_dict = {
             "device_name": "fake_wind_device_2",
@@ -96,13 +133,66 @@ class TestCQRS:
         if user is not None:
             assert user == fake_db_user
 
+    def test_bulk_create_entities(
+        self,
+        write_session: Session,
+        read_session: Session,
+        fake_db_account: Account,
+        esdb_client: EventStore,
+    ):
+        devices = [
+            Device.model_validate(
+                {
+                    "device_name": f"fake_bulk_device_{idx}",
+                    "meter_data_id": f"BULK-{idx}",
+                    "grid": "fake_grid",
+                    "energy_source": "wind",
+                    "technology_type": "wind",
+                    "capacity": 3000,
+                    "account_id": fake_db_account.id,
+                    "location": "USA",
+                    "operational_date": "2020-01-01",
+                    "peak_demand": 100,
+                    "is_storage": False,
+                }
+            )
+            for idx in range(3)
+        ]
+
+        created_entities = bulk_write_to_database(
+            entities=devices,
+            write_session=write_session,
+            read_session=read_session,
+            esdb_client=esdb_client,
+        )
+
+        assert created_entities is not None
+        assert len(created_entities) == 3
+        assert [entity.device_name for entity in created_entities] == [  # type: ignore
+            device.device_name for device in devices
+        ]
+
+        # Each entity receives its own CREATE event, in insertion order
+        events = esdb_client.get_stream("events", backwards=True, limit=3)
+        event_entity_ids = [json.loads(event.data)["entity_id"] for event in events]
+
+        assert all(event.type == "CREATE" for event in events)
+        assert event_entity_ids[::-1] == [entity.id for entity in created_entities]  # type: ignore
+
+        # The read database holds the same rows as the write database
+        for created_entity in created_entities:
+            write_device = write_session.get(Device, created_entity.id)  # type: ignore
+            read_device = read_session.get(Device, created_entity.id)  # type: ignore
+            assert write_device is not None and read_device is not None
+            assert read_device.device_name == write_device.device_name
+
     def test_update_entity(
         self,
         write_session: Session,
         read_session: Session,
         fake_db_wind_device: Device,
         fake_db_account: Account,
-        esdb_client: EventStoreDBClient,
+        esdb_client: EventStore,
     ):
         # Get the existing device from the database
         assert fake_db_wind_device.id is not None
@@ -135,13 +225,87 @@ class TestCQRS:
         if wind_device is not None:
             assert wind_device.device_name == "new_fake_wind_device"
 
+    def test_bulk_update_entities(
+        self,
+        write_session: Session,
+        read_session: Session,
+        fake_db_wind_device: Device,
+        fake_db_solar_device: Device,
+        esdb_client: EventStore,
+    ):
+        assert fake_db_wind_device.id is not None
+        assert fake_db_solar_device.id is not None
+        existing_entities = [
+            Device.by_id(fake_db_wind_device.id, write_session),
+            Device.by_id(fake_db_solar_device.id, write_session),
+        ]
+
+        updated_entities = bulk_update_database_entities(
+            entities=existing_entities,  # type: ignore
+            update_entity=DeviceUpdate(grid="new_fake_grid"),
+            write_session=write_session,
+            read_session=read_session,
+            esdb_client=esdb_client,
+        )
+
+        assert updated_entities is not None
+        assert {entity.id for entity in updated_entities} == {  # type: ignore
+            fake_db_wind_device.id,
+            fake_db_solar_device.id,
+        }
+
+        # One UPDATE event per entity, each recording its own before-values
+        events = esdb_client.get_stream("events", backwards=True, limit=2)
+        events_by_id = {
+            json.loads(event.data)["entity_id"]: json.loads(event.data)
+            for event in events
+        }
+
+        assert all(event.type == "UPDATE" for event in events)
+        for device in [fake_db_wind_device, fake_db_solar_device]:
+            assert events_by_id[device.id]["attributes_before"] == {"grid": "fake_grid"}
+            assert events_by_id[device.id]["attributes_after"] == {
+                "grid": "new_fake_grid"
+            }
+
+            read_device = read_session.get(Device, device.id)
+            assert read_device is not None
+            assert read_device.grid == "new_fake_grid"
+
+    def test_bulk_update_missing_entity(
+        self,
+        write_session: Session,
+        read_session: Session,
+        fake_db_wind_device: Device,
+        esdb_client: EventStore,
+    ):
+        assert fake_db_wind_device.id is not None
+        existing_entity = Device.by_id(fake_db_wind_device.id, write_session)
+        missing_entity = Device.model_validate(
+            fake_db_wind_device.model_dump() | {"id": fake_db_wind_device.id + 1000}
+        )
+        n_events_before = len(esdb_client.get_stream("events"))
+
+        # No entity is updated if any of them cannot be locked on the write DB
+        with pytest.raises(ValueError, match="missing from the write DB"):
+            with unit_of_work(write_session, read_session, esdb_client):
+                bulk_update_database_entities(
+                    entities=[existing_entity, missing_entity],  # type: ignore
+                    update_entity=DeviceUpdate(grid="new_fake_grid"),
+                    write_session=write_session,
+                    read_session=read_session,
+                    esdb_client=esdb_client,
+                )
+
+        assert len(esdb_client.get_stream("events")) == n_events_before
+
     def test_delete_entity(
         self,
         write_session: Session,
         read_session: Session,
         fake_db_wind_device: Device,
         fake_db_account: Account,
-        esdb_client: EventStoreDBClient,
+        esdb_client: EventStore,
     ):
         # Get the existing device from the database
         assert fake_db_wind_device.id is not None
@@ -167,3 +331,444 @@ class TestCQRS:
 
         if wind_device is not None:
             assert wind_device.is_deleted is True
+
+    def test_unit_of_work(
+        self,
+        write_session: Session,
+        read_session: Session,
+        fake_db_wind_device: Device,
+        esdb_client: EventStore,
+    ):
+        assert fake_db_wind_device.id is not None
+        existing_entity = Device.by_id(fake_db_wind_device.id, write_session)
+        n_events_before = len(esdb_client.get_stream("events"))
+
+        with unit_of_work(write_session, read_session, esdb_client):
+            update_database_entity(
+                entity=existing_entity,
+                update_entity=DeviceUpdate(device_name="uow_device_name"),
+                write_session=write_session,
+                read_session=read_session,
+                esdb_client=esdb_client,
+            )
+            delete_database_entities(
+                entities=existing_entity,
+                write_session=write_session,
+                read_session=read_session,
+                esdb_client=esdb_client,
+            )
+
+            # Events are held back until the unit of work completes
+            assert len(esdb_client.get_stream("events")) == n_events_before
+
+        events = esdb_client.get_stream("events", stream_position=n_events_before)
+        assert [event.type for event in events] == ["UPDATE", "DELETE"]
+
+        read_device = read_session.get(Device, fake_db_wind_device.id)
+        assert read_device is not None
+        assert read_device.device_name == "uow_device_name"
+        assert read_device.is_deleted is True
+
+    def test_unit_of_work_rollback(
+        self,
+        write_session: Session,
+        read_session: Session,
+        fake_db_account: Account,
+        esdb_client: EventStore,
+    ):
+        n_events_before = len(esdb_client.get_stream("events"))
+        user = User.model_validate(
+            {
+                "name": "uow_user",
+                "primary_contact": "uow@fakecorp.com",
+                "roles": ["admin"],
+            }
+        )
+
+        with pytest.raises(ValueError):
+            with unit_of_work(write_session, read_session, esdb_client):
+                created_entities = write_to_database(
+                    entities=user,
+                    write_session=write_session,
+                    read_session=read_session,
+                    esdb_client=esdb_client,
+                )
+                assert created_entities is not None
+                raise ValueError("Action failed after the write")
+
+        # Neither database nor the event stream retain the partial action
+        assert (
+            write_session.exec(select(User).where(User.name == "uow_user")).first()
+            is None
+        )
+        assert (
+            read_session.exec(select(User).where(User.name == "uow_user")).first()
+            is None
+        )
+        assert len(esdb_client.get_stream("events")) == n_events_before
+
+    def test_async_helpers(
+        self,
+        write_session: Session,
+        read_session: Session,
+        esdb_client: EventStore,
+    ):
+        """The async helpers and ActiveRecord methods write through the sessions
+        proxied by the async sessions, publishing the same events."""
+
+        async_write_session = AsyncSession(sync_session_class=lambda **_: write_session)
+        async_read_session = AsyncSession(sync_session_class=lambda **_: read_session)
+
+        async def create_and_update_account() -> int:
+            async with unit_of_work_async(
+                async_write_session, async_read_session, esdb_client
+            ):
+                created_accounts = await write_to_database_async(
+                    Account(account_name="Async Account", user_ids=[]),
+                    async_write_session,
+                    async_read_session,
+                    esdb_client,
+                )
+                assert created_accounts is not None
+                account_id = created_accounts[0].id  # type: ignore
+
+                account = await Account.by_id_async(account_id, async_write_session)
+                await account.update_async(
+                    AccountUpdate(account_name="Async Account UPDATED"),
+                    async_write_session,
+                    async_read_session,
+                    esdb_client,
+                )
+
+            return account_id
+
+        account_id = asyncio.run(create_and_update_account())
+
+        read_account = read_session.get(Account, account_id)
+        assert read_account is not None
+        assert read_account.account_name == "Async Account UPDATED"
+
+        events = esdb_client.get_stream("events", backwards=True, limit=2)
+        assert [event.type for event in events] == ["UPDATE", "CREATE"]
+        assert all(
+            json.loads(event.data)["entity_id"] == account_id for event in events
+        )
+
+    def test_projected_read_model(
+        self,
+        write_session: Session,
+        read_session: Session,
+        fake_db_account: Account,
+        esdb_client: EventStore,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        monkeypatch.setattr(settings, "READ_MODEL_MODE", "projected")
+        n_events_before = len(esdb_client.get_stream("events"))
+
+        user = User.model_validate(
+            {
+                "name": "projected_user",
+                "primary_contact": "projected@fakecorp.com",
+                "roles": ["admin"],
+            }
+        )
+        created_entities = write_to_database(
+            user, write_session, read_session, esdb_client
+        )
+        assert created_entities is not None
+        user_id = created_entities[0].id
+
+        update_database_entity(
+            entity=created_entities[0],
+            update_entity=UserUpdate(name="projected_user_updated"),
+            write_session=write_session,
+            read_session=read_session,
+            esdb_client=esdb_client,
+        )
+
+        # The read DB is only updated once the events have been projected
+        assert read_session.get(User, user_id) is None
+
+        recorded_events = esdb_client.get_stream(
+            "events", stream_position=n_events_before
+        )
+        checkpoint = apply_events_to_read_model(list(recorded_events), read_session)
+
+        assert checkpoint == recorded_events[-1].stream_position
+        assert get_checkpoint(read_session) == checkpoint
+
+        read_user = read_session.get(User, user_id)
+        assert read_user is not None
+        assert read_user.name == "projected_user_updated"
+        assert read_user.primary_contact == "projected@fakecorp.com"
+
+        # Replaying an already applied batch leaves the read model unchanged
+        apply_events_to_read_model(list(recorded_events), read_session)
+        read_session.refresh(read_user)
+        assert read_user.name == "projected_user_updated"
+
+    def test_projector_skips_unknown_entity_types(
+        self, read_session: Session, fake_db_account: Account
+    ):
+        esdb_client = InMemoryEventStore()
+        esdb_client.append_to_stream(
+            "events",
+            current_version=StreamState.NO_STREAM,
+            events=[
+                create_esdb_event(
+                    entity_id=1,
+                    entity_name="RenamedAccount",
+                    event_type=EventTypes.UPDATE,
+                    attributes_after={"account_name": "renamed_account"},
+                ),
+                create_esdb_event(
+                    entity_id=fake_db_account.id,  # type: ignore
+                    entity_name="Account",
+                    event_type=EventTypes.UPDATE,
+                    attributes_after={"account_name": "projected_account"},
+                ),
+            ],
+        )
+
+        # The event for the unknown entity type is skipped, not left to block the
+        # projector, and the checkpoint advances past it
+        checkpoint = apply_events_to_read_model(
+            list(esdb_client.get_stream("events")), read_session
+        )
+        assert checkpoint == 1
+
+        read_session.expire_all()
+        read_account = read_session.get(Account, fake_db_account.id)
+        assert read_account is not None
+        assert read_account.account_name == "projected_account"
+
+    def test_projector_resubscribes(self, read_session: Session):
+        class DroppingEventStore(InMemoryEventStore):
+            """Drops the first subscription after its first event."""
+
+            n_subscriptions = 0
+
+            def subscribe_to_stream(
+                self, stream_name, *, stream_position=None, **kwargs
+            ):
+                self.n_subscriptions += 1
+                subscription = super().subscribe_to_stream(
+                    stream_name, stream_position=stream_position, **kwargs
+                )
+                if self.n_subscriptions > 1:
+                    return subscription
+
+                def drop_after_first_event():
+                    yield next(subscription)
+                    raise ConnectionError("Subscription dropped")
+
+                return drop_after_first_event()  # type: ignore
+
+        esdb_client = DroppingEventStore()
+        esdb_client.append_to_stream(
+            "events",
+            current_version=StreamState.NO_STREAM,
+            events=[NewEvent(type="init", data=b"test_data") for _ in range(3)],
+        )
+
+        projector = ReadModelProjector(
+            read_session, esdb_client, resubscribe_backoff_seconds=0.01
+        )
+        subscriber = threading.Thread(
+            target=projector._subscribe, args=(None,), daemon=True
+        )
+        subscriber.start()
+
+        # Each event is received once, resuming after the last event received
+        stream_positions = [
+            projector._events.get(timeout=5).stream_position for _ in range(3)
+        ]
+        assert stream_positions == [0, 1, 2]
+        assert esdb_client.n_subscriptions == 2
+
+        # Stopping ends the subscription on its next event
+        projector.stop()
+        esdb_client.append_event(
+            "events",
+            current_version=StreamState.ANY,
+            event=NewEvent(type="init", data=b"test_data"),
+        )
+        subscriber.join(timeout=5)
+        assert not subscriber.is_alive()
+        assert projector._events.empty()
+
+    def test_bundle_read_model(
+        self,
+        write_session: Session,
+        read_session: Session,
+        fake_db_wind_device: Device,
+        fake_db_account_2: Account,
+        fake_db_granular_certificate_bundle: GranularCertificateBundle,
+        esdb_client: EventStore,
+    ):
+        bundle_id = fake_db_granular_certificate_bundle.id
+        read_bundle = read_session.get(GranularCertificateBundleReadModel, bundle_id)
+
+        assert read_bundle is not None
+        assert read_bundle.device_name == fake_db_wind_device.device_name
+        assert read_bundle.device_capacity == fake_db_wind_device.capacity
+        assert read_bundle.issuing_body == "ERCOT"
+
+        # Bundle and Device updates are both reflected in the read model
+        bulk_update_database_entities(
+            entities=[fake_db_granular_certificate_bundle],
+            update_entity=GranularCertificateBundleUpdate(
+                account_id=fake_db_account_2.id
+            ),
+            write_session=write_session,
+            read_session=read_session,
+            esdb_client=esdb_client,
+        )
+        update_database_entity(
+            entity=Device.by_id(fake_db_wind_device.id, write_session),  # type: ignore
+            update_entity=DeviceUpdate(device_name="renamed_wind_device"),
+            write_session=write_session,
+            read_session=read_session,
+            esdb_client=esdb_client,
+        )
+
+        read_session.expire_all()
+        read_bundle = read_session.get(GranularCertificateBundleReadModel, bundle_id)
+
+        assert read_bundle is not None
+        assert read_bundle.account_id == fake_db_account_2.id
+        assert read_bundle.device_name == "renamed_wind_device"
+
+    def test_rebuild_entity_type(
+        self,
+        write_session: Session,
+        read_session: Session,
+    ):
+        # A fresh in-process event store, so that only this test's events are replayed
+        esdb_client = InMemoryEventStore(
+            projection_linkers={ENTITY_STREAMS_PROJECTION_NAME: entity_link_streams}
+        )
+        ensure_entity_streams_projection(esdb_client)
+
+        created_entities = write_to_database(
+            Account(account_name="rebuild_account", user_ids=[], roles=["admin"]),  # type: ignore
+            write_session,
+            read_session,
+            esdb_client,
+        )
+        assert created_entities is not None
+        account = created_entities[0]
+        update_database_entity(
+            entity=Account.by_id(account.id, write_session),  # type: ignore
+            update_entity=AccountUpdate(account_name="rebuilt_account"),
+            write_session=write_session,
+            read_session=read_session,
+            esdb_client=esdb_client,
+        )
+
+        # Lose the read DB row, then recover it from the event store
+        read_session.delete(read_session.get(Account, account.id))
+        read_session.commit()
+
+        n_replayed = rebuild_entity_type(
+            "Account", read_session=read_session, esdb_client=esdb_client
+        )
+
+        assert n_replayed == 2
+        assert get_checkpoint(read_session, rebuild_checkpoint_name("Account"))
+
+        read_account = read_session.get(Account, account.id)
+        assert read_account is not None
+        assert read_account.account_name == "rebuilt_account"
+
+    def test_rebuild_certificate_bundles(
+        self,
+        write_session: Session,
+        read_session: Session,
+        fake_db_granular_certificate_bundle: GranularCertificateBundle,
+    ):
+        # Bundles are keyed on their ID and production start, but are still replayed
+        assert "GranularCertificateBundle" in get_entity_names()
+
+        esdb_client = InMemoryEventStore(
+            projection_linkers={ENTITY_STREAMS_PROJECTION_NAME: entity_link_streams}
+        )
+        ensure_entity_streams_projection(esdb_client)
+
+        bundle = GranularCertificateBundle.model_validate(
+            fake_db_granular_certificate_bundle.model_dump(exclude={"id"})
+        )
+        created_entities = write_to_database(
+            bundle, write_session, read_session, esdb_client
+        )
+        assert created_entities is not None
+        bundle_id = created_entities[0].id
+
+        # Lose the read DB row, then recover it from the event store
+        read_session.delete(read_session.get(GranularCertificateBundle, bundle_id))
+        read_session.commit()
+
+        n_replayed = rebuild_entity_type(
+            "GranularCertificateBundle",
+            read_session=read_session,
+            esdb_client=esdb_client,
+        )
+
+        assert n_replayed == 1
+        read_session.expire_all()
+        assert read_session.get(GranularCertificateBundle, bundle_id) is not None
+
+    def test_rebuild_skips_archived_certificate_bundles(
+        self,
+        write_session: Session,
+        read_session: Session,
+        fake_db_granular_certificate_bundle: GranularCertificateBundle,
+    ):
+        esdb_client = InMemoryEventStore(
+            projection_linkers={ENTITY_STREAMS_PROJECTION_NAME: entity_link_streams}
+        )
+        ensure_entity_streams_projection(esdb_client)
+
+        bundle = GranularCertificateBundle.model_validate(
+            fake_db_granular_certificate_bundle.model_dump(exclude={"id"})
+        )
+        created_entities = write_to_database(
+            bundle, write_session, read_session, esdb_client
+        )
+        assert created_entities is not None
+        bundle_id = created_entities[0].id
+        delete_database_entities(
+            GranularCertificateBundle.by_id(bundle_id, write_session),
+            write_session,
+            read_session,
+            esdb_client,
+        )
+
+        # Archival writes no events, so the bundle must not be replayed
+        n_archived = archive_deleted_certificate_bundles(
+            read_session,
+            retention_days=0,
+            now=datetime.datetime.now(datetime.timezone.utc)
+            + datetime.timedelta(days=1),
+        )
+        assert n_archived == 1
+
+        n_replayed = rebuild_entity_type(
+            "GranularCertificateBundle",
+            read_session=read_session,
+            esdb_client=esdb_client,
+        )
+
+        # The create and delete events are read, but the bundle stays archived
+        assert n_replayed == 2
+        read_session.expire_all()
+        assert read_session.get(GranularCertificateBundle, bundle_id) is None
+        assert read_session.get(GranularCertificateBundleArchive, bundle_id) is not None
+
+    def test_get_entity_names_excludes_non_event_tables(self):
+        # Tables written outside the event store would be lost by a reset
+        entity_names = get_entity_names()
+
+        assert "GranularCertificateBundleArchive" not in entity_names
+        assert "DeviceIssuedInterval" not in entity_names
+        assert "EventOutbox" not in entity_names
@@ -0,0 +1,39 @@
+import pytest
+from sqlalchemy import exc as sa_exc
+from sqlalchemy import text
+
+from gc_registry.core.database import db
+
+
+class TestDB:
+    def test_session_scope_and_pool_metrics(self, tmp_path, monkeypatch):
+        db_client = db.DButils(
+            db_test_fp=str(tmp_path / "pool.db"),
+            test=True,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.01,
+        )
+        monkeypatch.setitem(db.db_name_to_client, "db_pool_test", db_client)
+
+        with db.session_scope("db_pool_test") as session:
+            session.execute(text("SELECT 1"))
+            assert db_client.pool_metrics()["sync"]["utilisation"] == 1.0
+
+            # The only connection in the pool is held by the session
+            with pytest.raises(sa_exc.TimeoutError):
+                db_client.engine.connect()
+
+        # Closing the session returns its connection to the pool
+        pool_metrics = db_client.pool_metrics()
+        assert "async" not in pool_metrics
+        assert pool_metrics["sync"]["checked_out"] == 0
+        assert pool_metrics["sync"]["checkouts"] == 1
+        assert pool_metrics["sync"]["checkout_timeouts"] == 1
+        assert pool_metrics["sync"]["checkout_wait_seconds_max"] >= 0.01
+
+        # Metrics are kept when the engine is disposed and its pool recreated
+        db_client.engine.dispose()
+        with db_client.engine.connect():
+            pass
+        assert db_client.pool_metrics()["sync"]["checkouts"] == 2
@@ -0,0 +1,252 @@
+import datetime
+import json
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from esdbclient import NewEvent, StreamState
+from esdbclient.exceptions import NotFound, WrongCurrentVersion
+from sqlmodel import Session, select
+
+from gc_registry.core.database.cqrs import update_database_entity
+from gc_registry.core.database.encoding import (
+    EVENT_SCHEMA_VERSION,
+    decode_event,
+    encode_event,
+)
+from gc_registry.core.database.event_store import EventStore, InMemoryEventStore
+from gc_registry.core.database.events import (
+    ENTITY_STREAMS_PROJECTION_NAME,
+    EventAppendBatcher,
+    create_esdb_event,
+    ensure_entity_streams_projection,
+    entity_category_stream_name,
+    entity_link_streams,
+    entity_stream_name,
+)
+from gc_registry.core.database.outbox import relay_outbox_batch
+from gc_registry.core.database.snapshots import get_latest_snapshot, load_entity_state
+from gc_registry.core.models.base import Event, EventTypes
+from gc_registry.core.models.outbox import EventOutbox
+from gc_registry.device.models import Device, DeviceUpdate
+from gc_registry.settings import settings
+
+
+class TestEvents:
+    def test_event_append_batcher(self, esdb_client: EventStore):
+        n_events_before = len(esdb_client.get_stream("events"))
+        batcher = EventAppendBatcher(esdb_client, window_ms=200, max_events=100)
+
+        def submit(entity_id: int) -> int:
+            esdb_events = [
+                create_esdb_event(entity_id, "Device", EventTypes.CREATE),
+                create_esdb_event(entity_id, "Device", EventTypes.UPDATE),
+            ]
+            return batcher.submit(esdb_events).result(timeout=10)
+
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            commit_positions = list(executor.map(submit, range(10)))
+
+        batcher.close()
+
+        # Concurrent submissions share appends, and each keeps its events together
+        assert len(set(commit_positions)) < 10
+
+        events = esdb_client.get_stream("events", stream_position=n_events_before)
+        assert len(events) == 20
+        assert [event.type for event in events] == ["CREATE", "UPDATE"] * 10
+
+    def test_outbox_relay(
+        self,
+        write_session: Session,
+        read_session: Session,
+        fake_db_wind_device: Device,
+        esdb_client: EventStore,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        monkeypatch.setattr(settings, "EVENT_PUBLISH_MODE", "outbox")
+        n_events_before = len(esdb_client.get_stream("events"))
+
+        device = Device.by_id(fake_db_wind_device.id, write_session)  # type: ignore
+        update_database_entity(
+            entity=device,
+            update_entity=DeviceUpdate(device_name="outbox_device_name"),
+            write_session=write_session,
+            read_session=read_session,
+            esdb_client=esdb_client,
+        )
+
+        # The event is committed to the outbox rather than appended to ESDB
+        assert len(esdb_client.get_stream("events")) == n_events_before
+        assert len(write_session.exec(select(EventOutbox)).all()) == 1
+
+        assert relay_outbox_batch(write_session, esdb_client) == 1
+        assert relay_outbox_batch(write_session, esdb_client) == 0
+
+        events = esdb_client.get_stream("events", stream_position=n_events_before)
+        assert [event.type for event in events] == ["UPDATE"]
+        assert json.loads(events[0].data)["attributes_after"] == {
+            "device_name": "outbox_device_name"
+        }
+        assert write_session.exec(select(EventOutbox)).all() == []
+
+    def test_entity_snapshots(
+        self, esdb_client: EventStore, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(settings, "SNAPSHOT_INTERVAL_EVENTS", 3)
+        entity_id = uuid.uuid4().int % 10**9
+        stream_name = entity_stream_name("Account", entity_id)
+
+        def append_update(account_name: str, timestamp: datetime.datetime):
+            event = Event(
+                entity_id=entity_id,
+                entity_name="Account",
+                attributes_before=None,
+                attributes_after={"account_name": account_name},
+                timestamp=timestamp,
+            )
+            esdb_client.append_to_stream(
+                stream_name,
+                current_version=StreamState.ANY,
+                events=[NewEvent(type="UPDATE", data=event.model_dump_json().encode())],
+            )
+
+        start = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+        for hour in range(3):
+            append_update(f"account_{hour}", start + datetime.timedelta(hours=hour))
+
+        # Folding the interval's worth of events writes a snapshot
+        entity_state = load_entity_state("Account", entity_id, esdb_client)
+        assert entity_state is not None
+        assert entity_state.attributes == {"account_name": "account_2"}
+
+        snapshot = get_latest_snapshot("Account", entity_id, esdb_client)
+        assert snapshot is not None
+        assert snapshot.stream_position == entity_state.stream_position
+
+        append_update("account_3", start + datetime.timedelta(hours=3))
+
+        entity_state = load_entity_state("Account", entity_id, esdb_client)
+        assert entity_state is not None
+        assert entity_state.attributes == {"account_name": "account_3"}
+
+        # Point-in-time loads ignore later snapshots and events
+        entity_state = load_entity_state(
+            "Account",
+            entity_id,
+            esdb_client,
+            at=start + datetime.timedelta(hours=1, minutes=30),
+        )
+        assert entity_state is not None
+        assert entity_state.attributes == {"account_name": "account_1"}
+
+        assert (
+            load_entity_state(
+                "Account", entity_id, esdb_client, at=start.replace(year=2023)
+            )
+            is None
+        )
+
+    def test_compact_event_encoding(
+        self,
+        write_session: Session,
+        read_session: Session,
+        fake_db_wind_device: Device,
+        esdb_client: EventStore,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        monkeypatch.setattr(settings, "EVENT_ENCODING", "msgpack")
+        n_events_before = len(esdb_client.get_stream("events"))
+
+        device = Device.by_id(fake_db_wind_device.id, write_session)  # type: ignore
+        update_database_entity(
+            entity=device,
+            update_entity=DeviceUpdate(device_name="compact_device_name"),
+            write_session=write_session,
+            read_session=read_session,
+            esdb_client=esdb_client,
+        )
+
+        recorded_event = esdb_client.get_stream(
+            "events", stream_position=n_events_before
+        )[0]
+        metadata = json.loads(recorded_event.metadata)
+        assert metadata["encoding"] == "msgpack"
+        assert metadata["schema_version"] == EVENT_SCHEMA_VERSION
+        assert entity_link_streams(recorded_event) == [
+            entity_stream_name("Device", device.id),  # type: ignore
+            entity_category_stream_name("Device"),
+        ]
+
+        event = decode_event(recorded_event.data, recorded_event.metadata)
+        assert event.entity_id == device.id
+        assert event.attributes_after == {"device_name": "compact_device_name"}
+
+        # Events in either encoding decode to the same registry event
+        json_event = encode_event(event, EventTypes.UPDATE, encoding="json")
+        assert len(recorded_event.data) < len(json_event.data)
+        assert decode_event(json_event.data, json_event.metadata) == event
+
+        with pytest.raises(ValueError):
+            decode_event(
+                recorded_event.data,
+                json.dumps({**metadata, "schema_version": 0}).encode(),
+            )
+
+    def test_in_memory_event_store(self):
+        event_store = InMemoryEventStore(
+            projection_linkers={ENTITY_STREAMS_PROJECTION_NAME: entity_link_streams}
+        )
+
+        with pytest.raises(NotFound):
+            event_store.get_stream("events")
+        assert event_store.get_current_version("events") == StreamState.NO_STREAM
+
+        first_commit_position = event_store.append_to_stream(
+            "events",
+            current_version=StreamState.NO_STREAM,
+            events=[create_esdb_event(1, "Device", EventTypes.CREATE)],
+        )
+
+        # Events appended before the projection is created are still linked
+        ensure_entity_streams_projection(event_store)
+        ensure_entity_streams_projection(event_store)
+
+        commit_position = event_store.append_to_stream(
+            "events",
+            current_version=0,
+            events=[
+                create_esdb_event(1, "Device", EventTypes.UPDATE),
+                create_esdb_event(2, "Device", EventTypes.CREATE),
+            ],
+        )
+        assert commit_position > first_commit_position
+        assert event_store.get_current_version("events") == 2
+
+        with pytest.raises(WrongCurrentVersion):
+            event_store.append_to_stream(
+                "events",
+                current_version=0,
+                events=[create_esdb_event(3, "Device", EventTypes.CREATE)],
+            )
+
+        recorded_events = event_store.get_stream("events", stream_position=1)
+        assert [event.stream_position for event in recorded_events] == [1, 2]
+        recorded_events = event_store.get_stream("events", backwards=True, limit=1)
+        assert [event.stream_position for event in recorded_events] == [2]
+
+        entity_events = event_store.get_stream(
+            entity_stream_name("Device", 1), resolve_links=True
+        )
+        assert [event.type for event in entity_events] == [
+            EventTypes.CREATE,
+            EventTypes.UPDATE,
+        ]
+        assert [event.stream_name for event in entity_events] == ["events", "events"]
+        assert [event.link.stream_position for event in entity_events] == [0, 1]  # type: ignore
+        assert len(event_store.get_stream(entity_category_stream_name("Device"))) == 3
+
+        subscription = event_store.subscribe_to_stream("events", stream_position=0)
+        assert [next(subscription).stream_position for _ in range(2)] == [1, 2]
+        subscription.stop()
+        assert list(subscription) == []
@@ -0,0 +1,94 @@
+import datetime
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+from gc_registry.certificate.models import GranularCertificateBundle
+from gc_registry.core.database.partitions import (
+    BUNDLE_TABLE_NAME,
+    default_partition_name,
+    detach_monthly_partitions,
+    ensure_monthly_partitions,
+    get_monthly_partitions,
+    partition_name,
+)
+
+
+def count_rows(session: Session, table_name: str) -> int:
+    return session.execute(text(f'SELECT count(*) FROM "{table_name}"')).scalar_one()
+
+
+class TestPartitions:
+    def test_monthly_partitions(
+        self,
+        write_session: Session,
+        fake_db_granular_certificate_bundle: GranularCertificateBundle,
+        fake_db_granular_certificate_bundle_2: GranularCertificateBundle,
+    ):
+        january, february, march = (
+            datetime.datetime(2021, month, 1) for month in (1, 2, 3)
+        )
+        default_name = default_partition_name(BUNDLE_TABLE_NAME)
+        january_name = partition_name(BUNDLE_TABLE_NAME, january)
+
+        # Without monthly partitions the bundles land in the default partition
+        assert count_rows(write_session, default_name) == 2
+
+        created = ensure_monthly_partitions(
+            write_session, months_ahead=1, now=datetime.datetime(2021, 2, 15)
+        )
+        assert created == [
+            partition_name(BUNDLE_TABLE_NAME, month)
+            for month in (january, february, march)
+        ]
+        assert (
+            ensure_monthly_partitions(
+                write_session, months_ahead=1, now=datetime.datetime(2021, 2, 15)
+            )
+            == []
+        )
+
+        # The bundles are moved into the partition for their month
+        assert count_rows(write_session, default_name) == 0
+        assert count_rows(write_session, january_name) == 2
+
+        write_session.expire_all()
+        bundle = write_session.get(
+            GranularCertificateBundle, fake_db_granular_certificate_bundle.id
+        )
+        assert bundle is not None
+        assert bundle.issuance_id == fake_db_granular_certificate_bundle.issuance_id
+
+        # Queries on the production period only scan the partitions of that period
+        query_plan = "\n".join(
+            write_session.execute(
+                text(
+                    f"""
+                    EXPLAIN SELECT * FROM {BUNDLE_TABLE_NAME}
+                    WHERE production_starting_interval >= '2021-01-01'
+                    AND production_starting_interval < '2021-02-01'
+                    """
+                )
+            ).scalars()
+        )
+        partitions = get_monthly_partitions(write_session, BUNDLE_TABLE_NAME)
+        scanned = {
+            name
+            for name in [*partitions.values(), default_name]
+            if f" {name} " in query_plan
+        }
+        assert scanned == {january_name}
+
+        # Partitions holding live bundles are not detached
+        assert detach_monthly_partitions(write_session, before=february) == []
+        assert january in get_monthly_partitions(write_session, BUNDLE_TABLE_NAME)
+
+        # Detached partitions keep their bundles but are no longer queried
+        write_session.execute(text(f"UPDATE {BUNDLE_TABLE_NAME} SET is_deleted = true"))
+        detached = detach_monthly_partitions(
+            write_session, before=february.replace(tzinfo=datetime.timezone.utc)
+        )
+        assert detached == [january_name]
+        assert january not in get_monthly_partitions(write_session, BUNDLE_TABLE_NAME)
+        assert count_rows(write_session, january_name) == 2
+        assert count_rows(write_session, BUNDLE_TABLE_NAME) == 0
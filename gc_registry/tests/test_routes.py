@@ -1,7 +1,27 @@
+import asyncio
 import datetime
 
+import pytest
+from esdbclient import StreamState
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
 from gc_registry.account.models import Account, AccountBase
 from gc_registry.account.schemas import AccountUpdate
+from gc_registry.core.database.consistency import (
+    CONSISTENCY_TOKEN_HEADER,
+    wait_for_read_model,
+)
+from gc_registry.core.database.event_store import EventStore
+from gc_registry.core.database.events import create_esdb_event, entity_stream_name
+from gc_registry.core.database.projector import apply_events_to_read_model
+from gc_registry.core.models.base import (
+    DeviceTechnologyType,
+    EnergySourceType,
+    EventTypes,
+)
+from gc_registry.device.models import Device, DeviceBase
+from gc_registry.settings import settings
 
 
 class TestRoutes:
@@ -79,3 +99,130 @@ class TestRoutes:
         assert (
             deleted_account.is_deleted
         ), f"Expected {fake_db_account} to be deleted but it was not"
+
+    def test_async_entity_routes(self, api_client, fake_db_account: Account):
+        """Test that entities can be created, read and deleted through the async
+        Device routes."""
+
+        new_device = DeviceBase(
+            device_name="Test Device",
+            meter_data_id="BMU-TEST",
+            grid="fake_grid",
+            energy_source=EnergySourceType.wind,
+            technology_type=DeviceTechnologyType.wind_turbine,
+            operational_date=datetime.datetime(2020, 1, 1),
+            capacity=3000,
+            peak_demand=100,
+            location="USA",
+            account_id=fake_db_account.id,  # type: ignore
+            is_storage=False,
+        )
+
+        created_device = api_client.post(
+            "device/create", content=new_device.model_dump_json()
+        )
+        assert created_device.status_code == 200
+        assert CONSISTENCY_TOKEN_HEADER in created_device.headers
+        created_device = Device(**created_device.json())
+
+        device_from_db = api_client.get(f"device/{created_device.id}")
+        assert device_from_db.status_code == 200
+        assert device_from_db.json()["device_name"] == new_device.device_name
+
+        _ = api_client.delete(f"device/delete/{created_device.id}")
+
+        deleted_device = api_client.get(f"device/{created_device.id}")
+        assert deleted_device.json()["is_deleted"]
+
+        missing_device = api_client.get(f"device/{created_device.id + 1000}")  # type: ignore
+        assert missing_device.status_code == 404
+
+    def test_read_your_writes(
+        self,
+        api_client,
+        read_session: Session,
+        esdb_client: EventStore,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Test that reads sending the consistency token of a write observe it, from
+        the write DB until the projector has applied it to the read DB."""
+
+        monkeypatch.setattr(settings, "READ_MODEL_MODE", "projected")
+        n_events_before = len(esdb_client.get_stream("events"))
+
+        new_account = AccountBase(account_name="Consistent Account", user_ids=[])
+        created_account = api_client.post(
+            "account/create", content=new_account.model_dump_json()
+        )
+        consistency_token = int(created_account.headers[CONSISTENCY_TOKEN_HEADER])
+        account_id = created_account.json()["id"]
+
+        # The read DB has not yet been projected to
+        assert api_client.get(f"account/{account_id}").status_code == 404
+
+        headers = {CONSISTENCY_TOKEN_HEADER: str(consistency_token)}
+        account_from_db = api_client.get(f"account/{account_id}", headers=headers)
+        assert account_from_db.status_code == 200
+        assert account_from_db.json()["account_name"] == new_account.account_name
+
+        async_read_session = AsyncSession(sync_session_class=lambda **_: read_session)
+        assert not asyncio.run(
+            wait_for_read_model(async_read_session, consistency_token, 0)
+        )
+
+        recorded_events = esdb_client.get_stream(
+            "events", stream_position=n_events_before
+        )
+        apply_events_to_read_model(list(recorded_events), read_session)
+
+        assert asyncio.run(
+            wait_for_read_model(async_read_session, consistency_token, 0)
+        )
+        assert api_client.get(f"account/{account_id}").status_code == 200
+
+        # Reads do not return a consistency token
+        assert CONSISTENCY_TOKEN_HEADER not in account_from_db.headers
+
+    def test_health_check(self, api_client):
+        response = api_client.get("/health")
+
+        assert response.status_code == 200
+        assert response.json() == {"esdb": "ok"}
+
+    def test_read_model_lag(self, api_client):
+        response = api_client.get("/read_model_lag")
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "read_model_mode": settings.READ_MODEL_MODE,
+            "lag": 0,
+        }
+
+    def test_read_entity_event_history(
+        self, api_client, fake_db_account: Account, esdb_client: EventStore
+    ):
+        # Link an event into the account's stream as the entity streams projection would
+        esdb_event = create_esdb_event(
+            entity_id=fake_db_account.id,  # type: ignore
+            entity_name="Account",
+            event_type=EventTypes.UPDATE,
+            attributes_before={"account_name": "fake_account"},
+            attributes_after={"account_name": "renamed_account"},
+        )
+        esdb_client.append_to_stream(
+            entity_stream_name("Account", fake_db_account.id),  # type: ignore
+            current_version=StreamState.ANY,
+            events=[esdb_event],
+        )
+
+        response = api_client.get(f"/events/Account/{fake_db_account.id}")
+
+        assert response.status_code == 200
+        history = response.json()
+        assert history[-1]["event_type"] == "UPDATE"
+        assert history[-1]["attributes_after"] == {"account_name": "renamed_account"}
+
+        response = api_client.get("/events/Account/999999")
+
+        assert response.status_code == 200
+        assert response.json() == []
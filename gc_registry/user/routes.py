@@ -1,8 +1,12 @@
-from esdbclient import EventStoreDBClient
 from fastapi import APIRouter, Depends
 from sqlmodel import Session
 
 from gc_registry.core.database import db, events
+from gc_registry.core.database.consistency import (
+    ConsistentReadSession,
+    get_consistent_read_session,
+)
+from gc_registry.core.database.event_store import EventStore
 from gc_registry.user import models
 
 # Router initialisation
@@ -16,7 +20,7 @@ def create_user(
     user_base: models.UserBase,
     write_session: Session = Depends(db.get_write_session),
     read_session: Session = Depends(db.get_read_session),
-    esdb_client: EventStoreDBClient = Depends(events.get_esdb_client),
+    esdb_client: EventStore = Depends(events.get_esdb_client),
 ):
     user = models.User.create(user_base, write_session, read_session, esdb_client)
 
@@ -24,11 +28,11 @@ def create_user(
 
 
 @router.get("/{user_id}", response_model=models.UserRead)
-def read_user(
+async def read_user(
     user_id: int,
-    read_session: Session = Depends(db.get_read_session),
+    consistent_read: ConsistentReadSession = Depends(get_consistent_read_session),
 ):
-    user = models.User.by_id(user_id, read_session)
+    user = await models.User.by_id_async(user_id, consistent_read.session)
 
     return user
 
@@ -39,7 +43,7 @@ def update_user(
     user_update: models.UserUpdate,
     write_session: Session = Depends(db.get_write_session),
     read_session: Session = Depends(db.get_read_session),
-    esdb_client: EventStoreDBClient = Depends(events.get_esdb_client),
+    esdb_client: EventStore = Depends(events.get_esdb_client),
 ):
     user = models.User.by_id(user_id, write_session)
 
@@ -51,7 +55,7 @@ def delete_user(
     user_id: int,
     write_session: Session = Depends(db.get_write_session),
     read_session: Session = Depends(db.get_read_session),
-    esdb_client: EventStoreDBClient = Depends(events.get_esdb_client),
+    esdb_client: EventStore = Depends(events.get_esdb_client),
 ):
-    user = models.User.by_id(user_id, read_session)
+    user = models.User.by_id(user_id, write_session)
     return user.delete(write_session, read_session, esdb_client)
@@ -3,13 +3,14 @@ import json
 from functools import partial
 from typing import Any, Hashable, Type, TypeVar
 
-from esdbclient import EventStoreDBClient
 from fastapi import HTTPException
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from sqlmodel import Field, Session, SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from gc_registry.core.database import cqrs
+from gc_registry.core.database.event_store import EventStore
 
 T = TypeVar("T", bound="ActiveRecord")
 
@@ -46,22 +47,50 @@ class ActiveRecord(SQLModel):
         return session.get(cls, id_) is not None
 
     @classmethod
-    def create(
+    async def by_id_async(
+        cls: Type[T],
+        id_: int,
+        session: AsyncSession,
+    ) -> T:
+        obj = await session.get(cls, id_)
+        if obj is None:
+            raise HTTPException(
+                status_code=404, detail=f"{cls.__name__} with id {id_} not found"
+            )
+        return obj
+
+    @classmethod
+    async def all_async(cls, session: AsyncSession) -> list[SQLModel]:
+        return list((await session.exec(select(cls))).all())
+
+    @classmethod
+    async def exists_async(cls, id_: int, session: AsyncSession) -> bool:
+        return await session.get(cls, id_) is not None
+
+    @classmethod
+    def _validate_source(
         cls,
         source: list[dict[Hashable, Any]] | dict[Hashable, Any] | BaseModel,
-        write_session: Session,
-        read_session: Session,
-        esdb_client: EventStoreDBClient,
-    ) -> list[SQLModel] | None:
+    ) -> list[SQLModel]:
         if isinstance(source, (SQLModel, BaseModel)):
-            obj = [cls.model_validate(source)]
+            return [cls.model_validate(source)]
         elif isinstance(source, dict):
-            obj = [cls.model_validate_json(json.dumps(source))]
+            return [cls.model_validate_json(json.dumps(source))]
         elif isinstance(source, list):
-            obj = [cls.model_validate_json(json.dumps(elem)) for elem in source]
+            return [cls.model_validate_json(json.dumps(elem)) for elem in source]
         else:
             raise ValueError(f"The input type {type(source)} can not be processed")
 
+    @classmethod
+    def create(
+        cls,
+        source: list[dict[Hashable, Any]] | dict[Hashable, Any] | BaseModel,
+        write_session: Session,
+        read_session: Session,
+        esdb_client: EventStore,
+    ) -> list[SQLModel] | None:
+        obj = cls._validate_source(source)
+
         # logger.debug(f"Creating {cls.__name__}: {obj[0].model_dump_json()}")
         created_entities = cqrs.write_to_database(
             obj,  # type: ignore
@@ -72,6 +101,21 @@ class ActiveRecord(SQLModel):
 
         return created_entities
 
+    @classmethod
+    async def create_async(
+        cls,
+        source: list[dict[Hashable, Any]] | dict[Hashable, Any] | BaseModel,
+        write_session: AsyncSession,
+        read_session: AsyncSession,
+        esdb_client: EventStore,
+    ) -> list[SQLModel] | None:
+        return await cqrs.write_to_database_async(
+            cls._validate_source(source),  # type: ignore
+            write_session,
+            read_session,
+            esdb_client,
+        )
+
     def save(self, session):
         session.add(self)
         session.commit()
@@ -82,7 +126,7 @@ class ActiveRecord(SQLModel):
         update_entity: BaseModel,
         write_session: Session,
         read_session: Session,
-        esdb_client: EventStoreDBClient,
+        esdb_client: EventStore,
     ) -> SQLModel | None:
         # logger.debug(f"Updating {self.__class__.__name__}: {self.model_dump_json()}")
         updated_entity = cqrs.update_database_entity(
@@ -99,7 +143,7 @@ class ActiveRecord(SQLModel):
         self,
         write_session: Session,
         read_session: Session,
-        esdb_client: EventStoreDBClient,
+        esdb_client: EventStore,
     ) -> list[SQLModel] | None:
         # logger.debug(f"Deleting {self.__class__.__name__}: {self.model_dump_json()}")
         deleted_entities = cqrs.delete_database_entities(
@@ -111,6 +155,34 @@ class ActiveRecord(SQLModel):
 
         return deleted_entities
 
+    async def update_async(
+        self,
+        update_entity: BaseModel,
+        write_session: AsyncSession,
+        read_session: AsyncSession,
+        esdb_client: EventStore,
+    ) -> SQLModel | None:
+        return await cqrs.update_database_entity_async(
+            entity=self,
+            update_entity=update_entity,
+            write_session=write_session,
+            read_session=read_session,
+            esdb_client=esdb_client,
+        )
+
+    async def delete_async(
+        self,
+        write_session: AsyncSession,
+        read_session: AsyncSession,
+        esdb_client: EventStore,
+    ) -> list[SQLModel] | None:
+        return await cqrs.delete_database_entities_async(
+            entities=self,
+            write_session=write_session,
+            read_session=read_session,
+            esdb_client=esdb_client,
+        )
+
 
 def parse_nans_to_null(json_str: str, replace_nan: bool = True):
     if replace_nan: